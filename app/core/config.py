@@ -1,4 +1,5 @@
 import os
+from typing import List
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -7,6 +8,11 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     DATABASE_URL: str = "sqlite:///./student_management.db"
+    IMPORT_WORKERS: int = 2
+    # Accounts allowed to profile a request with ?profile= or X-Profile; empty disables profiling
+    PROFILING_ADMINS: List[str] = []
+    PROFILE_DIR: str = "profiles"
+    PROFILE_SAMPLE_INTERVAL: float = 0.001
 
     class Config:
         env_file = ".env"
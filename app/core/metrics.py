@@ -0,0 +1,237 @@
+"""
+Per-request timing and Prometheus metrics.
+
+MetricsMiddleware gives every HTTP request a RequestMetrics in a context
+variable. Instrumented code adds the time it spends to a phase: db
+(cursor executes, via SQLAlchemy events), orm (fetching rows and building
+objects in StudentManager), auth, algorithm and render (Jinja templates).
+A phase's time excludes phases nested inside it, so a StudentManager read
+counts its queries under db and only the rest under orm. Outside a request
+the timers do nothing.
+
+Each response carries the phases in a Server-Timing header. Headers go out
+before the body, so the header only covers work done until then: for a
+streamed response (e.g. /students/?stream=true) the rendering and the queries
+that run while the body is sent are missing from it, and its total is the
+time to the first byte. Process-wide totals per route, which are recorded
+once the response is complete, are served in Prometheus text format by
+/metrics.
+"""
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+import jinja2
+from sqlalchemy import event
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class RequestMetrics:
+    """Time and call count per phase during one request"""
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = {}
+        # Sum over all phases, used to keep nested time out of the enclosing phase
+        self.recorded = 0.0
+
+    def add(self, phase, seconds, count=1):
+        entry = self.phases.setdefault(phase, [0, 0.0])
+        entry[0] += count
+        entry[1] += seconds
+        self.recorded += seconds
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        """Server-Timing value for the phases recorded so far; total is the time since the request started"""
+        parts = []
+        for phase, (count, seconds) in self.phases.items():
+            desc = f';desc="{count} queries"' if phase == "db" else ""
+            parts.append(f"{phase};dur={seconds * 1000:.2f}{desc}")
+        parts.append(f"total;dur={self.elapsed() * 1000:.2f}")
+        return ", ".join(parts)
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+def current() -> Optional[RequestMetrics]:
+    return _current.get()
+
+@contextmanager
+def timer(phase, count=1):
+    """Adds the time spent in the block to phase of the current request"""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    recorded = metrics.recorded
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(phase, time.perf_counter() - start - (metrics.recorded - recorded), count)
+
+def instrumented(phase):
+    """Decorator form of timer for plain functions; close to free outside a request"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            metrics = _current.get()
+            if metrics is None:
+                return func(*args, **kwargs)
+            recorded = metrics.recorded
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.add(phase, time.perf_counter() - start - (metrics.recorded - recorded))
+        return wrapper
+    return decorate
+
+def instrument_engine(engine):
+    """
+    Counts and times every cursor execute of engine under db, failed ones included.
+    The start time lives on the statement's execution context, so a statement that
+    raises before after_cursor_execute leaves nothing behind on the connection.
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.metrics_query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _add_query_time(context)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        _add_query_time(exception_context.execution_context)
+
+def _add_query_time(context):
+    # Popped, so an error raised after after_cursor_execute is not counted twice
+    start = vars(context).pop("metrics_query_start", None) if context is not None else None
+    metrics = _current.get()
+    if start is not None and metrics is not None:
+        metrics.add("db", time.perf_counter() - start)
+
+class TimedTemplate(jinja2.Template):
+    """Template that adds its render time, streamed chunks included, to render; a stream counts as one render"""
+    def render(self, *args, **kwargs):
+        with timer("render"):
+            return super().render(*args, **kwargs)
+
+    def generate(self, *args, **kwargs):
+        chunks = super().generate(*args, **kwargs)
+        count = 1
+        while True:
+            with timer("render", count):
+                chunk = next(chunks, None)
+            count = 0
+            if chunk is None:
+                return
+            yield chunk
+
+def instrument_templates(templates):
+    """Makes a Jinja2Templates instance load TimedTemplate; returns it"""
+    templates.env.template_class = TimedTemplate
+    return templates
+
+class MetricsRegistry:
+    """Process-wide request totals, rendered in Prometheus text format"""
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._durations = {}
+        self._phases = {}
+
+    def observe(self, route, method, status, metrics: RequestMetrics):
+        duration = metrics.elapsed()
+        with self._lock:
+            key = (route, method, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            histogram = self._durations.setdefault(route, [[0] * len(self.buckets), 0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if duration <= bound:
+                    histogram[0][i] += 1
+            histogram[1] += duration
+            histogram[2] += 1
+            for phase, (count, seconds) in metrics.phases.items():
+                entry = self._phases.setdefault((route, phase), [0, 0.0])
+                entry[0] += count
+                entry[1] += seconds
+
+    def render(self) -> str:
+        with self._lock:
+            lines = [
+                "# HELP app_http_requests_total HTTP requests by route template, method and status code.",
+                "# TYPE app_http_requests_total counter",
+            ]
+            for (route, method, status), count in sorted(self._requests.items()):
+                lines.append(f'app_http_requests_total{{route="{_escape(route)}",method="{method}",status="{status}"}} {count}')
+            lines += [
+                "# HELP app_http_request_duration_seconds Time from request start to the last response byte.",
+                "# TYPE app_http_request_duration_seconds histogram",
+            ]
+            for route, (counts, total, count) in sorted(self._durations.items()):
+                label = f'route="{_escape(route)}"'
+                for bound, bucket in zip(self.buckets, counts):
+                    lines.append(f'app_http_request_duration_seconds_bucket{{{label},le="{bound}"}} {bucket}')
+                lines.append(f'app_http_request_duration_seconds_bucket{{{label},le="+Inf"}} {count}')
+                lines.append(f"app_http_request_duration_seconds_sum{{{label}}} {total:.6f}")
+                lines.append(f"app_http_request_duration_seconds_count{{{label}}} {count}")
+            lines += [
+                "# HELP app_request_phase_seconds_total Time spent per phase (db, orm, auth, algorithm, render).",
+                "# TYPE app_request_phase_seconds_total counter",
+            ]
+            for (route, phase), (_, seconds) in sorted(self._phases.items()):
+                lines.append(f'app_request_phase_seconds_total{{route="{_escape(route)}",phase="{phase}"}} {seconds:.6f}')
+            lines += [
+                "# HELP app_request_phase_calls_total Timed calls per phase; for db, the number of queries.",
+                "# TYPE app_request_phase_calls_total counter",
+            ]
+            for (route, phase), (count, _) in sorted(self._phases.items()):
+                lines.append(f'app_request_phase_calls_total{{route="{_escape(route)}",phase="{phase}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+registry = MetricsRegistry()
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that collects RequestMetrics for every HTTP request, adds the
+    Server-Timing header (built when the headers are sent, see the module docstring)
+    and records the finished request in registry. Requests are labelled with their
+    route template, so /students/edit/{student_id} is one series.
+    """
+    def __init__(self, app, registry: MetricsRegistry = registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        status = [500]
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", metrics.server_timing().encode("latin-1")))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            # Unmatched paths share one label so that scanners cannot grow the series without bound
+            self.registry.observe(route.path if route is not None else "unmatched", scope["method"], status[0], metrics)
@@ -0,0 +1,183 @@
+"""
+On-demand profiling of single requests, for accounts in settings.PROFILING_ADMINS.
+
+Add ?profile=<mode> or an X-Profile: <mode> header to any request:
+
+    cprofile  run the request under cProfile; the response is the pstats report
+              (sorted by cumulative time) and the raw .prof file is stored
+    sample    sample the request's stack every PROFILE_SAMPLE_INTERVAL seconds;
+              the response is the collapsed stacks (flamegraph.pl / speedscope
+              input), stored as .folded. Much cheaper than cprofile on hot loops
+    trace     run the request in SortingAlgorithms.trace(); the page is returned
+              as usual with the counters in an X-Algorithm-Trace header
+
+Every profile is written to settings.PROFILE_DIR and named in the X-Profile-File
+header; only the newest MAX_PROFILE_FILES are kept. Requests from other users, or with profiling disabled, are served as
+usual. Only one request is profiled at a time. Both profilers watch the event
+loop thread, which also runs other requests' async code in the meantime.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from app.core import security
+from app.core.config import settings
+from app.logic.algorithms import tracing
+
+MODES = ("cprofile", "sample", "trace")
+# Functions listed in a cprofile report
+REPORT_LINES = 60
+# Profile files kept in settings.PROFILE_DIR; the oldest are deleted beyond this
+MAX_PROFILE_FILES = 100
+# Names written by ProfilingMiddleware._store; they sort by creation time
+PROFILE_FILE_PATTERN = re.compile(r"^\d{8}T\d{12}-[A-Za-z0-9_]+-[a-z]+\.(prof|folded|json)$")
+
+class StackSampler:
+    """Samples one thread's Python stack from a background thread into collapsed-stack counts"""
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles requests asking for it; see the module docstring"""
+    def __init__(self, app):
+        self.app = app
+        self._lock = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        mode = self._requested_mode(scope) if scope["type"] == "http" and settings.PROFILING_ADMINS else None
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        if not self._lock.acquire(blocking=False):
+            response = PlainTextResponse("Profiler sedang dipakai request lain", status_code=409)
+            await response(scope, receive, send)
+            return
+        try:
+            if mode == "trace":
+                await self._trace(scope, receive, send)
+            else:
+                await self._profile(mode, scope, receive, send)
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def _requested_mode(scope):
+        request = Request(scope)
+        mode = request.query_params.get("profile") or request.headers.get("x-profile")
+        if mode not in MODES:
+            return None
+        email = security.email_from_token(request.cookies.get("access_token"))
+        admins = {admin.lower() for admin in settings.PROFILING_ADMINS}
+        return mode if email is not None and email.lower() in admins else None
+
+    @staticmethod
+    def _store(scope, mode, extension, write):
+        """Writes a profile file and returns its name; only the newest MAX_PROFILE_FILES are kept"""
+        os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+        route = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+        name = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{route}-{mode}.{extension}"
+        write(os.path.join(settings.PROFILE_DIR, name))
+        ProfilingMiddleware._prune()
+        return name
+
+    @staticmethod
+    def _prune():
+        # Other files in the directory are left alone
+        names = sorted(name for name in os.listdir(settings.PROFILE_DIR) if PROFILE_FILE_PATTERN.match(name))
+        for name in names[:max(len(names) - MAX_PROFILE_FILES, 0)]:
+            try:
+                os.remove(os.path.join(settings.PROFILE_DIR, name))
+            except FileNotFoundError:
+                pass
+
+    async def _profile(self, mode, scope, receive, send):
+        status = [500]
+
+        async def discard(message):
+            # The profile replaces the page, so only its status is kept
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+
+        start = time.perf_counter()
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                await self.app(scope, receive, discard)
+            finally:
+                profiler.disable()
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(REPORT_LINES)
+            body = report.getvalue()
+            name = self._store(scope, mode, "prof", profiler.dump_stats)
+        else:
+            sampler = StackSampler(threading.get_ident(), settings.PROFILE_SAMPLE_INTERVAL)
+            sampler.start()
+            try:
+                await self.app(scope, receive, discard)
+            finally:
+                sampler.stop()
+            body = sampler.collapsed()
+
+            def write(path):
+                with open(path, "w") as f:
+                    f.write(body)
+            name = self._store(scope, mode, "folded", write)
+
+        elapsed = (time.perf_counter() - start) * 1000
+        response = PlainTextResponse(body, headers={
+            "X-Profile-File": name,
+            "X-Profiled-Status": str(status[0]),
+            "X-Profiled-Time": f"{elapsed:.4f} ms",
+        })
+        await response(scope, receive, send)
+
+    async def _trace(self, scope, receive, send):
+        with tracing.tracing() as trace:
+            async def send_with_trace(message):
+                if message["type"] == "http.response.start":
+                    def write(path):
+                        with open(path, "w") as f:
+                            json.dump(trace.as_dict(), f, indent=2)
+                    name = self._store(scope, "trace", "json", write)
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-algorithm-trace", trace.summary().encode("latin-1")))
+                    headers.append((b"x-profile-file", name.encode("latin-1")))
+                    message = dict(message, headers=headers)
+                await send(message)
+
+            await self.app(scope, receive, send_with_trace)
@@ -21,3 +21,16 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
+
+def email_from_token(token: Optional[str]) -> Optional[str]:
+    """The account email of an access_token cookie value ("Bearer <jwt>"), or None if it is not valid"""
+    if not token:
+        return None
+    try:
+        scheme, token_str = token.split()
+        if scheme.lower() != 'bearer':
+            return None
+        payload = jwt.decode(token_str, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except (JWTError, ValueError):
+        return None
+    return payload.get("sub")
@@ -0,0 +1,144 @@
+import bisect
+import math
+import time
+import numpy as np
+import pandas as pd
+from app.core import metrics
+from app.logic.algorithms.sorting import SortResult, SortingAlgorithms
+from app.logic.algorithms.searching import SearchResult, SearchingAlgorithms
+
+class StudentColumns:
+    """
+    One snapshot of the students table as columns: a DataFrame ordered by id
+    whose string columns are already lowercased, plus per-key dense ranks and
+    sort orders computed on first use.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self.ids = frame["id"].to_numpy()
+        self._arrays = {}
+        self._ranks = {}
+        self._orders = {}
+        self._sorted_ranks = {}
+
+    def __len__(self):
+        return len(self.frame)
+
+    def column(self, key):
+        if key not in self._arrays:
+            if key not in self.frame.columns or key == "id":
+                raise ValueError(f"Kolom tidak dikenal: {key}")
+            # to_numpy copies string columns, so each array is materialized once
+            self._arrays[key] = self.frame[key].to_numpy()
+        return self._arrays[key]
+
+    def ranks(self, key):
+        """
+        (dense rank of every row's key, the distinct keys in ascending order): equal keys
+        share a rank, so sorts and equality masks run on integers instead of objects
+        """
+        if key not in self._ranks:
+            self._ranks[key] = pd.factorize(self.column(key), sort=True)
+        return self._ranks[key]
+
+    def rank_of(self, key, value):
+        """Rank of value among the distinct keys by binary search, or -1 if no row has it"""
+        _, uniques = self.ranks(key)
+        # bisect compares Python objects directly; np.searchsorted would convert object arrays per call
+        pos = bisect.bisect_left(uniques, value)
+        return pos if pos < len(uniques) and uniques[pos] == value else -1
+
+    def order(self, key, ascending=True):
+        """
+        Row positions in key order; ties stay in id order in both directions. key may be a
+        multi-key spec [(key, ascending), ...], sorted with one np.lexsort over the ranks.
+        """
+        if isinstance(key, (list, tuple)):
+            key, ascending = tuple((k, asc) for k, asc in key), True
+        if (key, ascending) not in self._orders:
+            if isinstance(key, tuple):
+                # lexsort takes the primary key last
+                ranks = [self.ranks(k)[0] if asc else -self.ranks(k)[0] for k, asc in reversed(key)]
+                self._orders[(key, ascending)] = np.lexsort(ranks)
+            else:
+                codes, _ = self.ranks(key)
+                self._orders[(key, ascending)] = np.argsort(codes if ascending else -codes, kind="stable")
+        return self._orders[(key, ascending)]
+
+    def sorted_ranks(self, key):
+        """The rank column in ascending order, for np.searchsorted"""
+        if key not in self._sorted_ranks:
+            codes, _ = self.ranks(key)
+            self._sorted_ranks[key] = codes[self.order(key)]
+        return self._sorted_ranks[key]
+
+class ColumnarAlgorithms:
+    """
+    Vectorized counterparts of SortingAlgorithms/SearchingAlgorithms: the loops
+    run inside NumPy on whole columns. Results use the same SortResult and
+    SearchResult shapes; sorts return student ids and searches return row
+    positions, which StudentColumnStore maps back to students.
+    """
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def argsort(columns: StudentColumns, key, ascending=True):
+        """
+        Stable argsort (lexsort for a multi-key spec) of the dense ranks, computed once
+        per snapshot; afterwards a sort is one gather
+        """
+        start_time = time.perf_counter()
+        ids = columns.ids[columns.order(key, ascending)].tolist()
+        end_time = time.perf_counter()
+        return SortResult(ids, len(ids), "O(n log n) - NumPy argsort", f"{(end_time - start_time) * 1000:.4f} ms")
+
+    @staticmethod
+    def _coerce(columns: StudentColumns, key, target):
+        """Casts target to the column's type and normalization; None if impossible"""
+        values = columns.column(key)
+        if len(values) == 0:
+            return None
+        sample = values[0]
+        if isinstance(sample, np.generic):
+            sample = sample.item()
+        return SearchingAlgorithms._coerce_target(target, sample)
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def mask_search(columns: StudentColumns, key, target):
+        """Vectorized linear search: one boolean mask over the whole rank column"""
+        start_time = time.perf_counter()
+        value = ColumnarAlgorithms._coerce(columns, key, target)
+        index = -1
+        if value is not None:
+            codes, _ = columns.ranks(key)
+            rank = columns.rank_of(key, value)
+            hits = np.flatnonzero(codes == rank) if rank >= 0 else ()
+            if len(hits):
+                index = int(hits[0])
+        end_time = time.perf_counter()
+        return SearchResult(index, len(columns), "O(n) - NumPy mask", f"{(end_time - start_time) * 1000:.4f} ms", index >= 0)
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def searchsorted_search(columns: StudentColumns, key, target):
+        """Binary search for the target's rank in the sorted rank column; index is the row position"""
+        start_time = time.perf_counter()
+        value = ColumnarAlgorithms._coerce(columns, key, target)
+        index = -1
+        steps = 0
+        if value is not None:
+            _, uniques = columns.ranks(key)
+            order, sorted_codes = columns.order(key), columns.sorted_ranks(key)
+            # One search for the rank among the distinct keys, one for its first row in the sorted ranks
+            steps = math.ceil(math.log2(len(uniques) + 1)) + math.ceil(math.log2(len(order) + 1))
+            rank = columns.rank_of(key, value)
+            if rank >= 0:
+                index = int(order[np.searchsorted(sorted_codes, rank, side="left")])
+        end_time = time.perf_counter()
+        return SearchResult(index, steps, "O(log n) - NumPy searchsorted", f"{(end_time - start_time) * 1000:.4f} ms", index >= 0)
+
+SortingAlgorithms.register("numpy", "NumPy argsort (Kolumnar)", ColumnarAlgorithms.argsort, source="columnar")
+SearchingAlgorithms.register("numpy_mask", "NumPy Boolean Mask (Kolumnar)", ColumnarAlgorithms.mask_search, "columnar")
+SearchingAlgorithms.register("numpy_searchsorted", "NumPy searchsorted (Kolumnar)", ColumnarAlgorithms.searchsorted_search, "columnar")
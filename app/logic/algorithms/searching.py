@@ -1,4 +1,9 @@
+import math
 import time
+from collections import Counter
+from contextlib import nullcontext
+from app.core import metrics
+from app.logic.algorithms import tracing
 
 class SearchResult:
     def __init__(self, index, steps, complexity, time_taken, found):
@@ -7,6 +12,54 @@ class SearchResult:
         self.complexity = complexity
         self.time_taken = time_taken
         self.found = found
+        trace = tracing.current()
+        if trace is not None:
+            trace.count("searches")
+            trace.count("steps", steps)
+            trace.count("found", bool(found))
+
+class RangeSearchResult(SearchResult):
+    """Every match: the slice [index, stop) of the sorted data"""
+    def __init__(self, index, stop, steps, complexity, time_taken):
+        super().__init__(index, steps, complexity, time_taken, stop > index)
+        self.stop = stop
+
+    @property
+    def count(self):
+        return self.stop - self.index
+
+class FuzzySearchResult(SearchResult):
+    """matches holds (id, edit distance) for the top-k candidates, best first; index is the best id"""
+    def __init__(self, matches, steps, complexity, time_taken):
+        super().__init__(matches[0][0] if matches else -1, steps, complexity, time_taken, bool(matches))
+        self.matches = matches
+
+    @property
+    def count(self):
+        return len(self.matches)
+
+class BatchSearchResult:
+    """results holds one (target, SearchResult) per target, in the order the targets were given"""
+    def __init__(self, results, steps, complexity, time_taken):
+        self.results = results
+        self.steps = steps
+        self.complexity = complexity
+        self.time_taken = time_taken
+
+    @property
+    def found_count(self):
+        return sum(1 for _, result in self.results if result.found)
+
+class SearchAlgorithmInfo:
+    """source tells the caller what the algorithm runs on: the plain student list ("list"),
+    a sorted index ("sorted"), a sorted index with numeric keys ("numeric"), a hash index
+    ("hash"), a sorted index queried for a slice of matches ("range", "prefix"), a
+    trigram index ("fuzzy") or ColumnarAlgorithms on a column snapshot ("columnar")"""
+    def __init__(self, name, label, func, source):
+        self.name = name
+        self.label = label
+        self.func = func
+        self.source = source
 
 class SearchingAlgorithms:
 
@@ -19,6 +72,7 @@ class SearchingAlgorithms:
         return getattr(item, key, item)
 
     @staticmethod
+    @metrics.instrumented("algorithm")
     def linear_search(data, target, key=None):
         steps = 0
         start_time = time.perf_counter()
@@ -39,10 +93,11 @@ class SearchingAlgorithms:
 
     @staticmethod
     def sequential_search(data, target, key=None):
-        """Alias for Linear Search as requested."""
+        """Alias for Linear Search as requested; linear_search records the algorithm time."""
         return SearchingAlgorithms.linear_search(data, target, key)
 
     @staticmethod
+    @metrics.instrumented("algorithm")
     def binary_search(data, target, key=None):
         # Assumes data is sorted by the SAME key
         steps = 0
@@ -99,3 +154,426 @@ class SearchingAlgorithms:
                 
         end_time = time.perf_counter()
         return SearchResult(-1, steps, "O(log n)", f"{(end_time - start_time) * 1000:.4f} ms", False)
+
+    @staticmethod
+    def _linear_form(val):
+        """The string form linear_search compares: case insensitive for strings"""
+        return str(val).lower() if isinstance(val, str) else str(val)
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def batch_linear_search(data, targets, key=None):
+        """
+        Hash join: one pass over data maps every value to its first index, then each
+        target is a dictionary probe. Matches linear_search for every target.
+        """
+        start_time = time.perf_counter()
+        first_index = {}
+        for i, item in enumerate(data):
+            first_index.setdefault(SearchingAlgorithms._linear_form(SearchingAlgorithms._get_val(item, key)), i)
+        steps = len(data)
+        
+        results = []
+        for target in targets:
+            probe_start = time.perf_counter()
+            i = first_index.get(SearchingAlgorithms._linear_form(target), -1)
+            steps += 1
+            probe_time = f"{(time.perf_counter() - probe_start) * 1000:.4f} ms"
+            results.append((target, SearchResult(i, 1, "O(1)", probe_time, i >= 0)))
+        
+        end_time = time.perf_counter()
+        return BatchSearchResult(results, steps, "O(n + m)", f"{(end_time - start_time) * 1000:.4f} ms")
+
+    @staticmethod
+    def _lower_bound(keys, value, lo=0, hi=None):
+        """First position in sorted keys whose key is >= value; returns (position, steps)"""
+        if hi is None:
+            hi = len(keys)
+        steps = 0
+        while lo < hi:
+            steps += 1
+            mid = (lo + hi) // 2
+            if keys[mid] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo, steps
+
+    @staticmethod
+    def _upper_bound(keys, value, lo=0, hi=None):
+        """First position in sorted keys whose key is > value; returns (position, steps)"""
+        if hi is None:
+            hi = len(keys)
+        steps = 0
+        while lo < hi:
+            steps += 1
+            mid = (lo + hi) // 2
+            if keys[mid] <= value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo, steps
+
+    @staticmethod
+    def _sorted_keys(data, key):
+        """Normalized keys of data sorted by key; with key=None data already holds them and is not copied"""
+        if key is None:
+            return data
+        trace = tracing.current()
+        with trace.phase("prepare") if trace is not None else nullcontext():
+            keys = [SearchingAlgorithms._get_val(item, key) for item in data]
+            return [k.lower() if isinstance(k, str) else k for k in keys]
+
+    @staticmethod
+    def _coerce_target(target, sample):
+        """Casts target to the type of the (normalized) data keys like binary_search does; None if impossible"""
+        try:
+            value = type(sample)(target)
+        except (TypeError, ValueError):
+            return None
+        return value.lower() if isinstance(value, str) else value
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def batch_binary_search(data, targets, key=None):
+        """
+        Looks up many targets in data sorted by key. Few targets use one binary
+        search each (O(m log n)); many targets are sorted and merged with the data
+        in a single walk (O(m log m + n)), whichever needs fewer comparisons.
+        With key=None, data is taken as already normalized sorted keys (such as
+        a StudentIndexService index) and is not copied.
+        """
+        start_time = time.perf_counter()
+        n = len(data)
+        m = len(targets)
+        results = [None] * m
+        
+        if n == 0:
+            for t, target in enumerate(targets):
+                results[t] = (target, SearchResult(-1, 0, "O(log n)", "0.0000 ms", False))
+            end_time = time.perf_counter()
+            return BatchSearchResult(results, 0, "O(m log n)", f"{(end_time - start_time) * 1000:.4f} ms")
+        
+        keys = SearchingAlgorithms._sorted_keys(data, key)
+        coerced = [SearchingAlgorithms._coerce_target(target, keys[0]) for target in targets]
+        steps = 0
+        
+        if m * math.log2(n + 1) < n:
+            complexity = "O(m log n)"
+            for t, target in enumerate(targets):
+                probe_start = time.perf_counter()
+                value = coerced[t]
+                probes = 0
+                i = -1
+                if value is not None:
+                    pos, probes = SearchingAlgorithms._lower_bound(keys, value)
+                    if pos < n and keys[pos] == value:
+                        i = pos
+                steps += probes
+                probe_time = f"{(time.perf_counter() - probe_start) * 1000:.4f} ms"
+                results[t] = (target, SearchResult(i, probes, "O(log n)", probe_time, i >= 0))
+        else:
+            complexity = "O(m log m + n)"
+            order = sorted((t for t in range(m) if coerced[t] is not None), key=coerced.__getitem__)
+            pos = 0
+            for t in order:
+                value = coerced[t]
+                walked = 0
+                while pos < n and keys[pos] < value:
+                    pos += 1
+                    walked += 1
+                steps += walked + 1
+                i = pos if pos < n and keys[pos] == value else -1
+                results[t] = (targets[t], SearchResult(i, walked + 1, "O(n / m)", "-", i >= 0))
+            for t in range(m):
+                if results[t] is None:
+                    results[t] = (targets[t], SearchResult(-1, 0, "O(1)", "-", False))
+        
+        end_time = time.perf_counter()
+        return BatchSearchResult(results, steps, complexity, f"{(end_time - start_time) * 1000:.4f} ms")
+
+    @staticmethod
+    def build_hash_index(data, key=None):
+        """Maps the linear_search form of every value to the positions holding it, in order"""
+        index = {}
+        for i, item in enumerate(data):
+            index.setdefault(SearchingAlgorithms._linear_form(SearchingAlgorithms._get_val(item, key)), []).append(i)
+        return index
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def hash_search(index, target):
+        """
+        One dictionary probe into an index from build_hash_index (or any mapping of
+        normalized value -> positions). Average O(1); the index is built once and reused.
+        """
+        start_time = time.perf_counter()
+        positions = index.get(SearchingAlgorithms._linear_form(target))
+        end_time = time.perf_counter()
+        if positions:
+            return SearchResult(positions[0], 1, "O(1)", f"{(end_time - start_time) * 1000:.4f} ms", True)
+        return SearchResult(-1, 1, "O(1)", f"{(end_time - start_time) * 1000:.4f} ms", False)
+
+    @staticmethod
+    def _sorted_key(data, i, key):
+        val = SearchingAlgorithms._get_val(data[i], key)
+        return val.lower() if isinstance(val, str) else val
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def exponential_search(data, target, key=None):
+        """
+        Galloping search on data sorted by key: the bound doubles until it passes
+        the target, then the last gap is binary searched. O(log i) for a match at
+        position i, so targets near the front take fewer steps than binary search.
+        """
+        steps = 0
+        start_time = time.perf_counter()
+        n = len(data)
+        value = SearchingAlgorithms._coerce_target(target, SearchingAlgorithms._sorted_key(data, 0, key)) if n else None
+        
+        if value is not None:
+            # Gallop
+            bound = 1
+            while bound < n:
+                steps += 1
+                if SearchingAlgorithms._sorted_key(data, bound - 1, key) >= value:
+                    break
+                bound *= 2
+            
+            # Lower bound inside [bound / 2, bound)
+            left = bound // 2
+            right = min(bound, n)
+            while left < right:
+                steps += 1
+                mid = (left + right) // 2
+                if SearchingAlgorithms._sorted_key(data, mid, key) < value:
+                    left = mid + 1
+                else:
+                    right = mid
+            
+            if left < n and SearchingAlgorithms._sorted_key(data, left, key) == value:
+                end_time = time.perf_counter()
+                return SearchResult(left, steps, "O(log i)", f"{(end_time - start_time) * 1000:.4f} ms", True)
+        
+        end_time = time.perf_counter()
+        return SearchResult(-1, steps, "O(log i)", f"{(end_time - start_time) * 1000:.4f} ms", False)
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def interpolation_search(data, target, key=None):
+        """
+        Probes where the target should be if the numeric keys were evenly spread
+        between the current bounds. O(log log n) on uniform data such as IPK or
+        sequential NIMs, O(n) in the worst case.
+        """
+        steps = 0
+        start_time = time.perf_counter()
+        n = len(data)
+        
+        if n:
+            sample = SearchingAlgorithms._sorted_key(data, 0, key)
+            if isinstance(sample, bool) or not isinstance(sample, (int, float)):
+                raise ValueError("Interpolation search hanya untuk kunci numerik (NIM/IPK)")
+            value = SearchingAlgorithms._coerce_target(target, sample)
+        else:
+            value = None
+        
+        if value is not None:
+            low = 0
+            high = n - 1
+            low_val = SearchingAlgorithms._sorted_key(data, low, key)
+            high_val = SearchingAlgorithms._sorted_key(data, high, key)
+            while low <= high and low_val <= value <= high_val:
+                steps += 1
+                if high_val == low_val:
+                    pos = low
+                else:
+                    pos = low + int((value - low_val) * (high - low) // (high_val - low_val))
+                pos_val = SearchingAlgorithms._sorted_key(data, pos, key)
+                
+                if pos_val == value:
+                    end_time = time.perf_counter()
+                    return SearchResult(pos, steps, "O(log log n)", f"{(end_time - start_time) * 1000:.4f} ms", True)
+                elif pos_val < value:
+                    low = pos + 1
+                    if low <= high:
+                        low_val = SearchingAlgorithms._sorted_key(data, low, key)
+                else:
+                    high = pos - 1
+                    if low <= high:
+                        high_val = SearchingAlgorithms._sorted_key(data, high, key)
+        
+        end_time = time.perf_counter()
+        return SearchResult(-1, steps, "O(log log n)", f"{(end_time - start_time) * 1000:.4f} ms", False)
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def range_search(data, low=None, high=None, key=None):
+        """
+        Every item with low <= key <= high in data sorted by key (None leaves that
+        side open): one lower bound and one upper bound search, O(log n + k) to
+        read the k matches. With key=None, data is taken as normalized sorted keys.
+        """
+        start_time = time.perf_counter()
+        keys = SearchingAlgorithms._sorted_keys(data, key)
+        n = len(keys)
+        start, stop, steps = 0, n, 0
+        
+        if n:
+            low_val = SearchingAlgorithms._coerce_target(low, keys[0]) if low is not None else None
+            high_val = SearchingAlgorithms._coerce_target(high, keys[0]) if high is not None else None
+            if (low is not None and low_val is None) or (high is not None and high_val is None):
+                start = stop = 0
+            else:
+                if low_val is not None:
+                    start, probes = SearchingAlgorithms._lower_bound(keys, low_val)
+                    steps += probes
+                if high_val is not None:
+                    stop, probes = SearchingAlgorithms._upper_bound(keys, high_val, start)
+                    steps += probes
+                stop = max(start, stop)
+        
+        end_time = time.perf_counter()
+        return RangeSearchResult(start, stop, steps, "O(log n + k)", f"{(end_time - start_time) * 1000:.4f} ms")
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def prefix_search(data, prefix, key=None):
+        """
+        Every item whose (case insensitive) text key starts with prefix. Items sharing a
+        prefix are contiguous in sorted order, so this is a range search: a lower bound
+        on the prefix and a bound on the first key whose leading characters sort after it.
+        """
+        start_time = time.perf_counter()
+        keys = SearchingAlgorithms._sorted_keys(data, key)
+        n = len(keys)
+        start, stop, steps = 0, 0, 0
+        
+        if n:
+            if not isinstance(keys[0], str):
+                raise ValueError("Prefix search hanya untuk kunci teks (Nama/NIM/Email)")
+            prefix = str(prefix).lower()
+            size = len(prefix)
+            start, steps = SearchingAlgorithms._lower_bound(keys, prefix)
+            
+            # Upper bound on the truncated keys
+            lo, hi = start, n
+            while lo < hi:
+                steps += 1
+                mid = (lo + hi) // 2
+                if keys[mid][:size] <= prefix:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            stop = lo
+        
+        end_time = time.perf_counter()
+        return RangeSearchResult(start, stop, steps, "O(log n + k)", f"{(end_time - start_time) * 1000:.4f} ms")
+
+    @staticmethod
+    def trigrams(text):
+        """Trigrams of the normalized text, padded so word starts and ends count too"""
+        text = " ".join(str(text).lower().split())
+        padded = f"  {text} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    @staticmethod
+    def edit_distance(a, b, limit=None):
+        """Levenshtein distance; stops early and returns limit + 1 once it must exceed limit"""
+        if len(a) < len(b):
+            a, b = b, a
+        if limit is not None and len(a) - len(b) > limit:
+            return limit + 1
+        previous = list(range(len(b) + 1))
+        for i, ca in enumerate(a, 1):
+            current = [i]
+            for j, cb in enumerate(b, 1):
+                current.append(min(
+                    previous[j] + 1, # Deletion
+                    current[j - 1] + 1, # Insertion
+                    previous[j - 1] + (ca != cb), # Substitution
+                ))
+            if limit is not None and min(current) > limit:
+                return limit + 1
+            previous = current
+        return previous[-1]
+
+    @staticmethod
+    def build_trigram_index(data, key=None):
+        """Inverted index for fuzzy_search: (trigram -> set of positions, position -> normalized text)"""
+        postings = {}
+        values = {}
+        for i, item in enumerate(data):
+            val = SearchingAlgorithms._get_val(item, key)
+            if val is None:
+                continue
+            values[i] = " ".join(str(val).lower().split())
+            for gram in SearchingAlgorithms.trigrams(val):
+                postings.setdefault(gram, set()).add(i)
+        return postings, values
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def fuzzy_search(postings, values, target, k=10):
+        """
+        Approximate match through a trigram inverted index: entries sharing the most
+        trigrams with the target become candidates, and the candidates are ranked by
+        edit distance (ties by trigram similarity). Only the postings of the target's
+        trigrams are read, never the whole data set. k <= 0 asks for no matches.
+        """
+        start_time = time.perf_counter()
+        if k <= 0:
+            return FuzzySearchResult([], 0, "O(1)", f"{(time.perf_counter() - start_time) * 1000:.4f} ms")
+        query = " ".join(str(target).lower().split())
+        query_grams = SearchingAlgorithms.trigrams(query)
+        
+        shared = Counter()
+        steps = 0
+        for gram in query_grams:
+            ids = postings.get(gram)
+            if ids:
+                shared.update(ids)
+                steps += len(ids)
+        
+        # Rank a bounded number of the best trigram candidates by edit distance
+        ranked = []
+        for candidate, common in shared.most_common(max(k * 10, 50)):
+            steps += 1
+            text = values[candidate]
+            limit = ranked[k - 1][0] if len(ranked) >= k else None
+            distance = SearchingAlgorithms.edit_distance(query, text, limit)
+            if limit is not None and distance > limit:
+                continue
+            similarity = common / (len(query_grams) + len(SearchingAlgorithms.trigrams(text)) - common)
+            ranked.append((distance, -similarity, text, candidate))
+            ranked.sort()
+            del ranked[k:]
+        
+        end_time = time.perf_counter()
+        matches = [(candidate, distance) for distance, _, _, candidate in ranked]
+        return FuzzySearchResult(matches, steps, "O(p + c log k)", f"{(end_time - start_time) * 1000:.4f} ms")
+
+    REGISTRY = {}
+
+    @staticmethod
+    def trace():
+        """Context manager yielding an AlgorithmTrace of the algorithms run inside it, see tracing"""
+        return tracing.tracing()
+
+    @classmethod
+    def register(cls, name, label, func, source):
+        cls.REGISTRY[name] = SearchAlgorithmInfo(name, label, func, source)
+
+for _name, _label, _func, _source in [
+    ("linear", "Linear Search", SearchingAlgorithms.linear_search, "list"),
+    ("sequential", "Sequential Search", SearchingAlgorithms.sequential_search, "list"),
+    ("binary", "Binary Search (Sorted)", SearchingAlgorithms.binary_search, "sorted"),
+    ("exponential", "Exponential Search (Sorted)", SearchingAlgorithms.exponential_search, "sorted"),
+    ("interpolation", "Interpolation Search (NIM/IPK)", SearchingAlgorithms.interpolation_search, "numeric"),
+    ("hash", "Hash Index (NIM/Email/Nama)", SearchingAlgorithms.hash_search, "hash"),
+    ("range", "Range Search (Min - Maks)", SearchingAlgorithms.range_search, "range"),
+    ("prefix", "Prefix Search (Awalan)", SearchingAlgorithms.prefix_search, "prefix"),
+    ("fuzzy", "Fuzzy Search (Nama, Trigram)", SearchingAlgorithms.fuzzy_search, "fuzzy"),
+]:
+    SearchingAlgorithms.register(_name, _label, _func, _source)
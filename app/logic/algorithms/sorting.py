@@ -1,4 +1,8 @@
+import operator
 import time
+from contextlib import nullcontext
+from app.core import metrics
+from app.logic.algorithms import tracing
 
 class SortResult:
     def __init__(self, data, steps, complexity, time_taken):
@@ -6,8 +10,56 @@ class SortResult:
         self.steps = steps
         self.complexity = complexity
         self.time_taken = time_taken
+        trace = tracing.current()
+        if trace is not None:
+            trace.count("sorts")
+            trace.count("steps", steps)
+
+class AlgorithmInfo:
+    """
+    source is "list" for algorithms on a list of rows, "topk" for partial sorts on a list
+    of rows that also take k and group_by, "columnar" for ColumnarAlgorithms on a column snapshot
+    """
+    def __init__(self, name, label, func, source="list"):
+        self.name = name
+        self.label = label
+        self.func = func
+        self.source = source
+
+class _MissingKey:
+    """Key of a missing (None) value: before every other key, like NULL in SQLite's ORDER BY"""
+    __slots__ = ()
+
+    def __lt__(self, other):
+        return other is not self
+
+    def __le__(self, other):
+        return True
+
+    def __gt__(self, other):
+        return False
+
+    def __ge__(self, other):
+        return other is self
+
+    def __eq__(self, other):
+        return other is self
+
+    def __hash__(self):
+        return 0
+
+    def __repr__(self):
+        return "MISSING"
+
+MISSING = _MissingKey()
 
 class SortingAlgorithms:
+    """
+    Every algorithm works on a parallel array of precomputed keys
+    (decorate-sort-undecorate): the key of each row is extracted and
+    normalized once, the algorithm moves keys together with the original
+    row positions, and the rows are permuted only at the end.
+    """
     
     @staticmethod
     def _get_val(item, key):
@@ -18,35 +70,102 @@ class SortingAlgorithms:
         return getattr(item, key, item)
 
     @staticmethod
-    def _compare(val_a, val_b, ascending=True):
-        """Returns True if val_a should come AFTER val_b (i.e., swap needed in bubble sort logic)"""
-        # Handle case insensitive string comparison
-        if isinstance(val_a, str) and isinstance(val_b, str):
-            val_a = val_a.lower()
-            val_b = val_b.lower()
-            
-        if ascending:
-            return val_a > val_b
-        else:
-            return val_a < val_b
+    def _normalize(val):
+        """Strings are compared case insensitively; None sorts first ascending and last descending"""
+        if isinstance(val, str):
+            return val.lower()
+        return MISSING if val is None else val
+
+    @staticmethod
+    def _extract_keys(arr, key):
+        """
+        Decorate: returns the normalized key of every row, computed exactly once.
+        key may also be a multi-key spec, see _composite_keys.
+        """
+        trace = tracing.current()
+        with trace.phase("extract") if trace is not None else nullcontext():
+            if isinstance(key, (list, tuple)):
+                return SortingAlgorithms._composite_keys(arr, key)
+            get_val = SortingAlgorithms._get_val
+            normalize = SortingAlgorithms._normalize
+            return [normalize(get_val(item, key)) for item in arr]
+
+    @staticmethod
+    def _composite_keys(arr, spec):
+        """
+        One tuple per row for a spec [(key, ascending), ...], ordered ascending in a
+        single pass: descending numbers are negated and descending strings are
+        replaced by their negated dense rank instead of being reversed. The row
+        position comes last, so every algorithm returns the stable order.
+        """
+        columns = []
+        for key, ascending in spec:
+            values = SortingAlgorithms._extract_keys(arr, key)
+            if not ascending:
+                if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+                    values = [-v for v in values]
+                else:
+                    rank = {v: r for r, v in enumerate(sorted(set(values)))}
+                    values = [-rank[v] for v in values]
+            columns.append(values)
+        columns.append(range(len(arr)))
+        return list(zip(*columns))
 
     @staticmethod
+    def parse_sort_spec(text, allowed):
+        """'jurusan asc, ipk desc, nama' -> [("jurusan", True), ("ipk", False), ("nama", True)]"""
+        spec = []
+        for part in text.split(","):
+            words = part.split()
+            if not words:
+                continue
+            if len(words) > 2 or (len(words) == 2 and words[1].lower() not in ("asc", "desc")):
+                raise ValueError(f"Urutan tidak valid: {part.strip()}")
+            name = words[0].lower()
+            if name not in allowed:
+                raise ValueError(f"Kolom pengurutan tidak dikenal: {name}")
+            spec.append((name, len(words) == 1 or words[1].lower() == "asc"))
+        if not spec:
+            raise ValueError("Urutan multi-kunci kosong")
+        return spec
+
+    @staticmethod
+    def _undecorate(arr, order):
+        """Undecorate: permutes the original rows into the sorted order"""
+        trace = tracing.current()
+        with trace.phase("undecorate") if trace is not None else nullcontext():
+            return [arr[i] for i in order]
+
+    @staticmethod
+    def _after(ascending=True):
+        """Returns a predicate that is True if key_a should come AFTER key_b; it counts comparisons while tracing"""
+        return tracing.predicate(operator.gt if ascending else operator.lt)
+
+    @staticmethod
+    def _before(ascending=True):
+        """Returns a predicate that is True if key_a should come BEFORE key_b; it counts comparisons while tracing"""
+        return tracing.predicate(operator.lt if ascending else operator.gt)
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
     def bubble_sort(arr, key=None, ascending=True):
-        data = arr.copy()
-        n = len(data)
+        n = len(arr)
         steps = 0
         start_time = time.perf_counter()
         
+        keys = SortingAlgorithms._extract_keys(arr, key)
+        order = list(range(n))
+        after = SortingAlgorithms._after(ascending)
+        
         for i in range(n):
             for j in range(0, n-i-1):
                 steps += 1 # Comparison
-                val_a = SortingAlgorithms._get_val(data[j], key)
-                val_b = SortingAlgorithms._get_val(data[j+1], key)
-                
-                if SortingAlgorithms._compare(val_a, val_b, ascending):
-                    data[j], data[j+1] = data[j+1], data[j]
+                if after(keys[j], keys[j+1]):
+                    keys[j], keys[j+1] = keys[j+1], keys[j]
+                    order[j], order[j+1] = order[j+1], order[j]
                     steps += 1 # Swap
         
+        data = SortingAlgorithms._undecorate(arr, order)
         end_time = time.perf_counter()
         return SortResult(
             data, 
@@ -56,177 +175,579 @@ class SortingAlgorithms:
         )
 
     @staticmethod
+    @metrics.instrumented("algorithm")
     def selection_sort(arr, key=None, ascending=True):
-        data = arr.copy()
-        n = len(data)
+        n = len(arr)
         steps = 0
         start_time = time.perf_counter()
         
+        keys = SortingAlgorithms._extract_keys(arr, key)
+        order = list(range(n))
+        # Ascending: find MIN, Descending: find MAX
+        before = SortingAlgorithms._before(ascending)
+        
         for i in range(n):
             target_idx = i
             for j in range(i+1, n):
                 steps += 1 # Comparison
-                val_j = SortingAlgorithms._get_val(data[j], key)
-                val_target = SortingAlgorithms._get_val(data[target_idx], key)
-                
-                # For selection sort:
-                # Ascending: find MIN (if val_j < val_target, update target)
-                # Descending: find MAX (if val_j > val_target, update target)
-                # equivalent to: if NOT compare(val_j, val_target, ascending) -> logic invalid for compare func above
-                # Let's write explicit logic:
-                should_update = False
-                if isinstance(val_j, str) and isinstance(val_target, str):
-                    val_j = val_j.lower()
-                    val_target = val_target.lower()
-
-                if ascending:
-                    if val_j < val_target: should_update = True
-                else:
-                    if val_j > val_target: should_update = True
-                
-                if should_update:
+                if before(keys[j], keys[target_idx]):
                     target_idx = j
             
-            data[i], data[target_idx] = data[target_idx], data[i]
+            keys[i], keys[target_idx] = keys[target_idx], keys[i]
+            order[i], order[target_idx] = order[target_idx], order[i]
             steps += 1 # Swap
             
+        data = SortingAlgorithms._undecorate(arr, order)
         end_time = time.perf_counter()
         return SortResult(data, steps, "O(n^2)", f"{(end_time - start_time) * 1000:.4f} ms")
 
     @staticmethod
+    @metrics.instrumented("algorithm")
     def insertion_sort(arr, key=None, ascending=True):
-        data = arr.copy()
         steps = 0
         start_time = time.perf_counter()
         
-        for i in range(1, len(data)):
-            item = data[i]
-            item_val = SortingAlgorithms._get_val(item, key)
-            if isinstance(item_val, str): item_val = item_val.lower()
+        keys = SortingAlgorithms._extract_keys(arr, key)
+        order = list(range(len(arr)))
+        # Ascending: while item < curr (move curr right)
+        # Descending: while item > curr (move curr right)
+        before = SortingAlgorithms._before(ascending)
+        
+        for i in range(1, len(keys)):
+            item_key = keys[i]
+            item_pos = order[i]
 
             j = i-1
             steps += 1 # Initial check
             
-            while j >= 0:
-                curr_val = SortingAlgorithms._get_val(data[j], key)
-                if isinstance(curr_val, str): curr_val = curr_val.lower()
-                
-                # Ascending: while item < curr (move curr right)
-                # Descending: while item > curr (move curr right)
-                condition = False
-                if ascending:
-                     if item_val < curr_val: condition = True
-                else:
-                     if item_val > curr_val: condition = True
-                
-                if condition:
-                    steps += 1 
-                    data[j + 1] = data[j]
-                    steps += 1 # Shift
-                    j -= 1
-                else:
-                    break
-            data[j + 1] = item
+            while j >= 0 and before(item_key, keys[j]):
+                steps += 1 
+                keys[j + 1] = keys[j]
+                order[j + 1] = order[j]
+                steps += 1 # Shift
+                j -= 1
+            keys[j + 1] = item_key
+            order[j + 1] = item_pos
             steps += 1 # Assignment
             
+        data = SortingAlgorithms._undecorate(arr, order)
         end_time = time.perf_counter()
         return SortResult(data, steps, "O(n^2)", f"{(end_time - start_time) * 1000:.4f} ms")
 
     @staticmethod
+    @metrics.instrumented("algorithm")
     def merge_sort(arr, key=None, ascending=True):
-        data = arr.copy()
         steps = [0] 
         start_time = time.perf_counter()
         
-        result = SortingAlgorithms._merge_sort_recursive(data, steps, key, ascending)
+        keys = SortingAlgorithms._extract_keys(arr, key)
+        order = list(range(len(arr)))
+        _, order = SortingAlgorithms._merge_sort_recursive(keys, order, steps, ascending)
         
+        result = SortingAlgorithms._undecorate(arr, order)
         end_time = time.perf_counter()
         return SortResult(result, steps[0], "O(n log n)", f"{(end_time - start_time) * 1000:.4f} ms")
 
     @staticmethod
-    def _merge_sort_recursive(arr, steps, key, ascending):
-        if len(arr) <= 1:
-            return arr
+    def _merge_sort_recursive(keys, order, steps, ascending):
+        if len(keys) <= 1:
+            return keys, order
             
-        mid = len(arr) // 2
-        left = SortingAlgorithms._merge_sort_recursive(arr[:mid], steps, key, ascending)
-        right = SortingAlgorithms._merge_sort_recursive(arr[mid:], steps, key, ascending)
+        mid = len(keys) // 2
+        left = SortingAlgorithms._merge_sort_recursive(keys[:mid], order[:mid], steps, ascending)
+        right = SortingAlgorithms._merge_sort_recursive(keys[mid:], order[mid:], steps, ascending)
         
-        return SortingAlgorithms._merge(left, right, steps, key, ascending)
+        return SortingAlgorithms._merge(left, right, steps, ascending)
 
     @staticmethod
-    def _merge(left, right, steps, key, ascending):
-        sorted_arr = []
+    def _merge(left, right, steps, ascending):
+        left_keys, left_order = left
+        right_keys, right_order = right
+        before = SortingAlgorithms._before(ascending)
+        sorted_keys = []
+        sorted_order = []
         i = j = 0
         
-        while i < len(left) and j < len(right):
+        while i < len(left_keys) and j < len(right_keys):
             steps[0] += 1 # Comparison
             
-            val_a = SortingAlgorithms._get_val(left[i], key)
-            val_b = SortingAlgorithms._get_val(right[j], key)
-            if isinstance(val_a, str) and isinstance(val_b, str):
-                val_a = val_a.lower()
-                val_b = val_b.lower()
-            
-            condition = False
-            if ascending:
-                if val_a < val_b: condition = True
-            else:
-                if val_a > val_b: condition = True
-
-            if condition:
-                sorted_arr.append(left[i])
+            if before(left_keys[i], right_keys[j]):
+                sorted_keys.append(left_keys[i])
+                sorted_order.append(left_order[i])
                 i += 1
             else:
-                sorted_arr.append(right[j])
+                sorted_keys.append(right_keys[j])
+                sorted_order.append(right_order[j])
                 j += 1
             steps[0] += 1 # Append
         
-        sorted_arr.extend(left[i:])
-        steps[0] += len(left[i:])
-        sorted_arr.extend(right[j:])
-        steps[0] += len(right[j:])
+        sorted_keys.extend(left_keys[i:])
+        sorted_order.extend(left_order[i:])
+        steps[0] += len(left_keys) - i
+        sorted_keys.extend(right_keys[j:])
+        sorted_order.extend(right_order[j:])
+        steps[0] += len(right_keys) - j
+        
+        return sorted_keys, sorted_order
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def natural_merge_sort(arr, key=None, ascending=True):
+        """
+        Bottom-up merge sort over natural runs. Merges ping-pong between the
+        key/order arrays and one preallocated auxiliary pair, so no lists are
+        created per level and already sorted input finishes in a single O(n) scan.
+        """
+        n = len(arr)
+        steps = 0
+        start_time = time.perf_counter()
+        
+        keys = SortingAlgorithms._extract_keys(arr, key)
+        order = list(range(n))
+        before = SortingAlgorithms._before(ascending)
+        
+        # Run detection: strictly descending runs are reversed in place (reversing
+        # only strict runs keeps equal keys in their original order)
+        bounds = [0]
+        i = 0
+        while i < n:
+            j = i + 1
+            if j < n:
+                steps += 1 # Comparison
+                if before(keys[j], keys[i]):
+                    j += 1
+                    while j < n:
+                        steps += 1 # Comparison
+                        if not before(keys[j], keys[j - 1]):
+                            break
+                        j += 1
+                    lo, hi = i, j - 1
+                    while lo < hi:
+                        keys[lo], keys[hi] = keys[hi], keys[lo]
+                        order[lo], order[hi] = order[hi], order[lo]
+                        steps += 1 # Swap
+                        lo += 1
+                        hi -= 1
+                else:
+                    j += 1
+                    while j < n:
+                        steps += 1 # Comparison
+                        if before(keys[j], keys[j - 1]):
+                            break
+                        j += 1
+            bounds.append(j)
+            i = j
+        
+        src_keys, src_order = keys, order
+        dst_keys, dst_order = [None] * n, [0] * n
+        while len(bounds) > 2:
+            merged_bounds = [0]
+            for r in range(0, len(bounds) - 1, 2):
+                lo = bounds[r]
+                mid = bounds[r + 1]
+                hi = bounds[r + 2] if r + 2 < len(bounds) else mid
+                
+                i, j, k = lo, mid, lo
+                while i < mid and j < hi:
+                    steps += 1 # Comparison
+                    # Take from the right run only when strictly before: stable
+                    if before(src_keys[j], src_keys[i]):
+                        dst_keys[k] = src_keys[j]
+                        dst_order[k] = src_order[j]
+                        j += 1
+                    else:
+                        dst_keys[k] = src_keys[i]
+                        dst_order[k] = src_order[i]
+                        i += 1
+                    k += 1
+                while i < mid:
+                    dst_keys[k] = src_keys[i]
+                    dst_order[k] = src_order[i]
+                    i += 1
+                    k += 1
+                while j < hi:
+                    dst_keys[k] = src_keys[j]
+                    dst_order[k] = src_order[j]
+                    j += 1
+                    k += 1
+                steps += hi - lo # Placements
+                merged_bounds.append(hi)
+            bounds = merged_bounds
+            src_keys, dst_keys = dst_keys, src_keys
+            src_order, dst_order = dst_order, src_order
         
-        return sorted_arr
+        data = SortingAlgorithms._undecorate(arr, src_order)
+        end_time = time.perf_counter()
+        return SortResult(data, steps, "O(n) - O(n log n)", f"{(end_time - start_time) * 1000:.4f} ms")
 
     @staticmethod
+    @metrics.instrumented("algorithm")
     def shell_sort(arr, key=None, ascending=True):
-        data = arr.copy()
-        n = len(data)
+        n = len(arr)
         gap = n // 2
         steps = 0
         start_time = time.perf_counter()
         
+        keys = SortingAlgorithms._extract_keys(arr, key)
+        order = list(range(n))
+        # Ascending: while gap_val > temp (move gap_val right)
+        # Descending: while gap_val < temp (move gap_val right)
+        after = SortingAlgorithms._after(ascending)
+        
         while gap > 0:
             for i in range(gap, n):
-                temp = data[i]
-                temp_val = SortingAlgorithms._get_val(temp, key)
-                if isinstance(temp_val, str): temp_val = temp_val.lower()
+                temp_key = keys[i]
+                temp_pos = order[i]
                 
                 j = i
                 steps += 1 
                 
-                while j >= gap:
-                    gap_val = SortingAlgorithms._get_val(data[j - gap], key)
-                    if isinstance(gap_val, str): gap_val = gap_val.lower()
-                    
-                    # Ascending: while gap_val > temp (move gap_val right)
-                    # Descending: while gap_val < temp (move gap_val right)
-                    condition = False
-                    if ascending:
-                         if gap_val > temp_val: condition = True
-                    else:
-                         if gap_val < temp_val: condition = True
-                    
-                    if condition:
-                        steps += 1
-                        data[j] = data[j - gap]
-                        j -= gap
-                    else:
-                        break
-                data[j] = temp
+                while j >= gap and after(keys[j - gap], temp_key):
+                    steps += 1
+                    keys[j] = keys[j - gap]
+                    order[j] = order[j - gap]
+                    j -= gap
+                keys[j] = temp_key
+                order[j] = temp_pos
                 steps += 1
             gap //= 2
             
+        data = SortingAlgorithms._undecorate(arr, order)
         end_time = time.perf_counter()
         return SortResult(data, steps, "O(n log n) - O(n^2)", f"{(end_time - start_time) * 1000:.4f} ms")
+
+    # Ranges at or below this size are left for the final insertion sort pass of quick_sort
+    _INSERTION_THRESHOLD = 16
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def quick_sort(arr, key=None, ascending=True):
+        """Introsort: median-of-three quicksort falling back to heap sort on deep partitions"""
+        n = len(arr)
+        steps = [0]
+        start_time = time.perf_counter()
+        
+        keys = SortingAlgorithms._extract_keys(arr, key)
+        order = list(range(n))
+        before = SortingAlgorithms._before(ascending)
+        
+        if n > 1:
+            SortingAlgorithms._introsort(keys, order, before, steps)
+            SortingAlgorithms._insertion_pass(keys, order, before, steps)
+        
+        data = SortingAlgorithms._undecorate(arr, order)
+        end_time = time.perf_counter()
+        return SortResult(data, steps[0], "O(n log n)", f"{(end_time - start_time) * 1000:.4f} ms")
+
+    @staticmethod
+    def _introsort(keys, order, before, steps):
+        # Explicit stack instead of recursion; the larger side is pushed so the stack stays O(log n)
+        stack = [(0, len(keys) - 1, 2 * len(keys).bit_length())]
+        while stack:
+            lo, hi, depth = stack.pop()
+            while hi - lo + 1 > SortingAlgorithms._INSERTION_THRESHOLD:
+                if depth == 0:
+                    SortingAlgorithms._heap_sort_range(keys, order, lo, hi + 1, before, steps)
+                    break
+                depth -= 1
+                p = SortingAlgorithms._partition(keys, order, lo, hi, before, steps)
+                if p - lo < hi - p:
+                    stack.append((p + 1, hi, depth))
+                    hi = p
+                else:
+                    stack.append((lo, p, depth))
+                    lo = p + 1
+
+    @staticmethod
+    def _partition(keys, order, lo, hi, before, steps):
+        """Hoare partition around the median of keys[lo], keys[mid], keys[hi]"""
+        mid = (lo + hi) // 2
+        for a, b in ((lo, mid), (lo, hi), (mid, hi)):
+            steps[0] += 1 # Comparison
+            if before(keys[b], keys[a]):
+                keys[a], keys[b] = keys[b], keys[a]
+                order[a], order[b] = order[b], order[a]
+                steps[0] += 1 # Swap
+        pivot = keys[mid]
+        
+        i = lo - 1
+        j = hi + 1
+        while True:
+            i += 1
+            steps[0] += 1 # Comparison
+            while before(keys[i], pivot):
+                i += 1
+                steps[0] += 1
+            j -= 1
+            steps[0] += 1 # Comparison
+            while before(pivot, keys[j]):
+                j -= 1
+                steps[0] += 1
+            if i >= j:
+                return j
+            keys[i], keys[j] = keys[j], keys[i]
+            order[i], order[j] = order[j], order[i]
+            steps[0] += 1 # Swap
+
+    @staticmethod
+    def _insertion_pass(keys, order, before, steps):
+        """Insertion sort over ranges that are already partitioned relative to each other"""
+        for i in range(1, len(keys)):
+            item_key = keys[i]
+            item_pos = order[i]
+            j = i - 1
+            steps[0] += 1 # Comparison
+            while j >= 0 and before(item_key, keys[j]):
+                keys[j + 1] = keys[j]
+                order[j + 1] = order[j]
+                steps[0] += 1 # Shift
+                j -= 1
+            keys[j + 1] = item_key
+            order[j + 1] = item_pos
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def heap_sort(arr, key=None, ascending=True):
+        n = len(arr)
+        steps = [0]
+        start_time = time.perf_counter()
+        
+        keys = SortingAlgorithms._extract_keys(arr, key)
+        order = list(range(n))
+        before = SortingAlgorithms._before(ascending)
+        SortingAlgorithms._heap_sort_range(keys, order, 0, n, before, steps)
+        
+        data = SortingAlgorithms._undecorate(arr, order)
+        end_time = time.perf_counter()
+        return SortResult(data, steps[0], "O(n log n)", f"{(end_time - start_time) * 1000:.4f} ms")
+
+    @staticmethod
+    def _heap_sort_range(keys, order, lo, hi, before, steps):
+        """Heap sort of keys[lo:hi] in place"""
+        size = hi - lo
+        for root in range(size // 2 - 1, -1, -1):
+            SortingAlgorithms._sift_down(keys, order, lo, root, size, before, steps)
+        for end in range(size - 1, 0, -1):
+            keys[lo], keys[lo + end] = keys[lo + end], keys[lo]
+            order[lo], order[lo + end] = order[lo + end], order[lo]
+            steps[0] += 1 # Swap
+            SortingAlgorithms._sift_down(keys, order, lo, 0, end, before, steps)
+
+    @staticmethod
+    def _sift_down(keys, order, lo, root, size, before, steps):
+        # The heap root is the row that belongs LAST in the requested order
+        while True:
+            child = 2 * root + 1
+            if child >= size:
+                return
+            if child + 1 < size:
+                steps[0] += 1 # Comparison
+                if before(keys[lo + child], keys[lo + child + 1]):
+                    child += 1
+            steps[0] += 1 # Comparison
+            if not before(keys[lo + root], keys[lo + child]):
+                return
+            a, b = lo + root, lo + child
+            keys[a], keys[b] = keys[b], keys[a]
+            order[a], order[b] = order[b], order[a]
+            steps[0] += 1 # Swap
+            root = child
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def builtin_sort(arr, key=None, ascending=True):
+        """Python's built-in Timsort on the precomputed keys"""
+        n = len(arr)
+        start_time = time.perf_counter()
+        
+        keys = SortingAlgorithms._extract_keys(arr, key)
+        # reverse=True keeps equal keys in their original order, like the other stable sorts
+        order = sorted(range(n), key=keys.__getitem__, reverse=not ascending)
+        
+        data = SortingAlgorithms._undecorate(arr, order)
+        end_time = time.perf_counter()
+        # Comparisons happen in C and are not observable, so steps counts row placements
+        return SortResult(data, n, "O(n log n)", f"{(end_time - start_time) * 1000:.4f} ms")
+
+    # IPK is validated to 0.00 - 4.00, so two decimals give 401 counting buckets
+    _IPK_SCALE = 100
+    _IPK_MAX = 4.0
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def radix_sort(arr, key=None, ascending=True):
+        """
+        LSD radix sort for all-digit NIM strings, counting sort for IPK values.
+        Raises ValueError for keys that are neither.
+        """
+        n = len(arr)
+        start_time = time.perf_counter()
+        
+        keys = SortingAlgorithms._extract_keys(arr, key)
+        if all(isinstance(k, str) for k in keys):
+            order, steps = SortingAlgorithms._radix_digits(keys, ascending)
+            complexity = "O(d(n + k))"
+        elif all(isinstance(k, (int, float)) and not isinstance(k, bool) for k in keys):
+            order, steps = SortingAlgorithms._counting_ipk(keys, ascending)
+            complexity = "O(n + k)"
+        else:
+            raise ValueError("Radix sort hanya mendukung kunci NIM atau IPK")
+        
+        data = SortingAlgorithms._undecorate(arr, order)
+        end_time = time.perf_counter()
+        return SortResult(data, steps, complexity, f"{(end_time - start_time) * 1000:.4f} ms")
+
+    @staticmethod
+    def _radix_digits(keys, ascending):
+        if not all(k.isascii() and k.isdigit() for k in keys):
+            raise ValueError("Radix sort membutuhkan NIM yang hanya berisi angka")
+        
+        order = list(range(len(keys)))
+        steps = 0
+        width = max(map(len, keys), default=0)
+        # Bucket 0 holds strings shorter than the current position, so shorter
+        # strings sort first exactly like string comparison ("12" < "123")
+        for pos in range(width - 1, -1, -1):
+            buckets = [[] for _ in range(11)]
+            for idx in order:
+                k = keys[idx]
+                buckets[ord(k[pos]) - 47 if pos < len(k) else 0].append(idx)
+            steps += len(order) # Placements
+            if not ascending:
+                buckets.reverse()
+            order = [idx for bucket in buckets for idx in bucket]
+        return order, steps
+
+    @staticmethod
+    def _counting_ipk(keys, ascending):
+        scale = SortingAlgorithms._IPK_SCALE
+        buckets = [[] for _ in range(int(SortingAlgorithms._IPK_MAX * scale) + 1)]
+        for idx, k in enumerate(keys):
+            scaled = round(k * scale)
+            if not 0 <= scaled < len(buckets) or abs(k * scale - scaled) > 1e-6:
+                raise ValueError("Radix sort membutuhkan IPK 0.00 - 4.00 dengan maksimal dua desimal")
+            buckets[scaled].append(idx)
+        if not ascending:
+            buckets.reverse()
+        return [idx for bucket in buckets for idx in bucket], len(keys)
+
+    @staticmethod
+    def _top_k_groups(arr, k, key, ascending, group_by, select):
+        """
+        Shared driver of the top-k algorithms: the rows of each group_by value (all rows
+        if None) are ranked on composite keys that already hold the direction and the
+        row position, and select(keys, order, k, steps) reorders them so the first k are
+        the top k in sorted order. Groups come out in ascending group value order,
+        the missing group first like in SQL.
+        """
+        start_time = time.perf_counter()
+        spec = key if isinstance(key, (list, tuple)) else [(key, ascending)]
+        keys = SortingAlgorithms._composite_keys(arr, spec)
+        
+        groups = {}
+        if group_by is None:
+            groups[None] = list(range(len(arr)))
+        else:
+            for i, g in enumerate(SortingAlgorithms._extract_keys(arr, group_by)):
+                groups.setdefault(g, []).append(i)
+        
+        steps = [0]
+        data = []
+        for g in sorted(groups):
+            order = groups[g]
+            group_keys = [keys[i] for i in order]
+            size = min(k, len(order))
+            if size > 0:
+                select(group_keys, order, size, steps)
+                data.extend(arr[i] for i in order[:size])
+        
+        end_time = time.perf_counter()
+        return data, steps[0], f"{(end_time - start_time) * 1000:.4f} ms"
+
+    @staticmethod
+    def _heap_select(keys, order, k, steps):
+        """Bounded heap of the k best rows seen so far; its root is the worst of them"""
+        before = operator.lt
+        for root in range(k // 2 - 1, -1, -1):
+            SortingAlgorithms._sift_down(keys, order, 0, root, k, before, steps)
+        for i in range(k, len(keys)):
+            steps[0] += 1 # Comparison
+            if before(keys[i], keys[0]):
+                keys[0], keys[i] = keys[i], keys[0]
+                order[0], order[i] = order[i], order[0]
+                steps[0] += 1 # Swap
+                SortingAlgorithms._sift_down(keys, order, 0, 0, k, before, steps)
+        SortingAlgorithms._heap_sort_range(keys, order, 0, k, before, steps)
+
+    @staticmethod
+    def _quick_select(keys, order, k, steps):
+        """Partitions only the side that holds position k - 1, then sorts the first k"""
+        before = operator.lt
+        lo, hi = 0, len(keys) - 1
+        while hi - lo + 1 > SortingAlgorithms._INSERTION_THRESHOLD:
+            p = SortingAlgorithms._partition(keys, order, lo, hi, before, steps)
+            if k - 1 <= p:
+                hi = p
+            else:
+                lo = p + 1
+        # keys[lo:hi + 1] holds position k - 1 and everything left of it belongs to the top k
+        SortingAlgorithms._heap_sort_range(keys, order, lo, hi + 1, before, steps)
+        SortingAlgorithms._heap_sort_range(keys, order, 0, k, before, steps)
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def heap_top_k(arr, k, key=None, ascending=True, group_by=None):
+        """The first k rows of the sorted order (per group_by value) with a bounded heap, O(n log k)"""
+        data, steps, time_taken = SortingAlgorithms._top_k_groups(
+            arr, k, key, ascending, group_by, SortingAlgorithms._heap_select)
+        return SortResult(data, steps, "O(n log k)", time_taken)
+
+    @staticmethod
+    @metrics.instrumented("algorithm")
+    def quickselect_top_k(arr, k, key=None, ascending=True, group_by=None):
+        """The first k rows of the sorted order (per group_by value) with quickselect, O(n + k log k) on average"""
+        data, steps, time_taken = SortingAlgorithms._top_k_groups(
+            arr, k, key, ascending, group_by, SortingAlgorithms._quick_select)
+        return SortResult(data, steps, "O(n + k log k)", time_taken)
+
+    # name -> AlgorithmInfo, in the order they are offered in the UI
+    REGISTRY = {}
+
+    @staticmethod
+    def trace():
+        """Context manager yielding an AlgorithmTrace of the algorithms run inside it, see tracing"""
+        return tracing.tracing()
+
+    @classmethod
+    def register(cls, name, label, func, source="list"):
+        cls.REGISTRY[name] = AlgorithmInfo(name, label, func, source)
+
+    @classmethod
+    def run(cls, name, arr, key=None, ascending=True):
+        """key is a column name or a multi-key spec from parse_sort_spec (its directions replace ascending)"""
+        info = cls.REGISTRY.get(name)
+        if info is None or info.source != "list":
+            raise ValueError(f"Algoritma pengurutan tidak dikenal: {name}")
+        if isinstance(key, (list, tuple)):
+            ascending = True
+        return info.func(arr, key=key, ascending=ascending)
+
+for _name, _label, _func in [
+    ("bubble", "Bubble Sort", SortingAlgorithms.bubble_sort),
+    ("selection", "Selection Sort", SortingAlgorithms.selection_sort),
+    ("insertion", "Insertion Sort", SortingAlgorithms.insertion_sort),
+    ("merge", "Merge Sort", SortingAlgorithms.merge_sort),
+    ("natural_merge", "Merge Sort (Bottom-up, Natural Runs)", SortingAlgorithms.natural_merge_sort),
+    ("shell", "Shell Sort", SortingAlgorithms.shell_sort),
+    ("quick", "Quick Sort (Introsort)", SortingAlgorithms.quick_sort),
+    ("heap", "Heap Sort", SortingAlgorithms.heap_sort),
+    ("builtin", "Timsort (Built-in)", SortingAlgorithms.builtin_sort),
+    ("radix", "Radix Sort (NIM/IPK)", SortingAlgorithms.radix_sort),
+]:
+    SortingAlgorithms.register(_name, _label, _func)
+
+for _name, _label, _func in [
+    ("topk_heap", "Top-k: Heap (nlargest)", SortingAlgorithms.heap_top_k),
+    ("topk_quickselect", "Top-k: Quickselect", SortingAlgorithms.quickselect_top_k),
+]:
+    SortingAlgorithms.register(_name, _label, _func, source="topk")
@@ -0,0 +1,294 @@
+"""
+Benchmark suite for SortingAlgorithms and SearchingAlgorithms.
+
+Every registered algorithm runs over synthetic students for each size,
+distribution and key, measuring median wall time, steps, peak traced memory
+and the memory blocks the call leaves allocated. The setup a search needs
+(sorted keys, hash or trigram index, column snapshot) is built outside the
+timed section, just as the app keeps those structures between requests.
+
+    python -m app.logic.benchmark --sizes 100,1000,10000 --output bench.json
+    python -m app.logic.benchmark --output bench.json --baseline baseline.json
+
+With --baseline the run exits with status 1 when an entry's fastest run got
+slower than --max-slowdown times the baseline or needs more steps than before.
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from app.logic.algorithms.sorting import SortingAlgorithms
+from app.logic.algorithms.searching import SearchingAlgorithms
+from app.logic import generator
+
+try:
+    import pandas as pd
+    from app.logic.algorithms.columnar import StudentColumns
+except ImportError: # NumPy/pandas not installed: columnar algorithms are skipped
+    pd = None
+
+DISTRIBUTIONS = ("random", "sorted", "reversed", "few_unique", "dup_names")
+KEYS = ("ipk", "nama")
+# O(n^2) algorithms only run up to --quadratic-max rows
+QUADRATIC = {"bubble", "selection", "insertion"}
+def make_students(n, distribution, key, seed=0):
+    """
+    n student dicts from app.logic.generator. few_unique draws every field from
+    a handful of values, dup_names repeats a small pool of names; sorted and
+    reversed order the rows by key, the others shuffle them.
+    """
+    rng = random.Random(seed)
+    if distribution == "few_unique":
+        pool = 5
+        rows = [{
+            "nim": f"2023{rng.randrange(pool):06d}",
+            "nama": generator.FIRST_NAMES[rng.randrange(pool)],
+            "email": f"mhs{i + 1}@kampus.ac.id",
+            "jurusan": rng.choice(generator.JURUSAN),
+            "ipk": rng.randrange(pool) / 2,
+        } for i in range(n)]
+    else:
+        distinct_names = max(n // 100, 1) if distribution == "dup_names" else None
+        rows = list(generator.generate_students(n, seed, distinct_names=distinct_names))
+        for row in rows:
+            del row["created_at"]
+    if distribution in ("sorted", "reversed"):
+        rows.sort(key=lambda row: SortingAlgorithms._normalize(row[key]), reverse=distribution == "reversed")
+    else:
+        # Generated NIMs follow the sequence number; shuffling keeps every key unordered
+        rng.shuffle(rows)
+    for i, row in enumerate(rows):
+        row["id"] = i + 1
+    return rows
+
+def make_targets(rows, key, count, seed=0):
+    """count targets, half taken from the rows and half absent"""
+    rng = random.Random(seed + 1)
+    targets = []
+    for i in range(count):
+        if i % 2 == 0 and rows:
+            targets.append(rng.choice(rows)[key])
+        else:
+            targets.append(-1.0 if key == "ipk" else f"zz tidak ada {i}")
+    return targets
+
+def _columns(rows):
+    frame = pd.DataFrame.from_records(rows)
+    for column in ("nama", "nim", "email", "jurusan"):
+        frame[column] = frame[column].str.lower()
+    return StudentColumns(frame.sort_values("id", ignore_index=True))
+
+def _sorting_call(name, info, rows, key, top_k):
+    """Setup for one sorting benchmark; returns a callable giving the steps of one run"""
+    if info.source == "list":
+        return lambda: SortingAlgorithms.run(name, rows, key=key).steps
+    if info.source == "topk":
+        return lambda: info.func(rows, top_k, key=key).steps
+    if info.source == "columnar":
+        if pd is None:
+            raise ValueError("NumPy/pandas tidak terpasang")
+        columns = _columns(rows)
+        return lambda: info.func(columns, key).steps
+    raise ValueError(f"Sumber tidak dikenal: {info.source}")
+
+def _searching_call(info, rows, key, targets):
+    """Setup for one searching benchmark; returns a callable giving the total steps over all targets"""
+    func = info.func
+    if info.source == "list":
+        search = lambda t: func(rows, t, key=key)
+    elif info.source in ("sorted", "range", "prefix"):
+        keys = sorted(SortingAlgorithms._normalize(row[key]) for row in rows)
+        if info.source == "sorted":
+            search = lambda t: func(keys, t)
+        elif info.source == "range":
+            search = lambda t: func(keys, t, t)
+        else:
+            if rows and not isinstance(keys[0], str):
+                raise ValueError("Prefix search hanya untuk kunci teks")
+            search = lambda t: func(keys, str(t)[:3])
+    elif info.source == "numeric":
+        keys = sorted(row[key] for row in rows)
+        search = lambda t: func(keys, t)
+    elif info.source == "hash":
+        index = SearchingAlgorithms.build_hash_index(rows, key)
+        search = lambda t: func(index, t)
+    elif info.source == "fuzzy":
+        if key != "nama":
+            raise ValueError("Fuzzy search hanya untuk nama")
+        postings, values = SearchingAlgorithms.build_trigram_index(rows, key)
+        search = lambda t: func(postings, values, t, 10)
+    elif info.source == "columnar":
+        if pd is None:
+            raise ValueError("NumPy/pandas tidak terpasang")
+        columns = _columns(rows)
+        search = lambda t: func(columns, key, t)
+    else:
+        raise ValueError(f"Sumber tidak dikenal: {info.source}")
+    return lambda: sum(search(t).steps for t in targets)
+
+def _measure(call, repeat):
+    """
+    (median ms, min ms, steps, peak KiB, retained blocks). An untimed warm-up run fills
+    lazy caches such as column ranks first; memory comes from one extra traced run.
+    """
+    call()
+    times = []
+    steps = None
+    # Like timeit: a collection landing in one run would dominate small timings
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            steps = call()
+            times.append((time.perf_counter() - start) * 1000)
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return statistics.median(times), min(times), steps, round(peak / 1024, 1), retained
+
+def run(sizes, distributions=DISTRIBUTIONS, keys=KEYS, repeat=3, queries=100,
+        quadratic_max=5000, top_k=10, seed=0, only=None, log=None):
+    """Runs every benchmark and returns the report dict that is written as JSON"""
+    results = []
+    suites = [("sorting", SortingAlgorithms.REGISTRY), ("searching", SearchingAlgorithms.REGISTRY)]
+    for size in sizes:
+        for distribution in distributions:
+            for key in keys:
+                rows = make_students(size, distribution, key, seed)
+                targets = make_targets(rows, key, queries, seed)
+                for group, registry in suites:
+                    for name, info in registry.items():
+                        if only and name not in only:
+                            continue
+                        entry = {"group": group, "algorithm": name, "distribution": distribution, "size": size, "key": key}
+                        if name in QUADRATIC and size > quadratic_max:
+                            entry["skipped"] = f"O(n^2) above {quadratic_max} rows"
+                        else:
+                            try:
+                                if group == "sorting":
+                                    call = _sorting_call(name, info, rows, key, top_k)
+                                else:
+                                    call = _searching_call(info, rows, key, targets)
+                                median, fastest, steps, peak, retained = _measure(call, repeat)
+                            except ValueError as e:
+                                entry["skipped"] = str(e)
+                            else:
+                                entry.update(time_ms=round(median, 4), time_ms_min=round(fastest, 4), steps=steps,
+                                             peak_kib=peak, retained_blocks=retained)
+                        results.append(entry)
+                        if log:
+                            log(entry)
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "queries": queries,
+            "top_k": top_k,
+        },
+        "results": results,
+    }
+
+def _entry_id(entry):
+    return (entry["group"], entry["algorithm"], entry["distribution"], entry["size"], entry["key"])
+
+def compare(report, baseline, max_slowdown, min_time_ms=1.0):
+    """
+    Returns (entry id, metric, baseline value, current value) for every entry whose
+    fastest run is more than max_slowdown times slower or that takes more steps than
+    in baseline. The fastest run is the least disturbed by other load on the machine;
+    times below min_time_ms are timer noise and only their steps are compared.
+    Entries missing from either side or skipped are not compared.
+    """
+    previous = {_entry_id(entry): entry for entry in baseline["results"] if "skipped" not in entry}
+    regressions = []
+    for entry in report["results"]:
+        old = previous.get(_entry_id(entry))
+        if old is None or "skipped" in entry:
+            continue
+        if entry["time_ms_min"] >= min_time_ms and entry["time_ms_min"] > old["time_ms_min"] * max_slowdown:
+            regressions.append((_entry_id(entry), "time_ms_min", old["time_ms_min"], entry["time_ms_min"]))
+        if entry["steps"] > old["steps"]:
+            regressions.append((_entry_id(entry), "steps", old["steps"], entry["steps"]))
+    return regressions
+
+def _csv_list(text):
+    return [part.strip() for part in text.split(",") if part.strip()]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.logic.benchmark", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000", help="comma separated row counts (up to 1000000)")
+    parser.add_argument("--distributions", default=",".join(DISTRIBUTIONS))
+    parser.add_argument("--keys", default=",".join(KEYS))
+    parser.add_argument("--algorithms", default="", help="only these registry names")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--queries", type=int, default=100, help="search targets per benchmark")
+    parser.add_argument("--quadratic-max", type=int, default=5000)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--max-slowdown", type=float, default=1.5)
+    parser.add_argument("--min-time-ms", type=float, default=1.0, help="faster entries are only gated on steps")
+    args = parser.parse_args(argv)
+
+    distributions = _csv_list(args.distributions)
+    unknown = set(distributions) - set(DISTRIBUTIONS)
+    if unknown:
+        parser.error(f"unknown distribution: {', '.join(sorted(unknown))}")
+
+    def log(entry):
+        if "skipped" in entry:
+            detail = f"skipped ({entry['skipped']})"
+        else:
+            detail = f"{entry['time_ms']:.3f} ms, {entry['steps']} steps, {entry['peak_kib']} KiB peak"
+        print(f"{entry['group']:9} {entry['algorithm']:18} {entry['distribution']:10} {entry['key']:4} "
+              f"{entry['size']:>8}  {detail}", file=sys.stderr)
+
+    report = run(
+        sizes=[int(size) for size in _csv_list(args.sizes)],
+        distributions=distributions,
+        keys=_csv_list(args.keys),
+        repeat=args.repeat,
+        queries=args.queries,
+        quadratic_max=args.quadratic_max,
+        top_k=args.top_k,
+        seed=args.seed,
+        only=set(_csv_list(args.algorithms)),
+        log=log,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.max_slowdown, args.min_time_ms)
+        for entry_id, metric, old, new in regressions:
+            print(f"REGRESSION {'/'.join(map(str, entry_id))} {metric}: {old} -> {new}", file=sys.stderr)
+        print(f"{len(regressions)} regressions", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+import threading
+import time
+from typing import Callable, Optional
+
+class InvalidatingCache:
+    """
+    Process-wide cache for a single computed value. Writers call invalidate()
+    after they commit; the ttl bounds staleness for writes made by other
+    processes, which cannot invalidate this one.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._value = None
+        self._expires_at = 0.0
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, compute: Callable):
+        with self._lock:
+            if self._value is not None and time.monotonic() < self._expires_at:
+                return self._value
+            version = self._version
+
+        value = compute()
+        with self._lock:
+            # An invalidate() while computing means the value may already be stale
+            if self._version == version:
+                self._value = value
+                self._expires_at = time.monotonic() + self.ttl
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+            self._value = None
+
+# Dashboard statistics (StudentManager.get_stats)
+stats_cache = InvalidatingCache(ttl=60)
@@ -0,0 +1,54 @@
+"""
+Process-wide columnar snapshot of the students table for ColumnarAlgorithms.
+
+The table is read into a DataFrame with one query the first time a columnar
+algorithm runs. Any committed write drops the snapshot and the next columnar
+run reloads it; snapshots older than max_age are reloaded too, which picks up
+writes from other worker processes.
+"""
+import threading
+import time
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app import models
+from app.logic.algorithms.columnar import StudentColumns
+
+class StudentColumnStore:
+    COLUMNS = ("id", "nama", "nim", "ipk", "email", "jurusan")
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._columns = None
+        self._loaded_at = None
+
+    def snapshot(self, db: Session) -> StudentColumns:
+        with self._lock:
+            if self._columns is None or time.monotonic() - self._loaded_at >= self.max_age:
+                s = models.Student
+                rows = db.execute(select(*(getattr(s, c) for c in self.COLUMNS)).order_by(s.id)).all()
+                frame = pd.DataFrame.from_records(rows, columns=self.COLUMNS)
+                for column in ("nama", "nim", "email", "jurusan"):
+                    # Same normalization as the Python algorithms: strings compare case insensitively
+                    frame[column] = frame[column].str.lower()
+                self._columns = StudentColumns(frame)
+                self._loaded_at = time.monotonic()
+            return self._columns
+
+    def sort(self, db: Session, key: str, ascending: bool, func):
+        """Runs a columnar sort; SortResult.data holds the student ids in sorted order"""
+        return func(self.snapshot(db), key, ascending)
+
+    def search(self, db: Session, key: str, target, func):
+        """Runs a columnar search; returns (SearchResult, student_id or None)"""
+        columns = self.snapshot(db)
+        result = func(columns, key, target)
+        return result, int(columns.ids[result.index]) if result.found else None
+
+    def invalidate(self):
+        with self._lock:
+            self._columns = None
+            self._loaded_at = None
+
+student_columns = StudentColumnStore(max_age=300)
@@ -0,0 +1,69 @@
+import codecs
+import csv
+import io
+import re
+from typing import List, Optional
+
+class CsvRowParser:
+    """
+    Incremental CSV parser: bytes go in through feed() in chunks of any size and
+    complete rows come out as dicts keyed by the header, like csv.DictReader.
+    Only the trailing partial record is kept between chunks, so memory is bounded
+    by the chunk size instead of the file size.
+    """
+    # Record terminators: \r\n, \n, or a bare \r as in old Mac files. A \r that ends
+    # the text may be half of a \r\n split across chunks, so it waits for more input.
+    LINE_END = re.compile(r"\r\n|\n|\r(?=[^\n])")
+
+    def __init__(self, encoding: str = "utf-8"):
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._pending = ""
+        self.fieldnames: Optional[List[str]] = None
+        self.bytes_read = 0
+        self.rows_parsed = 0
+        # False while everything decoded so far is whitespace, i.e. the file is still empty
+        self.has_content = False
+
+    def feed(self, data: bytes) -> List[dict]:
+        self.bytes_read += len(data)
+        complete, self._pending = self._split_complete(self._decode(data))
+        return self._parse(complete)
+
+    def close(self) -> List[dict]:
+        """Parses whatever is left once the input is exhausted"""
+        text = self._decode(b"", final=True)
+        self._pending = ""
+        return self._parse(text)
+
+    def _decode(self, data, final=False):
+        """The pending text followed by data decoded"""
+        text = self._pending + self._decoder.decode(data, final=final)
+        if not self.has_content:
+            self.has_content = not text.isspace() and bool(text)
+        return text
+
+    @classmethod
+    def _split_complete(cls, text):
+        """
+        Splits text after the last line end that ends a record. A line end inside a
+        quoted field leaves an odd number of quotes before it, so it is skipped.
+        """
+        cut = 0
+        quotes = 0
+        start = 0
+        for line_end in cls.LINE_END.finditer(text):
+            quotes += text.count('"', start, line_end.start())
+            start = line_end.end()
+            if quotes % 2 == 0:
+                cut = start
+        return text[:cut], text[cut:]
+
+    def _parse(self, text) -> List[dict]:
+        if not text:
+            return []
+        lines = io.StringIO(text, newline="")
+        if self.fieldnames is None:
+            self.fieldnames = next(csv.reader(lines), None)
+        rows = list(csv.DictReader(lines, fieldnames=self.fieldnames))
+        self.rows_parsed += len(rows)
+        return rows
@@ -0,0 +1,164 @@
+"""
+Full-text search over students with SQLite FTS5.
+
+students_fts is an external-content FTS5 table: it stores only the token
+index and reads nama, email, jurusan and nim back from students, which
+triggers keep it in sync with on every insert, update and delete (bulk
+imports included). Other databases, or SQLite builds without FTS5, simply
+have no full-text engine.
+
+The index can be rebuilt from the command line:
+
+    python -m app.logic.fulltext rebuild
+"""
+import re
+import sys
+import time
+from contextlib import contextmanager
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from app.logic.algorithms.searching import SearchResult
+
+TABLE = "students_fts"
+COLUMNS = ("nama", "email", "jurusan", "nim")
+TRIGGERS = ("students_fts_ai", "students_fts_ad", "students_fts_au")
+
+_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5(
+        {", ".join(COLUMNS)}, content='students', content_rowid='id', tokenize='unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS students_fts_ai AFTER INSERT ON students BEGIN
+        INSERT INTO {TABLE}(rowid, {", ".join(COLUMNS)}) VALUES (new.id, {", ".join("new." + c for c in COLUMNS)});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS students_fts_ad AFTER DELETE ON students BEGIN
+        INSERT INTO {TABLE}({TABLE}, rowid, {", ".join(COLUMNS)}) VALUES ('delete', old.id, {", ".join("old." + c for c in COLUMNS)});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS students_fts_au AFTER UPDATE ON students BEGIN
+        INSERT INTO {TABLE}({TABLE}, rowid, {", ".join(COLUMNS)}) VALUES ('delete', old.id, {", ".join("old." + c for c in COLUMNS)});
+        INSERT INTO {TABLE}(rowid, {", ".join(COLUMNS)}) VALUES (new.id, {", ".join("new." + c for c in COLUMNS)});
+    END""",
+]
+
+class FullTextResult(SearchResult):
+    """One page of ranked matches; count is the total over every page"""
+    def __init__(self, matches, total, offset, steps, complexity, time_taken):
+        super().__init__(matches[0] if matches else -1, steps, complexity, time_taken, total > 0)
+        self.matches = matches
+        self.total = total
+        self.offset = offset
+
+    @property
+    def count(self):
+        return self.total
+
+def _table_exists(db: Session) -> bool:
+    return db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": TABLE}
+    ).first() is not None
+
+def _installed(db: Session) -> bool:
+    """True when the table and all of its sync triggers exist"""
+    names = (TABLE,) + TRIGGERS
+    params = {f"n{i}": name for i, name in enumerate(names)}
+    found = db.execute(
+        text(f"SELECT count(*) FROM sqlite_master WHERE name IN ({', '.join(':' + p for p in params)})"), params
+    ).scalar()
+    return found == len(names)
+
+def is_supported(db: Session) -> bool:
+    return db.get_bind().dialect.name == "sqlite" and _table_exists(db)
+
+def ensure_built(db: Session):
+    """
+    Creates the table and triggers if missing and fills the table when anything was
+    missing, e.g. after an interrupted bulk_load
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return
+    existed = _installed(db)
+    try:
+        for statement in _DDL:
+            db.execute(text(statement))
+    except OperationalError:
+        # SQLite compiled without FTS5
+        db.rollback()
+        return
+    if not existed:
+        rebuild(db)
+    db.commit()
+
+def rebuild(db: Session):
+    db.execute(text(f"INSERT INTO {TABLE}({TABLE}) VALUES ('rebuild')"))
+
+@contextmanager
+def bulk_load(db: Session):
+    """
+    Drops the sync triggers while a large insert runs and rebuilds the whole index
+    once afterwards, which is several times faster than indexing row by row.
+    Batches may commit inside the block.
+    """
+    if not is_supported(db):
+        yield
+        return
+    for trigger in TRIGGERS:
+        db.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    db.commit()
+    try:
+        yield
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        ensure_built(db)
+
+def to_match_query(query: str, column: str = None) -> str:
+    """
+    Turns free text into an FTS5 query: every word must match as a prefix, and FTS5
+    syntax in the input is treated as plain text.
+    """
+    words = re.findall(r"\w+", query, re.UNICODE)
+    terms = " ".join(f'"{word}"*' for word in words)
+    if not terms:
+        return ""
+    return f"{column} : ({terms})" if column else terms
+
+def search(db: Session, query: str, column: str = None, limit: int = 20, offset: int = 0) -> FullTextResult:
+    """Ranks matches with bm25; column restricts the match to one of COLUMNS"""
+    if not is_supported(db):
+        raise ValueError("Full-text search hanya tersedia untuk database SQLite (FTS5)")
+    if column is not None and column not in COLUMNS:
+        raise ValueError(f"Kolom full-text tidak dikenal: {column}")
+
+    start_time = time.perf_counter()
+    match = to_match_query(query, column)
+    if not match:
+        return FullTextResult([], 0, offset, 0, "FTS5 (bm25)", "0.0000 ms")
+    total = db.execute(text(f"SELECT count(*) FROM {TABLE} WHERE {TABLE} MATCH :match"), {"match": match}).scalar()
+    ids = db.execute(
+        text(f"SELECT rowid FROM {TABLE} WHERE {TABLE} MATCH :match ORDER BY bm25({TABLE}) LIMIT :limit OFFSET :offset"),
+        {"match": match, "limit": limit, "offset": offset},
+    ).scalars().all()
+    end_time = time.perf_counter()
+    return FullTextResult(list(ids), total, offset, len(ids), "FTS5 (bm25)", f"{(end_time - start_time) * 1000:.4f} ms")
+
+if __name__ == "__main__":
+    from app.database import Base, SessionLocal, engine
+
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command != "rebuild":
+        print("Usage: python -m app.logic.fulltext rebuild")
+        sys.exit(2)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        ensure_built(db)
+        if not is_supported(db):
+            print("Full-text search needs SQLite with FTS5")
+            sys.exit(1)
+        rebuild(db)
+        db.commit()
+        print("Full-text index rebuilt")
+    finally:
+        db.close()
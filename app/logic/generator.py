@@ -0,0 +1,190 @@
+"""
+Seeded synthetic students for load tests and benchmarks.
+
+Rows satisfy schemas.StudentBase (digits-only NIM, letters and spaces in
+nama, IPK 0.00 - 4.00) and NIM and email are unique: both are built from
+the row sequence number. The same seed and start always give the same rows.
+
+    python -m app.logic.generator csv --count 1000000 --output students.csv
+    python -m app.logic.generator db --count 1000000 --seed 7
+
+CSV output uses the header StudentManager.import_csv expects. The db
+command bulk inserts into settings.DATABASE_URL and keeps the dashboard
+statistics up to date; the full-text index is rebuilt once at the end.
+Running app workers pick the new rows up when their caches expire.
+"""
+import argparse
+import csv
+import random
+import sys
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+from app import models
+from app.logic import fulltext, stats
+
+FIRST_NAMES = (
+    "Siti", "Budi", "Agus", "Dewi", "Rina", "Andi", "Putri", "Eko", "Sri", "Ahmad",
+    "Nur", "Dian", "Fajar", "Indah", "Joko", "Lestari", "Hendra", "Wulan", "Yudi", "Ratna",
+    "Bayu", "Citra", "Dimas", "Fitri", "Gilang", "Hana", "Irfan", "Kartika", "Lukman", "Maya",
+    "Nanda", "Oki", "Rizky", "Sari", "Taufik", "Umi", "Vina", "Wahyu", "Yoga", "Zahra",
+)
+LAST_NAMES = (
+    "Santoso", "Wijaya", "Pratama", "Saputra", "Lestari", "Hidayat", "Kusuma", "Utami",
+    "Setiawan", "Rahman", "Susanto", "Nugroho", "Permata", "Gunawan", "Halim", "Siregar",
+    "Nasution", "Simanjuntak", "Harahap", "Wibowo", "Purnomo", "Maharani", "Anggraini", "Firmansyah",
+)
+JURUSAN = (
+    "Teknik Informatika", "Sistem Informasi", "Teknik Elektro", "Teknik Industri",
+    "Manajemen", "Akuntansi", "Ilmu Komunikasi", "Hukum",
+)
+CSV_HEADER = ["NIM", "Nama", "Email", "Jurusan", "IPK"]
+FIRST_YEAR = 2018
+YEARS = 7
+EMAIL_DOMAIN = "mhs.kampus.ac.id"
+
+def make_nim(seq: int) -> str:
+    """NIM of the student with sequence number seq: enrolment year, then the zero-padded sequence"""
+    return f"{FIRST_YEAR + seq % YEARS}{seq:08d}"
+
+# Sequence numbers up to 99999999 give NIMs of this length, larger ones are longer
+NIM_LENGTH = len(make_nim(0))
+
+def generate_students(count: int, seed: int = 0, start: int = 1, distinct_names: Optional[int] = None) -> Iterator[dict]:
+    """
+    Yields count student dicts (nim, nama, email, jurusan, ipk, created_at) for
+    sequence numbers start, start + 1, ... With distinct_names only that many
+    different names are used, for duplicate-heavy data sets.
+    """
+    rng = random.Random(seed)
+    rand = rng.random
+    gauss = rng.gauss
+    first_names = [(name, name.lower()) for name in FIRST_NAMES]
+    last_names = [(name, name.lower()) for name in LAST_NAMES]
+    names = None
+    if distinct_names:
+        names = [(f"{first} {rng.choice(FIRST_NAMES)} {last}", f"{first_lower}.{last_lower}")
+                 for (first, first_lower), (last, last_lower)
+                 in ((rng.choice(first_names), rng.choice(last_names)) for _ in range(distinct_names))]
+    # random() * len indexing: rng.choice costs several times more per call
+    n_first, n_last, n_jurusan, n_names = len(first_names), len(last_names), len(JURUSAN), distinct_names
+    for seq in range(start, start + count):
+        year = FIRST_YEAR + seq % YEARS
+        if names:
+            nama, handle = names[int(rand() * n_names)]
+        else:
+            first, first_lower = first_names[int(rand() * n_first)]
+            last, last_lower = last_names[int(rand() * n_last)]
+            nama = f"{first} {FIRST_NAMES[int(rand() * n_first)]} {last}"
+            handle = f"{first_lower}.{last_lower}"
+        # Skewed towards 3.0 - 3.6 like real transcripts, clamped to the valid range
+        ipk = min(4.0, max(0.0, round(gauss(3.2, 0.45), 2)))
+        yield {
+            "nim": make_nim(seq),
+            "nama": nama,
+            "email": f"{handle}{seq}@{EMAIL_DOMAIN}",
+            "jurusan": JURUSAN[int(rand() * n_jurusan)],
+            "ipk": ipk,
+            "created_at": datetime(year, 1 + int(rand() * 12), 1 + int(rand() * 28)),
+        }
+
+def write_csv(rows: Iterable[dict], out) -> int:
+    """Writes rows in the StudentManager.import_csv format; returns the row count"""
+    writer = csv.writer(out)
+    writer.writerow(CSV_HEADER)
+    count = 0
+    for row in rows:
+        writer.writerow((row["nim"], row["nama"], row["email"], row["jurusan"], f"{row['ipk']:.2f}"))
+        count += 1
+    return count
+
+def insert_students(db: Session, rows: Iterable[dict], batch_size: int = 20000, on_batch=None) -> int:
+    """
+    Bulk inserts rows with one executemany per batch and updates the dashboard
+    statistics in the same transaction; commits after every batch.
+    """
+    rows = iter(rows)
+    total = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        delta = stats.StatsDelta()
+        for row in batch:
+            delta.add(row["jurusan"], row["ipk"], row["created_at"])
+        # Core insert: the ORM bulk path adds per-row bookkeeping that is not needed here
+        db.execute(insert(models.Student.__table__), batch)
+        delta.apply(db)
+        db.commit()
+        total += len(batch)
+        if on_batch:
+            on_batch(total)
+    return total
+
+def _generated_sequence(nim: Optional[str]) -> Optional[int]:
+    """Sequence number of a NIM made by make_nim, or None for any other NIM"""
+    if not nim or len(nim) < NIM_LENGTH or not nim.isdigit():
+        return None
+    seq = int(nim[4:])
+    return seq if make_nim(seq) == nim else None
+
+def next_sequence(db: Session) -> int:
+    """
+    First sequence number after the highest NIM made by make_nim, so the new NIMs
+    and emails cannot collide with students generated earlier. Student ids say
+    nothing about that: rows are deleted, imported or generated with --start.
+    """
+    nim = models.Student.nim
+    # Longest NIMs first, then by sequence digits; other NIMs of that shape are skipped
+    candidates = db.execute(
+        select(nim).where(func.length(nim) >= NIM_LENGTH)
+        .order_by(func.length(nim).desc(), func.substr(nim, 5).desc())
+    ).scalars()
+    for value in candidates:
+        seq = _generated_sequence(value)
+        if seq is not None:
+            return seq + 1
+    return 1
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.logic.generator", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("target", choices=("csv", "db"))
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", type=int, help="first sequence number (db: after the highest generated NIM)")
+    parser.add_argument("--distinct-names", type=int)
+    parser.add_argument("--output", help="csv: file to write (default stdout)")
+    parser.add_argument("--batch-size", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    start_time = time.perf_counter()
+    if args.target == "csv":
+        rows = generate_students(args.count, args.seed, args.start or 1, args.distinct_names)
+        if args.output:
+            with open(args.output, "w", newline="", encoding="utf-8") as f:
+                count = write_csv(rows, f)
+        else:
+            count = write_csv(rows, sys.stdout)
+    else:
+        from app.database import Base, SessionLocal, engine
+
+        Base.metadata.create_all(bind=engine)
+        db = SessionLocal()
+        try:
+            fulltext.ensure_built(db)
+            start = args.start or next_sequence(db)
+            rows = generate_students(args.count, args.seed, start, args.distinct_names)
+            with fulltext.bulk_load(db):
+                count = insert_students(db, rows, args.batch_size,
+                                        on_batch=lambda done: print(f"{done}/{args.count}", file=sys.stderr))
+        finally:
+            db.close()
+    elapsed = time.perf_counter() - start_time
+    print(f"{count} students in {elapsed:.1f} s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+from app.core.config import settings
+from app.database import SessionLocal
+from app.logic.student_manager import StudentManager
+
+class ImportJob:
+    """Progress of one background CSV import, updated by the worker thread"""
+
+    def __init__(self, path: str, filename: str, size: int, user_id: int):
+        self.id = uuid.uuid4().hex
+        self.path = path
+        self.filename = filename
+        self.size = size
+        self.user_id = user_id # Only the submitting user may poll the job
+        self.status = "queued" # queued -> running -> done | failed
+        self.bytes_read = 0
+        self.processed = 0
+        self.inserted = 0
+        self.committed = 0
+        self.errors = []
+        self.message = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def on_progress(self, report, bytes_read):
+        self.bytes_read = bytes_read
+        self.processed = report.processed
+        self.inserted = report.inserted
+        self.committed = report.committed
+        self.errors = report.errors
+
+    def to_dict(self, errors_shown: int = 20):
+        elapsed = None
+        rows_per_second = None
+        eta_seconds = None
+        if self.started_at:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+            if elapsed > 0:
+                rows_per_second = round(self.processed / elapsed, 1)
+                if self.status == "running" and self.bytes_read:
+                    # ETA from the byte position, since the row count is unknown up front
+                    bytes_per_second = self.bytes_read / elapsed
+                    eta_seconds = round(max(self.size - self.bytes_read, 0) / bytes_per_second, 1)
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "message": self.message,
+            "bytes_total": self.size,
+            "bytes_read": self.bytes_read,
+            "rows_processed": self.processed,
+            "rows_inserted": self.inserted,
+            "rows_committed": self.committed,
+            "rows_rejected": len(self.errors),
+            "errors": [{"row": row, "message": msg} for row, msg in self.errors[:errors_shown]],
+            "elapsed_seconds": round(elapsed, 3) if elapsed is not None else None,
+            "rows_per_second": rows_per_second,
+            "eta_seconds": eta_seconds,
+        }
+
+class ImportJobManager:
+    """
+    Runs CSV imports on a thread pool so the request worker only has to spool the
+    upload to disk. Each job gets its own database session and commits after
+    every chunk of rows, so other requests can write in between and the rows
+    committed so far are visible (and kept if the job fails).
+    """
+
+    # Finished jobs kept for polling before the oldest are forgotten
+    MAX_FINISHED_JOBS = 100
+    READ_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="import")
+        self._jobs: Dict[str, ImportJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, path: str, filename: str, user_id: int) -> ImportJob:
+        """Queues an import of the CSV file at path for user_id; the file is deleted when the job ends"""
+        job = ImportJob(path, filename, os.path.getsize(path), user_id)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str, user_id: int) -> Optional[ImportJob]:
+        """The job, or None if it does not exist or belongs to another user"""
+        job = self._jobs.get(job_id)
+        return job if job is not None and job.user_id == user_id else None
+
+    def _prune(self):
+        finished = [job for job in self._jobs.values() if job.finished_at]
+        finished.sort(key=lambda job: job.finished_at)
+        for job in finished[:max(len(finished) - self.MAX_FINISHED_JOBS, 0)]:
+            del self._jobs[job.id]
+
+    def _read_chunks(self, path):
+        with open(path, "rb") as f:
+            while True:
+                data = f.read(self.READ_CHUNK_SIZE)
+                if not data:
+                    break
+                yield data
+
+    def _run(self, job: ImportJob):
+        job.status = "running"
+        job.started_at = time.time()
+        db = SessionLocal()
+        try:
+            mgr = StudentManager(db)
+            report = mgr.import_csv_chunks(self._read_chunks(job.path), strict=False, commit_every_chunk=True,
+                                           on_progress=job.on_progress)
+            job.on_progress(report, job.size)
+            job.status = "done"
+        except Exception as e:
+            # The failed chunk was rolled back; earlier chunks stay committed
+            job.inserted = job.committed
+            job.status = "failed"
+            job.message = f"Import failed: {str(e)}"
+        finally:
+            job.finished_at = time.time()
+            db.close()
+            os.remove(job.path)
+
+import_jobs = ImportJobManager(settings.IMPORT_WORKERS)
@@ -0,0 +1,271 @@
+"""
+Process-wide in-memory indexes over the students table.
+
+Indexes are built from one query the first time they are needed and then kept
+in step with StudentManager writes, so lookups do not reload or re-sort the
+table per request. Writes made by other worker processes are picked up when an
+index is older than max_age and gets rebuilt.
+"""
+import bisect
+import threading
+import time
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app import models
+from app.logic.algorithms.searching import SearchingAlgorithms
+
+def normalize(value):
+    """Same normalization as SortingAlgorithms: strings compare case insensitively"""
+    return value.lower() if isinstance(value, str) else value
+
+def digits_to_int(value):
+    """Numeric NIM for interpolation search; rows with a non-numeric NIM are left out"""
+    return int(value) if isinstance(value, str) and value.isascii() and value.isdigit() else None
+
+class SortedKeyIndex:
+    """Transformed key values of one column in sorted order, with the student id of each entry alongside"""
+
+    def __init__(self, column: str, transform=normalize):
+        self.column = column
+        self.transform = transform
+        self.keys = []
+        self.ids = []
+
+    def build(self, pairs):
+        """pairs: iterable of (value, student_id)"""
+        entries = sorted(
+            (k, student_id) for k, student_id in
+            ((self.transform(value), student_id) for value, student_id in pairs if value is not None)
+            if k is not None
+        )
+        self.keys = [k for k, _ in entries]
+        self.ids = [student_id for _, student_id in entries]
+
+    def _position(self, k, student_id):
+        # Equal keys are ordered by id, so the slot is found with a second bisect inside the run
+        lo = bisect.bisect_left(self.keys, k)
+        hi = bisect.bisect_right(self.keys, k, lo)
+        return bisect.bisect_left(self.ids, student_id, lo, hi)
+
+    def insert(self, value, student_id):
+        k = self.transform(value) if value is not None else None
+        if k is None:
+            return
+        pos = self._position(k, student_id)
+        if pos < len(self.ids) and self.ids[pos] == student_id and self.keys[pos] == k:
+            return # Already there: the index was built after the write committed
+        self.keys.insert(pos, k)
+        self.ids.insert(pos, student_id)
+
+    def remove(self, value, student_id):
+        k = self.transform(value) if value is not None else None
+        if k is None:
+            return
+        pos = self._position(k, student_id)
+        if pos < len(self.ids) and self.ids[pos] == student_id:
+            del self.keys[pos]
+            del self.ids[pos]
+
+    def __len__(self):
+        return len(self.keys)
+
+class HashKeyIndex:
+    """Normalized value -> sorted list of student ids, in the form SearchingAlgorithms.hash_search expects"""
+
+    def __init__(self, column: str):
+        self.column = column
+        self.buckets = {}
+
+    def build(self, pairs):
+        self.buckets = {}
+        for value, student_id in pairs:
+            self.insert(value, student_id)
+
+    def insert(self, value, student_id):
+        if value is None:
+            return
+        ids = self.buckets.setdefault(SearchingAlgorithms._linear_form(value), [])
+        if student_id not in ids:
+            bisect.insort(ids, student_id)
+
+    def remove(self, value, student_id):
+        if value is None:
+            return
+        k = SearchingAlgorithms._linear_form(value)
+        ids = self.buckets.get(k)
+        if ids and student_id in ids:
+            ids.remove(student_id)
+            if not ids:
+                del self.buckets[k]
+
+    def __len__(self):
+        return len(self.buckets)
+
+class TrigramIndex:
+    """Trigram inverted index over one text column, in the form SearchingAlgorithms.fuzzy_search expects"""
+
+    def __init__(self, column: str):
+        self.column = column
+        self.postings = {}
+        self.values = {}
+
+    def build(self, pairs):
+        self.postings = {}
+        self.values = {}
+        for value, student_id in pairs:
+            self.insert(value, student_id)
+
+    def insert(self, value, student_id):
+        if value is None:
+            return
+        self.values[student_id] = " ".join(str(value).lower().split())
+        for gram in SearchingAlgorithms.trigrams(value):
+            self.postings.setdefault(gram, set()).add(student_id)
+
+    def remove(self, value, student_id):
+        if value is None or student_id not in self.values:
+            return
+        del self.values[student_id]
+        for gram in SearchingAlgorithms.trigrams(value):
+            ids = self.postings.get(gram)
+            if ids is not None:
+                ids.discard(student_id)
+                if not ids:
+                    del self.postings[gram]
+
+    def __len__(self):
+        return len(self.values)
+
+class StudentIndexService:
+    # Columns whose values StudentManager reports on every write
+    COLUMNS = ("nama", "nim", "ipk", "email")
+    # Index name -> (column, key transform)
+    SORTED_INDEXES = {
+        "nama": ("nama", normalize),
+        "nim": ("nim", normalize),
+        "ipk": ("ipk", normalize),
+        "email": ("email", normalize),
+        "nim_numeric": ("nim", digits_to_int),
+    }
+    # Search key -> sorted index with numeric keys, for interpolation search
+    NUMERIC_INDEXES = {"ipk": "ipk", "nim": "nim_numeric"}
+    HASH_INDEXES = ("nim", "email", "nama")
+    # Built on the first fuzzy search only, since it is several times the size of the others
+    TRIGRAM_INDEXES = ("nama",)
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self._lock = threading.RLock()
+        self._sorted = {}
+        self._hash = {}
+        self._trigram = {}
+        self._built_at = None
+
+    def _ensure_built(self, db: Session):
+        if self._built_at is not None and time.monotonic() - self._built_at < self.max_age:
+            return
+        s = models.Student
+        rows = db.execute(select(s.id, s.nama, s.nim, s.ipk, s.email)).all()
+        for name, (column, transform) in self.SORTED_INDEXES.items():
+            index = SortedKeyIndex(column, transform)
+            index.build((getattr(row, column), row.id) for row in rows)
+            self._sorted[name] = index
+        for column in self.HASH_INDEXES:
+            index = HashKeyIndex(column)
+            index.build((getattr(row, column), row.id) for row in rows)
+            self._hash[column] = index
+        self._trigram = {}
+        self._built_at = time.monotonic()
+
+    def sorted_index(self, db: Session, key: str) -> SortedKeyIndex:
+        if key not in self.SORTED_INDEXES:
+            raise ValueError(f"Kolom pencarian tidak dikenal: {key}")
+        with self._lock:
+            self._ensure_built(db)
+            return self._sorted[key]
+
+    def sorted_search(self, db: Session, key: str, target, search):
+        """
+        Runs search(keys, target) - binary_search, exponential_search, ... - on the
+        index sorted by key. Returns (SearchResult, student_id or None); the result
+        index is the position in the sorted index.
+        """
+        with self._lock:
+            index = self.sorted_index(db, key)
+            result = search(index.keys, target)
+            return result, index.ids[result.index] if result.found else None
+
+    def slice_search(self, db: Session, key: str, search, *args):
+        """
+        Runs search(keys, *args) - range_search, prefix_search - on the index sorted
+        by key. Returns (RangeSearchResult, ids of every match in key order).
+        """
+        with self._lock:
+            index = self.sorted_index(db, key)
+            result = search(index.keys, *args)
+            return result, index.ids[result.index:result.stop]
+
+    def numeric_search(self, db: Session, key: str, target, search):
+        """sorted_search on numeric keys (IPK, NIM as a number), e.g. for interpolation_search"""
+        if key not in self.NUMERIC_INDEXES:
+            raise ValueError("Interpolation search hanya untuk kunci numerik (NIM/IPK)")
+        return self.sorted_search(db, self.NUMERIC_INDEXES[key], target, search)
+
+    def hash_search(self, db: Session, key: str, target):
+        """Returns (SearchResult, student_id or None); the result index is the student id"""
+        if key not in self.HASH_INDEXES:
+            raise ValueError("Hash index hanya tersedia untuk NIM, email, dan nama")
+        with self._lock:
+            self._ensure_built(db)
+            result = SearchingAlgorithms.hash_search(self._hash[key].buckets, target)
+            return result, result.index if result.found else None
+
+    def fuzzy_search(self, db: Session, key: str, target, k: int):
+        """Returns (FuzzySearchResult, ids of the top-k matches best first); the result index is a student id"""
+        if key not in self.TRIGRAM_INDEXES:
+            raise ValueError("Fuzzy search hanya tersedia untuk nama")
+        with self._lock:
+            self._ensure_built(db)
+            index = self._trigram.get(key)
+            if index is None:
+                s = models.Student
+                index = TrigramIndex(key)
+                index.build(db.execute(select(getattr(s, key), s.id)).all())
+                self._trigram[key] = index
+            result = SearchingAlgorithms.fuzzy_search(index.postings, index.values, target, k)
+            return result, [student_id for student_id, _ in result.matches]
+
+    def batch_binary_search(self, db: Session, key: str, targets):
+        """Returns (BatchSearchResult, student ids aligned with its results, None where not found)"""
+        with self._lock:
+            index = self.sorted_index(db, key)
+            batch = SearchingAlgorithms.batch_binary_search(index.keys, targets)
+            return batch, [index.ids[result.index] if result.found else None for _, result in batch.results]
+
+    def invalidate(self):
+        """Drops every index; the next lookup rebuilds them (used after bulk imports)"""
+        with self._lock:
+            self._sorted = {}
+            self._hash = {}
+            self._trigram = {}
+            self._built_at = None
+
+    def _all_indexes(self):
+        return list(self._sorted.values()) + list(self._hash.values()) + list(self._trigram.values())
+
+    def on_insert(self, student_id, values: dict):
+        with self._lock:
+            for index in self._all_indexes():
+                index.insert(values.get(index.column), student_id)
+
+    def on_delete(self, student_id, values: dict):
+        with self._lock:
+            for index in self._all_indexes():
+                index.remove(values.get(index.column), student_id)
+
+    def on_update(self, student_id, old_values: dict, new_values: dict):
+        with self._lock:
+            self.on_delete(student_id, old_values)
+            self.on_insert(student_id, new_values)
+
+student_index = StudentIndexService(max_age=300)
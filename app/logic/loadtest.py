@@ -0,0 +1,250 @@
+"""
+HTTP load test for the main routes.
+
+Logs in through /login once, reuses the access_token cookie and sends a
+weighted mix of requests from --concurrency parallel clients, either to a
+running server (--url) or to the ASGI app in-process. Reports p50/p95/p99
+latency, errors and requests per second for every route.
+
+    python -m app.logic.generator db --count 100000
+    python -m app.logic.loadtest --email admin@kampus.ac.id --password rahasia --output load.json
+    python -m app.logic.loadtest --url http://127.0.0.1:8000 --email ... --password ... \\
+        --mix students=4,searching=4,sorting=1 --concurrency 20 --duration 30
+
+The searching scenario looks up NIMs made by app.logic.generator, so fill
+the database with it first. With --baseline the run exits with status 1
+when a route's p95 got slower than --max-slowdown times the baseline or
+it returned errors the baseline did not have.
+"""
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+import httpx
+from app.logic import generator
+
+class Scenario:
+    """One route of the request mix; data(rng) builds the form fields of a POST"""
+    def __init__(self, name, method, path, data=None, weight=1):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.data = data
+        self.weight = weight
+
+SCENARIOS = {}
+
+def register(name, method, path, data=None, weight=1):
+    SCENARIOS[name] = Scenario(name, method, path, data, weight)
+
+def _sorting_form(rng):
+    return {
+        "algorithm": rng.choice(("quick", "merge", "builtin")),
+        "sort_key": rng.choice(("nama", "nim", "ipk")),
+        "sort_order": rng.choice(("asc", "desc")),
+    }
+
+def _searching_form(rng):
+    # Generated students have sequence numbers 1..count; about half of these hit on a 10000 row table
+    return {"algorithm": "binary", "sort_key": "nim", "target_input": generator.make_nim(rng.randint(1, 20000))}
+
+for _name, _method, _path, _data, _weight in [
+    ("students", "GET", "/students/", None, 4),
+    ("dashboard", "GET", "/dashboard", None, 2),
+    ("sorting", "POST", "/sorting/run", _sorting_form, 1),
+    ("searching", "POST", "/searching/run", _searching_form, 3),
+]:
+    register(_name, _method, _path, _data, _weight)
+
+def make_client(url=None, timeout=30.0):
+    """Client for a running server at url, or for the app in this process"""
+    if url:
+        return httpx.AsyncClient(base_url=url, timeout=timeout)
+    from app.main import app
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=timeout)
+
+async def login(client, email, password):
+    response = await client.post("/login", data={"username": email, "password": password})
+    token = response.cookies.get("access_token")
+    if response.status_code != 302 or not token:
+        raise RuntimeError(f"Login as {email} failed (HTTP {response.status_code})")
+    # Set explicitly: cookie jars may refuse the cookie for hosts such as the in-process one
+    client.cookies.set("access_token", token)
+
+async def _send(client, scenario, rng):
+    data = scenario.data(rng) if scenario.data else None
+    start_time = time.perf_counter()
+    try:
+        response = await client.request(scenario.method, scenario.path, data=data)
+        # Redirects are not followed: a 302 here means the session was lost
+        ok = response.status_code == 200
+    except httpx.HTTPError:
+        ok = False
+    return (time.perf_counter() - start_time) * 1000, ok
+
+async def _run(client, mix, concurrency, requests, duration, warmup, seed):
+    rng = random.Random(seed)
+    scenarios = list(mix)
+    weights = [weight for _, weight in mix.items()]
+
+    def next_scenario():
+        return SCENARIOS[rng.choices(scenarios, weights)[0]]
+
+    # First requests build caches (indexes, column snapshots); keep them out of the figures
+    for _ in range(warmup):
+        await _send(client, next_scenario(), rng)
+
+    samples = {name: [] for name in scenarios}
+    errors = {name: 0 for name in scenarios}
+    remaining = [requests]
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def worker():
+        while True:
+            if deadline is not None:
+                if time.perf_counter() >= deadline:
+                    return
+            elif remaining[0] <= 0:
+                return
+            else:
+                remaining[0] -= 1
+            scenario = next_scenario()
+            latency, ok = await _send(client, scenario, rng)
+            samples[scenario.name].append(latency)
+            if not ok:
+                errors[scenario.name] += 1
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, errors, time.perf_counter() - start_time
+
+def percentile(values, p):
+    """Nearest-rank percentile of already sorted values"""
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+def _summary(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    if not latencies:
+        return {"requests": 0, "errors": errors, "rps": 0.0}
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 2),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3),
+    }
+
+def run(email, password, url=None, mix=None, concurrency=10, requests=500, duration=None, warmup=20, seed=0):
+    """Runs the load test and returns {"meta": ..., "routes": {name: summary}, "total": summary}"""
+    mix = mix or {name: scenario.weight for name, scenario in SCENARIOS.items()}
+
+    async def main():
+        async with make_client(url) as client:
+            await login(client, email, password)
+            return await _run(client, mix, concurrency, requests, duration, warmup, seed)
+
+    samples, errors, elapsed = asyncio.run(main())
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": url or "in-process",
+            "mix": mix,
+            "concurrency": concurrency,
+            "seed": seed,
+            "elapsed_s": round(elapsed, 3),
+        },
+        "routes": {name: _summary(samples[name], errors[name], elapsed) for name in mix},
+        "total": _summary([latency for values in samples.values() for latency in values], sum(errors.values()), elapsed),
+    }
+
+def compare(report, baseline, max_slowdown):
+    """
+    Returns (route, metric, baseline value, current value) for every route whose p95
+    is more than max_slowdown times the baseline or that has errors the baseline did not
+    """
+    regressions = []
+    for name, entry in report["routes"].items():
+        old = baseline["routes"].get(name)
+        if not old or not old.get("requests") or not entry.get("requests"):
+            continue
+        if entry["p95_ms"] > old["p95_ms"] * max_slowdown:
+            regressions.append((name, "p95_ms", old["p95_ms"], entry["p95_ms"]))
+        if entry["errors"] and not old["errors"]:
+            regressions.append((name, "errors", old["errors"], entry["errors"]))
+    return regressions
+
+def _parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"unknown scenario: {name} (choose from {', '.join(SCENARIOS)})")
+        mix[name] = float(weight) if weight else SCENARIOS[name].weight
+    return mix
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.logic.loadtest", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="running server, e.g. http://127.0.0.1:8000 (default: the app in-process)")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--mix", default="", help="scenario=weight list, e.g. students=4,searching=3")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--duration", type=float, help="run for this many seconds instead of --requests")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--max-slowdown", type=float, default=1.5)
+    args = parser.parse_args(argv)
+    try:
+        mix = _parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        report = run(args.email, args.password, args.url, mix, args.concurrency, args.requests,
+                     args.duration, args.warmup, args.seed)
+    except (RuntimeError, httpx.HTTPError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    for name, entry in list(report["routes"].items()) + [("total", report["total"])]:
+        if not entry["requests"]:
+            print(f"{name:10} no requests", file=sys.stderr)
+            continue
+        print(f"{name:10} {entry['requests']:>6} req {entry['errors']:>4} err {entry['rps']:>8.1f} req/s  "
+              f"p50 {entry['p50_ms']:.1f} ms  p95 {entry['p95_ms']:.1f} ms  p99 {entry['p99_ms']:.1f} ms", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.max_slowdown)
+        for name, metric, old, new in regressions:
+            print(f"REGRESSION {name} {metric}: {old} -> {new}", file=sys.stderr)
+        print(f"{len(regressions)} regressions", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
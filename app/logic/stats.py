@@ -0,0 +1,218 @@
+"""
+Materialized dashboard statistics.
+
+The stats_jurusan_ipk and stats_enrollment_month tables hold per-jurusan
+counters that StudentManager updates in the same transaction as every write,
+so the dashboard never scans students. Keeping IPK counts per 0.01 bucket
+(at most 401 rows per jurusan) makes min, max and median exact for the
+two-decimal IPK values the forms accept. Students without an IPK are
+counted in NO_IPK_BUCKET and left out of the IPK figures.
+
+Consistency can be checked or restored from the command line:
+
+    python -m app.logic.stats check
+    python -m app.logic.stats rebuild
+"""
+import sys
+from collections import defaultdict
+from sqlalchemy import and_, delete, insert, select, update
+from sqlalchemy.orm import Session
+from app import models
+
+IPK_SCALE = 100
+NO_IPK_BUCKET = -1
+# Dashboard histogram: 0.50 wide bins, 4.00 falls into the last one
+HISTOGRAM_BIN_WIDTH = 50
+HISTOGRAM_BINS = 8
+
+def ipk_bucket(ipk) -> int:
+    return NO_IPK_BUCKET if ipk is None else round(ipk * IPK_SCALE)
+
+def month_of(created_at) -> str:
+    return created_at.strftime("%Y-%m") if created_at else "unknown"
+
+class StatsDelta:
+    """Counter changes collected for one transaction, written with apply()"""
+
+    def __init__(self):
+        self.ipk = defaultdict(lambda: [0, 0.0])
+        self.months = defaultdict(int)
+
+    def add(self, jurusan, ipk, created_at, sign=1):
+        entry = self.ipk[(jurusan, ipk_bucket(ipk))]
+        entry[0] += sign
+        entry[1] += sign * (ipk or 0)
+        self.months[(jurusan, month_of(created_at))] += sign
+
+    def remove(self, jurusan, ipk, created_at):
+        self.add(jurusan, ipk, created_at, sign=-1)
+
+    def apply(self, db: Session):
+        """Upserts the counters; must run inside the transaction of the write it describes"""
+        ipk_rows = [
+            {"jurusan": jurusan, "ipk_bucket": bucket, "count": count, "ipk_sum": ipk_sum}
+            for (jurusan, bucket), (count, ipk_sum) in self.ipk.items() if count
+        ]
+        month_rows = [
+            {"jurusan": jurusan, "month": month, "count": count}
+            for (jurusan, month), count in self.months.items() if count
+        ]
+        _upsert(db, models.JurusanIpkStat, ipk_rows, ["jurusan", "ipk_bucket"], ["count", "ipk_sum"])
+        _upsert(db, models.EnrollmentMonthStat, month_rows, ["jurusan", "month"], ["count"])
+        if any(row["count"] < 0 for row in ipk_rows):
+            db.execute(delete(models.JurusanIpkStat).where(models.JurusanIpkStat.count <= 0))
+        if any(row["count"] < 0 for row in month_rows):
+            db.execute(delete(models.EnrollmentMonthStat).where(models.EnrollmentMonthStat.count <= 0))
+
+def _upsert(db: Session, model, rows, key_columns, sum_columns):
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        _update_then_insert(db, model, rows, key_columns, sum_columns)
+        return
+    
+    stmt = dialect_insert(model)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={col: getattr(model, col) + getattr(stmt.excluded, col) for col in sum_columns}
+    )
+    db.execute(stmt, rows)
+
+def _update_then_insert(db: Session, model, rows, key_columns, sum_columns):
+    """Portable upsert for dialects without ON CONFLICT: UPDATE every row, INSERT the ones that matched nothing"""
+    for row in rows:
+        stmt = (
+            update(model)
+            .where(and_(*(getattr(model, col) == row[col] for col in key_columns)))
+            .values({col: getattr(model, col) + row[col] for col in sum_columns})
+        )
+        if db.execute(stmt).rowcount == 0:
+            db.execute(insert(model).values(row))
+
+def _scan_students(db: Session) -> StatsDelta:
+    """Recomputes every counter from the students table"""
+    delta = StatsDelta()
+    s = models.Student
+    query = select(s.jurusan, s.ipk, s.created_at).execution_options(yield_per=5000)
+    for jurusan, ipk, created_at in db.execute(query):
+        delta.add(jurusan, ipk, created_at)
+    return delta
+
+def rebuild(db: Session):
+    db.execute(delete(models.JurusanIpkStat))
+    db.execute(delete(models.EnrollmentMonthStat))
+    _scan_students(db).apply(db)
+    db.commit()
+
+def ensure_built(db: Session):
+    """Builds the tables the first time they exist next to an already filled students table"""
+    has_stats = db.execute(select(models.JurusanIpkStat.jurusan).limit(1)).first()
+    if has_stats is None and db.execute(select(models.Student.id).limit(1)).first():
+        rebuild(db)
+
+def check(db: Session):
+    """Returns (table, key, stored, expected) for every counter that disagrees with students"""
+    expected = _scan_students(db)
+    mismatches = []
+    
+    stored_ipk = {
+        (row.jurusan, row.ipk_bucket): row.count
+        for row in db.execute(select(models.JurusanIpkStat)).scalars()
+    }
+    expected_ipk = {key: count for key, (count, _) in expected.ipk.items()}
+    for key in stored_ipk.keys() | expected_ipk.keys():
+        if stored_ipk.get(key, 0) != expected_ipk.get(key, 0):
+            mismatches.append(("stats_jurusan_ipk", key, stored_ipk.get(key, 0), expected_ipk.get(key, 0)))
+    
+    stored_months = {
+        (row.jurusan, row.month): row.count
+        for row in db.execute(select(models.EnrollmentMonthStat)).scalars()
+    }
+    for key in stored_months.keys() | expected.months.keys():
+        if stored_months.get(key, 0) != expected.months.get(key, 0):
+            mismatches.append(("stats_enrollment_month", key, stored_months.get(key, 0), expected.months.get(key, 0)))
+    return mismatches
+
+def _median(buckets, total):
+    """Median of {bucket: count}; the average of the two middle values for an even total"""
+    middle = [(total - 1) // 2, total // 2]
+    values = []
+    seen = 0
+    for bucket in sorted(buckets):
+        seen += buckets[bucket]
+        while middle and middle[0] < seen:
+            middle.pop(0)
+            values.append(bucket)
+    return sum(values) / len(values) / IPK_SCALE
+
+def read_dashboard(db: Session) -> dict:
+    per_jurusan = defaultdict(dict)
+    ipk_sums = defaultdict(float)
+    histogram = [0] * HISTOGRAM_BINS
+    no_ipk = defaultdict(int)
+    for row in db.execute(select(models.JurusanIpkStat)).scalars():
+        if row.ipk_bucket == NO_IPK_BUCKET:
+            no_ipk[row.jurusan] += row.count
+            continue
+        per_jurusan[row.jurusan][row.ipk_bucket] = row.count
+        ipk_sums[row.jurusan] += row.ipk_sum
+        histogram[min(row.ipk_bucket // HISTOGRAM_BIN_WIDTH, HISTOGRAM_BINS - 1)] += row.count
+
+    jurusan_stats = {}
+    for jurusan in sorted(per_jurusan.keys() | no_ipk.keys(), key=str):
+        buckets = per_jurusan[jurusan]
+        count = sum(buckets.values())
+        jurusan_stats[jurusan] = {
+            "count": count + no_ipk[jurusan],
+            "avg_ipk": round(ipk_sums[jurusan] / count, 2) if count else None,
+            "min_ipk": min(buckets) / IPK_SCALE if count else None,
+            "max_ipk": max(buckets) / IPK_SCALE if count else None,
+            "median_ipk": round(_median(buckets, count), 2) if count else None,
+        }
+
+    months = defaultdict(int)
+    for row in db.execute(select(models.EnrollmentMonthStat)).scalars():
+        months[row.month] += row.count
+
+    total_students = sum(stat["count"] for stat in jurusan_stats.values())
+    with_ipk = total_students - sum(no_ipk.values())
+    avg_ipk = sum(ipk_sums.values()) / with_ipk if with_ipk > 0 else 0
+    width = HISTOGRAM_BIN_WIDTH / IPK_SCALE
+    return {
+        "total_students": total_students,
+        "avg_ipk": round(avg_ipk, 2),
+        "jurusan_counts": {jurusan: stat["count"] for jurusan, stat in jurusan_stats.items()},
+        "jurusan_stats": jurusan_stats,
+        "ipk_histogram": [
+            (f"{i * width:.2f} - {(i + 1) * width:.2f}", count) for i, count in enumerate(histogram)
+        ],
+        "enrollment_months": dict(sorted(months.items())),
+    }
+
+if __name__ == "__main__":
+    from app.database import Base, SessionLocal, engine
+
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command not in ("check", "rebuild"):
+        print("Usage: python -m app.logic.stats check|rebuild")
+        sys.exit(2)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if command == "rebuild":
+            rebuild(db)
+            print("Statistics rebuilt")
+        else:
+            mismatches = check(db)
+            for table, key, stored, expected in mismatches:
+                print(f"{table} {key}: stored {stored}, expected {expected}")
+            print(f"{len(mismatches)} mismatches")
+            sys.exit(1 if mismatches else 0)
+    finally:
+        db.close()
@@ -1,9 +1,21 @@
+from sqlalchemy import func, select, insert
 from sqlalchemy.orm import Session
+from pydantic import ValidationError
 from app import models, schemas
+from app.core import metrics
+from app.core.exceptions import FileEmpty, FileFormatError
+from app.logic import stats
+from app.logic.cache import stats_cache
+from app.logic.columnar import student_columns
+from app.logic.indexes import student_index
+from app.logic.csv_stream import CsvRowParser
 import csv
 import io
+import re
+import email_validator
 from abc import ABC, abstractmethod
-from typing import List
+from datetime import datetime
+from typing import AsyncIterable, Callable, Iterable, Iterator, List, Optional
 
 class DataManager(ABC):
     """Abstract Base Class for Data Management Business Logic"""
@@ -29,6 +41,35 @@ class DataManager(ABC):
 
 class StudentManager(DataManager):
     """Concrete implementation for Student Management"""
+
+    # ORDER BY expressions for get_sorted; each one is backed by an index on models.Student
+    SORT_COLUMNS = {
+        "nama": func.lower(models.Student.nama),
+        "nim": models.Student.nim,
+        "ipk": models.Student.ipk,
+        "jurusan": func.lower(models.Student.jurusan),
+        "email": func.lower(models.Student.email),
+    }
+
+    DEFAULT_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 500
+
+    @staticmethod
+    def data_changed(bulk: bool = False):
+        """
+        Called after every committed write to students; drops derived caches.
+        Single-row writes then update the in-memory indexes themselves, bulk
+        writes drop them to be rebuilt on the next lookup. The columnar
+        snapshot is always dropped and reloaded on its next use.
+        """
+        stats_cache.invalidate()
+        student_columns.invalidate()
+        if bulk:
+            student_index.invalidate()
+
+    @staticmethod
+    def _index_values(db_student) -> dict:
+        return {column: getattr(db_student, column) for column in student_index.COLUMNS}
     
     def create(self, student: schemas.StudentCreate) -> models.Student:
         db_student = models.Student(
@@ -40,30 +81,180 @@ class StudentManager(DataManager):
         )
         self.db.add(db_student)
         try:
+            self.db.flush()
+            delta = stats.StatsDelta()
+            delta.add(db_student.jurusan, db_student.ipk, db_student.created_at)
+            delta.apply(self.db)
             self.db.commit()
             self.db.refresh(db_student)
         except Exception as e:
             self.db.rollback()
             raise e
+        self.data_changed()
+        student_index.on_insert(db_student.id, self._index_values(db_student))
         return db_student
 
+    @metrics.instrumented("orm")
     def get_all(self) -> List[models.Student]:
         return self.db.query(models.Student).all()
     
+    @metrics.instrumented("orm")
+    def count(self) -> int:
+        return self.db.execute(select(func.count(models.Student.id))).scalar()
+
+    @metrics.instrumented("orm")
+    def get_stats(self) -> dict:
+        """Dashboard numbers read from the materialized stats tables, cached until the next write"""
+        return stats_cache.get_or_compute(lambda: stats.read_dashboard(self.db))
+
+    @metrics.instrumented("orm")
+    def get_page(self, cursor: Optional[int] = None, limit: int = DEFAULT_PAGE_SIZE):
+        """
+        Keyset pagination on id: returns (students, next_cursor) where next_cursor
+        is the id to continue after, or None on the last page. Unlike OFFSET,
+        every page is a single index range scan regardless of its position.
+        """
+        limit = max(1, min(limit, self.MAX_PAGE_SIZE))
+        query = self.db.query(models.Student).order_by(models.Student.id)
+        if cursor is not None:
+            query = query.filter(models.Student.id > cursor)
+        
+        # One extra row tells whether another page exists without a COUNT(*)
+        students = query.limit(limit + 1).all()
+        if len(students) > limit:
+            return students[:limit], students[limit - 1].id
+        return students, None
+
+    @metrics.instrumented("orm")
+    def get_sorted(self, key: str, ascending: bool = True, limit: Optional[int] = None, offset: int = 0) -> List[models.Student]:
+        """Sorts in the database with an index scan instead of loading and sorting in Python"""
+        column = self.SORT_COLUMNS.get(key)
+        if column is None:
+            raise ValueError(f"Kolom pengurutan tidak dikenal: {key}")
+        
+        # id breaks ties in ascending order in both directions, like get_sorted_by and the
+        # stable Python sorts, so pages from limit/offset are deterministic and agree with them
+        order = column.asc() if ascending else column.desc()
+        query = self.db.query(models.Student).order_by(order, models.Student.id.asc())
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+    
+    @metrics.instrumented("orm")
+    def get_sorted_by(self, spec, limit: Optional[int] = None, offset: int = 0) -> List[models.Student]:
+        """
+        Multi-key ORDER BY for a spec [(key, ascending), ...] such as jurusan ASC,
+        ipk DESC, nama ASC. id breaks the remaining ties in ascending order, which
+        matches the stable order of the Python algorithms.
+        """
+        order_by = self._order_by(spec)
+        query = self.db.query(models.Student).order_by(*order_by, models.Student.id.asc())
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def _order_by(self, spec):
+        clauses = []
+        for key, ascending in spec:
+            column = self.SORT_COLUMNS.get(key)
+            if column is None:
+                raise ValueError(f"Kolom pengurutan tidak dikenal: {key}")
+            clauses.append(column.asc() if ascending else column.desc())
+        return clauses
+
+    @metrics.instrumented("orm")
+    def get_top_k(
+        self, spec, k: int, group_by: Optional[str] = None, limit: Optional[int] = None, offset: int = 0
+    ) -> List[models.Student]:
+        """
+        The first k rows of a sort spec, or of every group_by value with
+        ROW_NUMBER() OVER (PARTITION BY ...), so only the ranked rows are loaded.
+        limit/offset page through the ranked rows.
+        """
+        order_by = self._order_by(spec) + [models.Student.id.asc()]
+        if group_by is None:
+            # The page is cut from the first k rows, so it never reaches past them
+            if limit is None or offset + limit > k:
+                limit = max(k - offset, 0)
+            query = self.db.query(models.Student).order_by(*order_by)
+        else:
+            group = self._group_column(group_by)
+            ranked = self._ranked(group, order_by)
+            query = (
+                self.db.query(models.Student)
+                .join(ranked, ranked.c.id == models.Student.id)
+                .filter(ranked.c.rank <= k)
+                .order_by(group.asc(), *order_by)
+            )
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    @metrics.instrumented("orm")
+    def count_top_k(self, k: int, group_by: Optional[str] = None) -> int:
+        """Number of rows get_top_k ranks in total, i.e. over all its pages"""
+        if group_by is None:
+            return min(k, self.count())
+        ranked = self._ranked(self._group_column(group_by), [models.Student.id.asc()])
+        return self.db.execute(select(func.count()).select_from(ranked).where(ranked.c.rank <= k)).scalar()
+
+    def _group_column(self, group_by):
+        group = self.SORT_COLUMNS.get(group_by)
+        if group is None:
+            raise ValueError(f"Kolom pengurutan tidak dikenal: {group_by}")
+        return group
+
+    @staticmethod
+    def _ranked(group, order_by):
+        return select(
+            models.Student.id,
+            func.row_number().over(partition_by=group, order_by=order_by).label("rank"),
+        ).subquery()
+
+    @metrics.instrumented("orm")
     def get_by_id(self, student_id: int):
         return self.db.query(models.Student).filter(models.Student.id == student_id).first()
 
+    # Ids per IN (...) query, well below SQLite's bound parameter limit
+    ID_LOOKUP_CHUNK = 1000
+
+    @metrics.instrumented("orm")
+    def get_by_ids(self, student_ids) -> dict:
+        """Returns {id: Student} for the given ids in a few IN queries"""
+        ids = list(set(student_ids))
+        students = {}
+        for i in range(0, len(ids), self.ID_LOOKUP_CHUNK):
+            chunk = ids[i:i + self.ID_LOOKUP_CHUNK]
+            for student in self.db.query(models.Student).filter(models.Student.id.in_(chunk)):
+                students[student.id] = student
+        return students
+
     def update(self, student_id: int, student_data: schemas.StudentUpdate):
         db_student = self.get_by_id(student_id)
         if not db_student:
             from app.core.exceptions import DataNotFound
             raise DataNotFound(f"Student with ID {student_id} not found")
         
+        delta = stats.StatsDelta()
+        delta.remove(db_student.jurusan, db_student.ipk, db_student.created_at)
+        old_values = self._index_values(db_student)
+        
         # update fields
         for key, value in student_data.dict().items():
             setattr(db_student, key, value)
-            
+        
+        new_values = self._index_values(db_student)
+        delta.add(db_student.jurusan, db_student.ipk, db_student.created_at)
+        delta.apply(self.db)
         self.db.commit()
+        self.data_changed()
+        student_index.on_update(student_id, old_values, new_values)
         self.db.refresh(db_student)
         return db_student
 
@@ -73,52 +264,324 @@ class StudentManager(DataManager):
              from app.core.exceptions import DataNotFound
              raise DataNotFound(f"Student with ID {student_id} not found")
              
+        delta = stats.StatsDelta()
+        delta.remove(db_student.jurusan, db_student.ipk, db_student.created_at)
+        delta.apply(self.db)
+        old_values = self._index_values(db_student)
         self.db.delete(db_student)
         self.db.commit()
+        self.data_changed()
+        student_index.on_delete(student_id, old_values)
         return True
 
-    def export_csv(self) -> str:
+    EXPORT_HEADER = ['ID', 'NIM', 'Nama', 'Email', 'Jurusan', 'IPK']
+
+    def iter_csv(self, chunk_size: int = 1000) -> Iterator[str]:
+        """
+        Yields the CSV export one chunk of rows at a time. Plain column tuples are
+        fetched with yield_per (no ORM objects), so memory stays constant in the
+        size of the table.
+        """
         output = io.StringIO()
         writer = csv.writer(output)
-        writer.writerow(['ID', 'NIM', 'Nama', 'Email', 'Jurusan', 'IPK'])
+        writer.writerow(self.EXPORT_HEADER)
+        yield output.getvalue()
         
-        students = self.get_all()
-        for s in students:
-            writer.writerow([s.id, s.nim, s.nama, s.email, s.jurusan, s.ipk])
-            
-        return output.getvalue()
+        s = models.Student
+        query = (
+            select(s.id, s.nim, s.nama, s.email, s.jurusan, s.ipk)
+            .order_by(s.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        for rows in self.db.execute(query).partitions():
+            output.seek(0)
+            output.truncate()
+            writer.writerows(rows)
+            yield output.getvalue()
+
+    def export_csv(self) -> str:
+        return "".join(self.iter_csv())
+
+    def importer(
+        self,
+        strict: bool = True,
+        chunk_size: int = 1000,
+        commit_every_chunk: bool = False,
+        on_commit: Optional[Callable[["ImportReport"], None]] = None
+    ) -> "StudentImporter":
+        return StudentImporter(self.db, strict=strict, chunk_size=chunk_size,
+                               commit_every_chunk=commit_every_chunk, on_commit=on_commit)
 
-    def import_csv(self, file_content: str):
+    def import_csv(self, file_content: str, strict: bool = True, chunk_size: int = 1000, commit_every_chunk: bool = False) -> "ImportReport":
+        """
+        Bulk import of an exported CSV. In strict mode the first invalid row aborts the
+        import and nothing is written; otherwise invalid rows are skipped and listed
+        in the returned ImportReport.
+        """
         if not file_content.strip():
-             from app.core.exceptions import FileEmpty
              raise FileEmpty()
 
         stream = io.StringIO(file_content)
         try:
             reader = csv.DictReader(stream)
             if not reader.fieldnames:
-                 from app.core.exceptions import FileFormatError
                  raise FileFormatError("CSV Header missing")
-                 
-            count = 0
-            for row in reader:
-                # Basic validation/mapping
-                try:
-                    student_in = schemas.StudentCreate(
-                        nama=row['Nama'],
-                        email=row['Email'],
-                        nim=row['NIM'],
-                        jurusan=row['Jurusan'],
-                        ipk=float(row['IPK'])
-                    )
-                    self.create(student_in)
-                    count += 1
-                except Exception as row_error:
-                    # We might log this but continue or raise FormatError
-                    # For strictness let's raise
-                    from app.core.exceptions import FileFormatError
-                    raise FileFormatError(f"Row error: {str(row_error)}")
-            return count
+            
+            importer = self.importer(strict=strict, chunk_size=chunk_size, commit_every_chunk=commit_every_chunk)
+            try:
+                importer.feed(reader)
+                return importer.finish()
+            except Exception:
+                importer.abort()
+                raise
         except csv.Error:
-             from app.core.exceptions import FileFormatError
              raise FileFormatError("Invalid CSV format")
+
+    async def import_csv_stream(
+        self,
+        chunks: AsyncIterable[bytes],
+        strict: bool = True,
+        chunk_size: int = 1000,
+        commit_every_chunk: bool = False,
+        on_progress: Optional[Callable[["ImportReport", int], None]] = None
+    ) -> "ImportReport":
+        """
+        Like import_csv, but reads the file as a stream of byte chunks (e.g. an
+        upload) that are decoded and parsed incrementally. on_progress is called
+        with the report and the number of bytes read after every chunk, and with
+        commit_every_chunk also after every commit.
+        """
+        parser = CsvRowParser()
+        importer = self._stream_importer(parser, strict, chunk_size, commit_every_chunk, on_progress)
+        try:
+            async for data in chunks:
+                self._feed_chunk(parser, importer, data, on_progress)
+            return self._finish_stream(parser, importer)
+        except Exception as e:
+            importer.abort()
+            raise self._stream_error(e)
+
+    def import_csv_chunks(
+        self,
+        chunks: Iterable[bytes],
+        strict: bool = True,
+        chunk_size: int = 1000,
+        commit_every_chunk: bool = False,
+        on_progress: Optional[Callable[["ImportReport", int], None]] = None
+    ) -> "ImportReport":
+        """Synchronous import_csv_stream, e.g. for a file read by a worker thread"""
+        parser = CsvRowParser()
+        importer = self._stream_importer(parser, strict, chunk_size, commit_every_chunk, on_progress)
+        try:
+            for data in chunks:
+                self._feed_chunk(parser, importer, data, on_progress)
+            return self._finish_stream(parser, importer)
+        except Exception as e:
+            importer.abort()
+            raise self._stream_error(e)
+
+    def _stream_importer(self, parser, strict, chunk_size, commit_every_chunk, on_progress):
+        on_commit = None
+        if on_progress and commit_every_chunk:
+            on_commit = lambda report: on_progress(report, parser.bytes_read)
+        return self.importer(strict=strict, chunk_size=chunk_size, commit_every_chunk=commit_every_chunk, on_commit=on_commit)
+
+    @staticmethod
+    def _feed_chunk(parser, importer, data, on_progress):
+        importer.feed(parser.feed(data))
+        if on_progress:
+            on_progress(importer.report, parser.bytes_read)
+
+    @staticmethod
+    def _finish_stream(parser, importer):
+        importer.feed(parser.close())
+        if not parser.has_content or not parser.fieldnames:
+            raise FileEmpty()
+        return importer.finish()
+
+    @staticmethod
+    def _stream_error(e):
+        if isinstance(e, csv.Error):
+            return FileFormatError("Invalid CSV format")
+        if isinstance(e, UnicodeDecodeError):
+            return FileFormatError("File must be UTF-8 encoded")
+        return e
+
+class ImportReport:
+    """Outcome of a bulk import; errors holds (row_number, message) for rejected rows"""
+    
+    def __init__(self):
+        self.processed = 0
+        self.inserted = 0
+        # Inserted rows that are committed; with commit_every_chunk they are kept if the import fails later
+        self.committed = 0
+        self.errors = []
+
+    @property
+    def rejected(self):
+        return len(self.errors)
+
+class StudentImporter:
+    """
+    Bulk insert pipeline used by StudentManager.import_csv. Rows are fed in any
+    number of calls and processed per chunk: validated with schemas.StudentCreate,
+    checked for duplicate nim/email within the chunk and against the table (one
+    query per chunk, which also sees the chunks inserted before), then inserted with a single executemany. Everything is one
+    transaction unless commit_every_chunk is set; on_commit is called with the
+    report after every commit.
+    """
+    
+    # Row numbers in reports count the header as row 1, like a spreadsheet
+    FIRST_ROW_NUMBER = 2
+    # Unquoted ASCII local parts (RFC 5322 dot-atom), which email validation accepts unchanged
+    SIMPLE_LOCAL_PART = re.compile(r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*\Z")
+    MAX_LOCAL_PART = 64
+    MAX_SIMPLE_EMAIL = 254
+
+    def __init__(
+        self,
+        db: Session,
+        strict: bool = True,
+        chunk_size: int = 1000,
+        commit_every_chunk: bool = False,
+        on_commit: Optional[Callable[["ImportReport"], None]] = None
+    ):
+        self.db = db
+        self.strict = strict
+        self.chunk_size = chunk_size
+        self.commit_every_chunk = commit_every_chunk
+        self.on_commit = on_commit
+        self.report = ImportReport()
+        self._pending = []
+        self._domains = {}
+
+    def feed(self, rows: Iterable[dict]):
+        for row in rows:
+            self._pending.append((self.report.processed + self.FIRST_ROW_NUMBER, row))
+            self.report.processed += 1
+            if len(self._pending) >= self.chunk_size:
+                self._flush()
+
+    def finish(self) -> ImportReport:
+        self._flush()
+        self._commit()
+        # Database duplicates are found after validation, so restore file order
+        self.report.errors.sort()
+        return self.report
+
+    def abort(self):
+        self.db.rollback()
+        self._pending = []
+        if self.commit_every_chunk:
+            # Chunks committed before the failure are kept
+            StudentManager.data_changed(bulk=True)
+
+    def _reject(self, row_number, message):
+        if self.strict:
+            raise FileFormatError(f"Row error: {message}")
+        self.report.errors.append((row_number, message))
+
+    def _flush(self):
+        chunk, self._pending = self._pending, []
+        if not chunk:
+            return
+        
+        valid = []
+        # Duplicates of rows in earlier chunks are already in the table, where
+        # _existing_keys finds them, so only this chunk's keys are held in memory
+        seen_nims = set()
+        seen_emails = set()
+        for row_number, row in chunk:
+            try:
+                student_in = self._validate(row)
+            except KeyError as e:
+                self._reject(row_number, f"Missing column {e}")
+                continue
+            except ValidationError as e:
+                self._reject(row_number, "; ".join(
+                    f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+                ))
+                continue
+            except (ValueError, TypeError) as e:
+                self._reject(row_number, str(e))
+                continue
+            
+            if student_in.nim in seen_nims:
+                self._reject(row_number, f"Duplicate NIM {student_in.nim} in file")
+                continue
+            if student_in.email in seen_emails:
+                self._reject(row_number, f"Duplicate email {student_in.email} in file")
+                continue
+            seen_nims.add(student_in.nim)
+            seen_emails.add(student_in.email)
+            valid.append((row_number, student_in))
+        
+        if valid:
+            taken_nims, taken_emails = self._existing_keys(valid)
+            # created_at is set explicitly so the stats know the enrollment month without a read back
+            created_at = datetime.utcnow()
+            delta = stats.StatsDelta()
+            mappings = []
+            for row_number, student_in in valid:
+                if student_in.nim in taken_nims:
+                    self._reject(row_number, f"NIM {student_in.nim} already exists")
+                elif student_in.email in taken_emails:
+                    self._reject(row_number, f"Email {student_in.email} already exists")
+                else:
+                    mappings.append(dict(student_in.model_dump(), created_at=created_at))
+                    delta.add(student_in.jurusan, student_in.ipk, created_at)
+            
+            if mappings:
+                # Core insert: the ORM bulk path adds per-row bookkeeping that is not needed here
+                self.db.execute(insert(models.Student.__table__), mappings)
+                delta.apply(self.db)
+                self.report.inserted += len(mappings)
+        
+        if self.commit_every_chunk:
+            self._commit()
+
+    def _commit(self):
+        self.db.commit()
+        StudentManager.data_changed(bulk=True)
+        self.report.committed = self.report.inserted
+        if self.on_commit:
+            self.on_commit(self.report)
+
+    def _validate(self, row) -> schemas.StudentCreate:
+        """
+        schemas.StudentCreate for a CSV row. EmailStr validation (IDNA checks of the
+        domain) dominates import time, so a row whose fields pass the schema rules and
+        whose email is a plain ASCII local part at an already validated domain is built
+        with model_construct. Anything else takes full validation, which also produces
+        the error messages.
+        """
+        nama, email, nim, jurusan = row['Nama'], row['Email'], row['NIM'], row['Jurusan']
+        ipk = float(row['IPK'])
+        if (isinstance(nama, str) and isinstance(email, str) and isinstance(nim, str) and isinstance(jurusan, str)
+                and schemas.NIM_PATTERN.match(nim) and schemas.NAMA_PATTERN.match(nama) and 0.0 <= ipk <= 4.0
+                and len(email) <= self.MAX_SIMPLE_EMAIL):
+            local, _, domain = email.rpartition("@")
+            if len(local) <= self.MAX_LOCAL_PART and self.SIMPLE_LOCAL_PART.match(local):
+                domain = self._normalized_domain(domain)
+                if domain is not None:
+                    return schemas.StudentCreate.model_construct(
+                        nama=nama, email=f"{local}@{domain}", nim=nim, jurusan=jurusan, ipk=ipk
+                    )
+        return schemas.StudentCreate(nama=nama, email=email, nim=nim, jurusan=jurusan, ipk=ipk)
+
+    def _normalized_domain(self, domain):
+        """The domain as EmailStr normalizes it, validated once per import; None if invalid"""
+        if domain not in self._domains:
+            try:
+                self._domains[domain] = email_validator.validate_email(f"a@{domain}", check_deliverability=False).domain
+            except email_validator.EmailNotValidError:
+                self._domains[domain] = None
+        return self._domains[domain]
+
+    def _existing_keys(self, valid):
+        """nim and email values of the chunk that are already in the table, one IN query each"""
+        nims = [student_in.nim for _, student_in in valid]
+        emails = [student_in.email for _, student_in in valid]
+        taken_nims = self.db.execute(select(models.Student.nim).where(models.Student.nim.in_(nims))).scalars()
+        taken_emails = self.db.execute(select(models.Student.email).where(models.Student.email.in_(emails))).scalars()
+        return set(taken_nims), set(taken_emails)
@@ -1,13 +1,31 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
-from app.database import engine, Base
+from app.core import metrics, profiling
+from app.database import engine, Base, SessionLocal, ensure_indexes
+from app.logic import fulltext, stats
 from app.routers import auth, dashboard, students, algorithms
 
 # Create Tables
 Base.metadata.create_all(bind=engine)
+ensure_indexes()
+with SessionLocal() as db:
+    stats.ensure_built(db)
+    fulltext.ensure_built(db)
 
 app = FastAPI(title="Student Management System")
 
+# Admin-only ?profile=cprofile|sample|trace; added first so that the metrics middleware wraps it
+app.add_middleware(profiling.ProfilingMiddleware)
+
+# Per-request phase timings: Server-Timing header and /metrics
+metrics.instrument_engine(engine)
+app.add_middleware(metrics.MetricsMiddleware)
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
 # Mount Static
 import os
 static_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
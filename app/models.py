@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -29,8 +29,8 @@ class Student(Person):
     __tablename__ = "students"
     
     nim = Column(String, unique=True, index=True) # ID Mahasiswa
-    jurusan = Column(String)
-    ipk = Column(Float)
+    jurusan = Column(String, index=True)
+    ipk = Column(Float, index=True)
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -38,3 +38,25 @@ class Student(Person):
     
     def get_summary(self): # Polymorphism
         return f"Mahasiswa: {self.nama} [{self.nim}]"
+
+# Case-insensitive ORDER BY nama/jurusan/email (see StudentManager.SORT_COLUMNS) is served by these indexes
+Index("ix_students_nama_lower", func.lower(Student.nama))
+Index("ix_students_jurusan_lower", func.lower(Student.jurusan))
+Index("ix_students_email_lower", func.lower(Student.email))
+
+class JurusanIpkStat(Base):
+    """Materialized statistics: students per jurusan and IPK (to 0.01), kept up to date by app.logic.stats"""
+    __tablename__ = "stats_jurusan_ipk"
+
+    jurusan = Column(String, primary_key=True)
+    ipk_bucket = Column(Integer, primary_key=True) # round(ipk * 100), -1 without an IPK
+    count = Column(Integer, nullable=False, default=0)
+    ipk_sum = Column(Float, nullable=False, default=0.0)
+
+class EnrollmentMonthStat(Base):
+    """Materialized statistics: students per jurusan and month of created_at"""
+    __tablename__ = "stats_enrollment_month"
+
+    jurusan = Column(String, primary_key=True)
+    month = Column(String, primary_key=True) # YYYY-MM
+    count = Column(Integer, nullable=False, default=0)
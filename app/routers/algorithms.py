@@ -9,19 +9,26 @@ from app.logic.algorithms.sorting import SortingAlgorithms
 from app.logic.algorithms.searching import SearchingAlgorithms
 import json
 
-from fastapi import APIRouter, Depends, Request, Form
+from fastapi import APIRouter, Depends, HTTPException, Request, Form
+from fastapi.responses import JSONResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
+from app.core import metrics
 from app.database import get_db
 from app.dependencies import require_user
 from app import models
 from app.logic.student_manager import StudentManager
-from app.logic.algorithms.sorting import SortingAlgorithms
+from app.logic import fulltext
+from app.logic.columnar import student_columns
+from app.logic.indexes import student_index
+from app.logic.algorithms.sorting import SortingAlgorithms, SortResult
 from app.logic.algorithms.searching import SearchingAlgorithms
 import json
+import re
+import time
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+templates = metrics.instrument_templates(Jinja2Templates(directory="app/templates"))
 
 @router.get("/sorting")
 async def sorting_page(request: Request, user: models.User = Depends(require_user), db: Session = Depends(get_db)):
@@ -31,71 +38,155 @@ async def sorting_page(request: Request, user: models.User = Depends(require_use
         "request": request,
         "user": user,
         "students": students, 
+        "algorithms": SortingAlgorithms.REGISTRY,
         "active_page": "sorting"
     })
 
+# Rows per group the top-k algorithms keep unless the form asks otherwise
+DEFAULT_TOP_K = 10
+# Rows listed under "Data Saat Ini" when a request does not load the whole table
+PREVIEW_ROWS = 50
+# Sorted rows shown per result page unless the form asks otherwise
+SORT_PAGE_SIZE = 50
+
 @router.post("/sorting/run")
 async def run_sorting(
     request: Request,
     algorithm: str = Form(...),
     sort_key: str = Form(...), # 'nama', 'nim', 'ipk'
     sort_order: str = Form("asc"), # 'asc', 'desc'
+    engine: str = Form("python"), # 'python' (algorithm benchmark), 'db' (indexed ORDER BY)
+    sort_spec: str = Form(None), # multi-key order, e.g. 'jurusan asc, ipk desc, nama'; overrides sort_key/sort_order
+    top_k: int = Form(DEFAULT_TOP_K), # rows kept by the top-k algorithms (per group)
+    group_by: str = Form(None), # optional top-k group column, e.g. 'jurusan'
+    page: int = Form(1), # result page; the db engine fetches only this page
+    page_size: int = Form(SORT_PAGE_SIZE),
     user: models.User = Depends(require_user),
     db: Session = Depends(get_db)
 ):
     mgr = StudentManager(db)
-    students_data = mgr.get_all()
+    info = SortingAlgorithms.REGISTRY.get(algorithm)
+    # The database and the columnar snapshot sort by themselves; they only load a preview of the table
+    loads_all = engine != "db" and not (info is not None and info.source == "columnar")
+    if loads_all:
+        students_data = mgr.get_all()
+    else:
+        students_data = mgr.get_page(None, PREVIEW_ROWS)[0]
     # Copy list to preserve original order in view if needed (though result will replace it usually)
     data_list = [s for s in students_data] 
     
     result = None
+    error = None
+    total = None
     ascending = (sort_order == "asc")
     
-    if algorithm == "bubble":
-        result = SortingAlgorithms.bubble_sort(data_list, key=sort_key, ascending=ascending)
-    elif algorithm == "selection":
-        result = SortingAlgorithms.selection_sort(data_list, key=sort_key, ascending=ascending)
-    elif algorithm == "insertion":
-        result = SortingAlgorithms.insertion_sort(data_list, key=sort_key, ascending=ascending)
-    elif algorithm == "merge":
-        result = SortingAlgorithms.merge_sort(data_list, key=sort_key, ascending=ascending)
-    elif algorithm == "shell":
-        result = SortingAlgorithms.shell_sort(data_list, key=sort_key, ascending=ascending)
+    try:
+        if page < 1 or not 1 <= page_size <= StudentManager.MAX_PAGE_SIZE:
+            raise ValueError(f"Halaman minimal 1 dan ukuran halaman antara 1 dan {StudentManager.MAX_PAGE_SIZE}")
+        offset = (page - 1) * page_size
+        key = sort_key
+        if sort_spec and sort_spec.strip():
+            # One pass over composite keys instead of chained single-key sorts
+            key = SortingAlgorithms.parse_sort_spec(sort_spec, StudentManager.SORT_COLUMNS)
+        group = group_by or None
+        if group is not None and group not in StudentManager.SORT_COLUMNS:
+            raise ValueError(f"Kolom pengurutan tidak dikenal: {group}")
+        k = max(1, top_k)
+        if engine == "db":
+            # Only the requested page is sorted out and loaded; the total is a separate COUNT
+            start_time = time.perf_counter()
+            if info is not None and info.source == "topk":
+                spec = key if isinstance(key, list) else [(key, ascending)]
+                sorted_data = mgr.get_top_k(spec, k, group, limit=page_size, offset=offset)
+            elif isinstance(key, list):
+                sorted_data = mgr.get_sorted_by(key, limit=page_size, offset=offset)
+            else:
+                sorted_data = mgr.get_sorted(key, ascending=ascending, limit=page_size, offset=offset)
+            end_time = time.perf_counter()
+            result = SortResult(sorted_data, len(sorted_data), "O(n) - Index Scan", f"{(end_time - start_time) * 1000:.4f} ms")
+            total = mgr.count_top_k(k, group) if info is not None and info.source == "topk" else mgr.count()
+        elif info is not None and info.source == "topk":
+            # Partial sort: only the k best rows (per group) are ordered and returned
+            result = info.func(data_list, k, key=key, ascending=ascending, group_by=group)
+        elif info is not None and info.source == "columnar":
+            # Vectorized sort on the cached column snapshot; it returns ids, only the page is loaded
+            result = student_columns.sort(db, key, ascending, info.func)
+            total = len(result.data)
+            page_ids = result.data[offset:offset + page_size]
+            students = mgr.get_by_ids(page_ids)
+            result.data = [students[i] for i in page_ids if i in students]
+        else:
+            result = SortingAlgorithms.run(algorithm, data_list, key=key, ascending=ascending)
+        if total is None:
+            # The algorithms sort every row; the page only bounds what is rendered
+            total = len(result.data)
+            result.data = result.data[offset:offset + page_size]
+    except ValueError as e:
+        error = str(e)
 
     return templates.TemplateResponse("sorting.html", {
         "request": request,
         "user": user,
         "result": result,
+        "error": error,
         "students": students_data,
+        "students_preview": not loads_all,
+        "algorithms": SortingAlgorithms.REGISTRY,
         "selected_algorithm": algorithm,
         "selected_key": sort_key,
         "selected_order": sort_order,
+        "selected_engine": engine,
+        "sort_spec": sort_spec,
+        "top_k": top_k,
+        "group_by": group_by,
+        "page": page,
+        "page_size": page_size,
+        "total": total,
         "active_page": "sorting"
     })
 
 @router.get("/searching")
 async def searching_page(request: Request, user: models.User = Depends(require_user), db: Session = Depends(get_db)):
     mgr = StudentManager(db)
-    students = mgr.get_all()
+    students = mgr.get_page(None, PREVIEW_ROWS)[0]
     return templates.TemplateResponse("searching.html", {
         "request": request,
         "user": user,
         "students": students, 
+        "students_preview": True,
+        "algorithms": SearchingAlgorithms.REGISTRY,
         "active_page": "searching"
     })
 
+# Matches listed on the page for range and prefix searches; the count covers all of them
+SLICE_RESULTS_SHOWN = 100
+# Default number of ranked matches a fuzzy search returns
+FUZZY_TOP_K = 10
+# Matches per page with the full-text engine
+FULLTEXT_PAGE_SIZE = 20
+
 @router.post("/searching/run")
 async def run_searching(
     request: Request,
     algorithm: str = Form(...),
-    sort_key: str = Form(...), # 'nama', 'nim', 'ipk'
+    sort_key: str = Form(...), # 'nama', 'nim', 'ipk', 'email'
     target_input: str = Form(None),
+    target_max: str = Form(None), # upper bound for range search
+    top_k: int = Form(FUZZY_TOP_K), # fuzzy search result limit
+    engine: str = Form("python"), # 'python' (algorithms), 'fts' (SQLite FTS5)
+    page: int = Form(1), # full-text result page
     user: models.User = Depends(require_user),
     db: Session = Depends(get_db)
 ):
     mgr = StudentManager(db)
-    students_data = mgr.get_all()
-    data_list = [s for s in students_data] 
+    info = SearchingAlgorithms.REGISTRY.get(algorithm)
+    # Only the list algorithms scan every student; the index and full-text paths show the first rows
+    scans_list = engine != "fts" and info is not None and info.source == "list"
+    if scans_list:
+        students_data = mgr.get_all()
+    else:
+        students_data = mgr.get_page(None, PREVIEW_ROWS)[0]
+    data_list = students_data
     
     result = None
     
@@ -104,36 +195,152 @@ async def run_searching(
             "request": request,
             "user": user,
             "students": students_data,
+            "students_preview": not scans_list,
             "error": "Target is required for searching.",
+            "algorithms": SearchingAlgorithms.REGISTRY,
             "selected_algorithm": algorithm,
             "selected_key": sort_key,
             "active_page": "searching"
         })
     
     target = target_input
+    target_high = target_max or None
     if sort_key == "ipk":
         try:
             target = float(target)
         except:
             pass 
+        if target_high is not None:
+            try:
+                target_high = float(target_high)
+            except ValueError:
+                pass
     
-    if algorithm == "binary":
-        # Binary search requires sorted data on the SAME key
-        sorted_res = SortingAlgorithms.merge_sort(data_list, key=sort_key, ascending=True)
-        data_list = sorted_res.data
-        result = SearchingAlgorithms.binary_search(data_list, target, key=sort_key)
-    elif algorithm == "linear":
-        result = SearchingAlgorithms.linear_search(data_list, target, key=sort_key)
-    elif algorithm == "sequential":
-        result = SearchingAlgorithms.sequential_search(data_list, target, key=sort_key)
+    found_student = None
+    matches = None
+    error = None
+    page = max(page, 1)
+    try:
+        if engine == "fts":
+            # Indexed text search in the database; the algorithm choice does not apply
+            result = fulltext.search(db, target_input, sort_key, FULLTEXT_PAGE_SIZE, (page - 1) * FULLTEXT_PAGE_SIZE)
+            students = mgr.get_by_ids(result.matches)
+            matches = [students[i] for i in result.matches if i in students]
+        elif info is None:
+            raise ValueError(f"Algoritma pencarian tidak dikenal: {algorithm}")
+        elif info.source == "list":
+            result = info.func(data_list, target, key=sort_key)
+            if result.found:
+                found_student = data_list[result.index]
+        elif info.source in ("range", "prefix"):
+            args = (target, target_high) if info.source == "range" else (target,)
+            result, student_ids = student_index.slice_search(db, sort_key, info.func, *args)
+            shown = student_ids[:SLICE_RESULTS_SHOWN]
+            students = mgr.get_by_ids(shown)
+            matches = [students[i] for i in shown if i in students]
+        elif info.source == "fuzzy":
+            result, student_ids = student_index.fuzzy_search(db, sort_key, target, max(1, min(top_k, SLICE_RESULTS_SHOWN)))
+            students = mgr.get_by_ids(student_ids)
+            matches = [students[i] for i in student_ids if i in students]
+        else:
+            # Index-backed searches run on process-wide structures that are already sorted/hashed/loaded for this key
+            if info.source == "sorted":
+                result, student_id = student_index.sorted_search(db, sort_key, target, info.func)
+            elif info.source == "columnar":
+                result, student_id = student_columns.search(db, sort_key, target, info.func)
+            elif info.source == "numeric":
+                result, student_id = student_index.numeric_search(db, sort_key, target, info.func)
+            else:
+                result, student_id = student_index.hash_search(db, sort_key, target)
+            if student_id is not None:
+                found_student = mgr.get_by_id(student_id)
+                if found_student is None:
+                    # The cached structure still holds a student deleted elsewhere: not found, rebuild on next use
+                    result.found = False
+                    student_index.invalidate()
+                    student_columns.invalidate()
+    except ValueError as e:
+        error = str(e)
             
     return templates.TemplateResponse("searching.html", {
         "request": request,
         "user": user,
         "result": result,
+        "error": error,
+        "found_student": found_student,
+        "matches": matches,
         "students": students_data, 
+        "students_preview": not scans_list,
+        "algorithms": SearchingAlgorithms.REGISTRY,
         "selected_algorithm": algorithm,
         "selected_key": sort_key,
         "target_input": target_input,
+        "target_max": target_max,
+        "selected_engine": engine,
+        "page": page,
+        "page_size": FULLTEXT_PAGE_SIZE,
         "active_page": "searching"
     })
+
+# Upper bound on targets per /searching/batch request
+MAX_BATCH_TARGETS = 50000
+
+@router.post("/searching/batch")
+async def run_batch_searching(
+    algorithm: str = Form("binary"), # 'linear' (hash join), 'binary' (sorted index)
+    sort_key: str = Form(...), # 'nama', 'nim', 'ipk'
+    targets: str = Form(...), # one target per line or comma separated
+    user: models.User = Depends(require_user),
+    db: Session = Depends(get_db)
+):
+    target_list = [t.strip() for t in re.split(r"[\n,]", targets) if t.strip()]
+    if not target_list:
+        raise HTTPException(status_code=400, detail="At least one target is required.")
+    if len(target_list) > MAX_BATCH_TARGETS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_TARGETS} targets per request.")
+    
+    search_targets = target_list
+    if sort_key == "ipk":
+        search_targets = []
+        for t in target_list:
+            try:
+                search_targets.append(float(t))
+            except ValueError:
+                search_targets.append(t)
+    
+    mgr = StudentManager(db)
+    try:
+        if algorithm == "binary":
+            batch, student_ids = student_index.batch_binary_search(db, sort_key, search_targets)
+        elif algorithm in ("linear", "sequential"):
+            data_list = mgr.get_all()
+            batch = SearchingAlgorithms.batch_linear_search(data_list, search_targets, key=sort_key)
+            student_ids = [data_list[r.index].id if r.found else None for _, r in batch.results]
+        else:
+            raise ValueError(f"Algoritma pencarian batch tidak dikenal: {algorithm}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    students = mgr.get_by_ids(i for i in student_ids if i is not None)
+    results = []
+    for target, (_, result), student_id in zip(target_list, batch.results, student_ids):
+        student = students.get(student_id)
+        results.append({
+            "target": target,
+            "found": result.found,
+            "index": result.index,
+            "steps": result.steps,
+            "time_taken": result.time_taken,
+            "student": {"id": student.id, "nim": student.nim, "nama": student.nama, "ipk": student.ipk} if student else None,
+        })
+    
+    return JSONResponse({
+        "algorithm": algorithm,
+        "key": sort_key,
+        "targets": len(target_list),
+        "found": batch.found_count,
+        "steps": batch.steps,
+        "complexity": batch.complexity,
+        "time_taken": batch.time_taken,
+        "results": results,
+    })
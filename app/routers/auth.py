@@ -4,11 +4,11 @@ from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app import models, schemas
-from app.core import security
+from app.core import metrics, security
 from app.core.config import settings
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+templates = metrics.instrument_templates(Jinja2Templates(directory="app/templates"))
 
 @router.get("/login", response_class=HTMLResponse)
 async def login_page(request: Request):
@@ -1,27 +1,51 @@
-from fastapi import APIRouter, Depends, Request, Form, UploadFile, File, Response
-from fastapi.responses import RedirectResponse, StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, Form, UploadFile, File, Response
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.core import metrics
+from app.database import get_db, SessionLocal
 from app.dependencies import require_user
 from app.logic.student_manager import StudentManager
+from app.logic.import_jobs import import_jobs
 from app import models, schemas
 from pydantic import ValidationError
+from typing import Optional
+import aiofiles
 import io
+import os
+import tempfile
+import zlib
 
 router = APIRouter(prefix="/students")
-templates = Jinja2Templates(directory="app/templates")
+templates = metrics.instrument_templates(Jinja2Templates(directory="app/templates"))
 
 @router.get("/")
-async def list_students(request: Request, user: models.User = Depends(require_user), db: Session = Depends(get_db)):
+async def list_students(
+    request: Request,
+    cursor: Optional[int] = None,
+    limit: int = StudentManager.DEFAULT_PAGE_SIZE,
+    stream: bool = False,
+    import_job: Optional[str] = None,
+    user: models.User = Depends(require_user),
+    db: Session = Depends(get_db)
+):
     mgr = StudentManager(db)
-    students = mgr.get_all()
-    return templates.TemplateResponse("students_list.html", {
+    students, next_cursor = mgr.get_page(cursor, limit)
+    context = {
         "request": request, 
         "user": user, 
         "students": students,
+        "cursor": cursor,
+        "next_cursor": next_cursor,
+        "page_size": limit,
+        "import_job": import_job,
         "active_page": "students"
-    })
+    }
+    if stream:
+        # Render chunk by chunk so the first bytes go out before the whole table is rendered
+        template = templates.get_template("students_list.html")
+        return StreamingResponse(template.generate(context), media_type="text/html")
+    return templates.TemplateResponse("students_list.html", context)
 
 @router.get("/add")
 async def add_student_page(request: Request, user: models.User = Depends(require_user)):
@@ -107,14 +131,56 @@ async def delete_student(student_id: int, user: models.User = Depends(require_us
     mgr.delete(student_id)
     return RedirectResponse(url="/students", status_code=302)
 
+def _export_chunks():
+    # The request-scoped session may be closed before a streamed body is sent,
+    # so the export owns its session for as long as the download runs
+    db = SessionLocal()
+    try:
+        yield from StudentManager(db).iter_csv()
+    finally:
+        db.close()
+
+def _gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) # gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
 @router.get("/export")
-async def export_students(user: models.User = Depends(require_user), db: Session = Depends(get_db)):
-    mgr = StudentManager(db)
-    csv_content = mgr.export_csv()
-    response = Response(content=csv_content, media_type="text/csv")
+async def export_students(gzip: bool = False, user: models.User = Depends(require_user)):
+    if gzip:
+        response = StreamingResponse(_gzip_chunks(_export_chunks()), media_type="application/gzip")
+        response.headers["Content-Disposition"] = "attachment; filename=students_export.csv.gz"
+        return response
+    response = StreamingResponse(_export_chunks(), media_type="text/csv")
     response.headers["Content-Disposition"] = "attachment; filename=students_export.csv"
     return response
 
+# Rejected rows listed on the page after a partial import
+IMPORT_ERRORS_SHOWN = 20
+# Uploads are read in chunks of this size instead of all at once
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Uploads up to this size are imported within the request; larger ones run as background jobs
+INLINE_IMPORT_MAX_BYTES = 1024 * 1024
+
+async def _upload_chunks(file: UploadFile):
+    while True:
+        data = await file.read(UPLOAD_CHUNK_SIZE)
+        if not data:
+            break
+        yield data
+
+async def _spool_upload(file: UploadFile) -> str:
+    """Copies the upload to a temporary file that outlives the request"""
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    async with aiofiles.open(path, "wb") as out:
+        async for data in _upload_chunks(file):
+            await out.write(data)
+    return path
+
 @router.post("/import")
 async def import_students(
     request: Request,
@@ -122,17 +188,39 @@ async def import_students(
     user: models.User = Depends(require_user),
     db: Session = Depends(get_db)
 ):
+    if file.size is None or file.size > INLINE_IMPORT_MAX_BYTES:
+        job = import_jobs.submit(await _spool_upload(file), file.filename, user.id)
+        if "application/json" in request.headers.get("accept", ""):
+            return JSONResponse({"job_id": job.id}, status_code=202)
+        return RedirectResponse(url=f"/students?import_job={job.id}", status_code=302)
+
     mgr = StudentManager(db)
     try:
-        content = await file.read()
-        text_content = content.decode("utf-8")
-        count = mgr.import_csv(text_content)
-        return RedirectResponse(url="/students", status_code=302)
+        report = await mgr.import_csv_stream(_upload_chunks(file), strict=False)
+        if not report.errors:
+            return RedirectResponse(url="/students", status_code=302)
+        import_error = f"{report.inserted} data diimpor, {report.rejected} baris ditolak."
+        import_errors = report.errors[:IMPORT_ERRORS_SHOWN]
     except Exception as e:
-        students = mgr.get_all()
-        return templates.TemplateResponse("students_list.html", {
-            "request": request,
-            "user": user,
-            "students": students,
-            "import_error": f"Import failed: {str(e)}"
-        })
+        import_error = f"Import failed: {str(e)}"
+        import_errors = []
+    
+    students, next_cursor = mgr.get_page()
+    return templates.TemplateResponse("students_list.html", {
+        "request": request,
+        "user": user,
+        "students": students,
+        "next_cursor": next_cursor,
+        "page_size": StudentManager.DEFAULT_PAGE_SIZE,
+        "import_error": import_error,
+        "import_errors": import_errors,
+        "active_page": "students"
+    })
+
+@router.get("/import/{job_id}")
+async def import_status(job_id: str, user: models.User = Depends(require_user)):
+    # Another user's job is reported as missing, so job ids cannot be probed
+    job = import_jobs.get(job_id, user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return JSONResponse(job.to_dict(IMPORT_ERRORS_SHOWN))
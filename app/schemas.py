@@ -2,6 +2,10 @@ from pydantic import BaseModel, EmailStr, field_validator
 import re
 from typing import Optional
 
+# Shared with StudentImporter's fast validation path
+NIM_PATTERN = re.compile(r'^\d+$')
+NAMA_PATTERN = re.compile(r"^[a-zA-Z\s\.]+$")
+
 class UserCreate(BaseModel):
     username: str
     email: EmailStr
@@ -21,13 +25,13 @@ class StudentBase(BaseModel):
 
     @field_validator('nim')
     def validate_nim(cls, v):
-        if not re.match(r'^\d+$', v):
+        if not NIM_PATTERN.match(v):
             raise ValueError('NIM must contain only numbers')
         return v
 
     @field_validator('nama')
     def validate_nama(cls, v):
-        if not re.match(r"^[a-zA-Z\s\.]+$", v):
+        if not NAMA_PATTERN.match(v):
             raise ValueError('Name must contain only letters, spaces, or dots')
         return v
     
@@ -0,0 +1,34 @@
+import os
+import tempfile
+
+# app.database connects on import, so the tests get their own database file first
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="student-management-tests-"), "test.db")
+
+import pytest
+from sqlalchemy import delete
+from app import models
+from app.main import app
+from app.database import SessionLocal
+from app.logic import stats
+from app.logic.student_manager import StudentManager
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.execute(delete(models.Student))
+        stats.rebuild(session)
+        session.close()
+        StudentManager.data_changed(bulk=True)
+
+@pytest.fixture
+def client(db):
+    from fastapi.testclient import TestClient
+
+    with TestClient(app) as test_client:
+        test_client.post("/register", data={"nama": "Admin", "email": "admin@test.id", "password": "rahasia"})
+        test_client.post("/login", data={"username": "admin@test.id", "password": "rahasia"})
+        yield test_client
@@ -0,0 +1,56 @@
+import json
+import pytest
+from app.logic import benchmark
+
+def entry(algorithm="quick", time_ms_min=10.0, steps=1000, **fields):
+    return dict({"group": "sorting", "algorithm": algorithm, "distribution": "random", "size": 1000, "key": "ipk",
+                 "time_ms": time_ms_min, "time_ms_min": time_ms_min, "steps": steps}, **fields)
+
+def report(*entries):
+    return {"meta": {}, "results": list(entries)}
+
+ENTRY_ID = ("sorting", "quick", "random", 1000, "ipk")
+
+@pytest.mark.parametrize("current, regressions", [
+    (entry(time_ms_min=14.9), []),
+    (entry(time_ms_min=15.0), []),
+    (entry(time_ms_min=15.1), [(ENTRY_ID, "time_ms_min", 10.0, 15.1)]),
+    (entry(time_ms_min=5.0, steps=1000), []),
+    (entry(steps=1001), [(ENTRY_ID, "steps", 1000, 1001)]),
+    (entry(time_ms_min=20.0, steps=2000), [(ENTRY_ID, "time_ms_min", 10.0, 20.0), (ENTRY_ID, "steps", 1000, 2000)]),
+])
+def test_compare_flags_slower_times_and_more_steps(current, regressions):
+    assert benchmark.compare(report(current), report(entry()), max_slowdown=1.5) == regressions
+
+def test_compare_only_gates_steps_below_the_timer_noise_floor():
+    baseline = report(entry(time_ms_min=0.1))
+
+    assert benchmark.compare(report(entry(time_ms_min=0.9)), baseline, 1.5, min_time_ms=1.0) == []
+    assert benchmark.compare(report(entry(time_ms_min=1.0)), baseline, 1.5, min_time_ms=1.0) == [
+        (ENTRY_ID, "time_ms_min", 0.1, 1.0)]
+
+def test_compare_skips_entries_missing_or_skipped_on_either_side():
+    skipped = {"group": "sorting", "algorithm": "bubble", "distribution": "random", "size": 1000, "key": "ipk",
+               "skipped": "O(n^2) above 500 rows"}
+    current = report(entry(time_ms_min=100.0), entry(algorithm="heap", time_ms_min=100.0), skipped)
+    baseline = report(dict(skipped, algorithm="quick"), entry(algorithm="bubble"))
+
+    assert benchmark.compare(current, baseline, 1.5) == []
+
+def test_cli_exits_non_zero_on_a_regression(tmp_path, capsys):
+    args = ["--sizes", "200", "--distributions", "random", "--keys", "ipk", "--algorithms", "builtin",
+            "--repeat", "1", "--output", str(tmp_path / "report.json")]
+    assert benchmark.main(args) == 0
+    current = json.loads((tmp_path / "report.json").read_text())
+    assert [(e["algorithm"], e["steps"]) for e in current["results"]] == [("builtin", 200)]
+
+    def run_against(time_ms_min, *extra):
+        baseline = {"meta": {}, "results": [dict(e, time_ms_min=time_ms_min) for e in current["results"]]}
+        (tmp_path / "baseline.json").write_text(json.dumps(baseline))
+        return benchmark.main(args + ["--baseline", str(tmp_path / "baseline.json"), *extra])
+
+    # Same steps in both runs, so only the time can regress
+    assert run_against(1e9) == 0
+    capsys.readouterr()
+    assert run_against(0.0, "--min-time-ms", "0") == 1
+    assert "REGRESSION sorting/builtin/random/200/ipk time_ms_min" in capsys.readouterr().err
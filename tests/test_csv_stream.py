@@ -0,0 +1,71 @@
+import pytest
+from app.core.exceptions import FileEmpty, FileFormatError
+from app.logic.csv_stream import CsvRowParser
+from app.logic.student_manager import StudentManager
+
+HEADER = "NIM,Nama,Email,Jurusan,IPK"
+ROWS = ["1001,Budi Santoso,budi@kampus.ac.id,Teknik Informatika,3.50",
+        "1002,Siti Rahma,siti@kampus.ac.id,Sistem Informasi,3.75"]
+
+def parse(data: bytes, chunk_size: int):
+    parser = CsvRowParser()
+    rows = []
+    for i in range(0, len(data), chunk_size):
+        rows += parser.feed(data[i:i + chunk_size])
+    return rows + parser.close()
+
+@pytest.mark.parametrize("terminator", ["\n", "\r\n", "\r"])
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_line_terminators(terminator, chunk_size):
+    data = terminator.join([HEADER] + ROWS + [""]).encode()
+
+    rows = parse(data, chunk_size)
+
+    assert [row["NIM"] for row in rows] == ["1001", "1002"]
+    assert rows[1]["IPK"] == "3.75"
+
+def test_bare_carriage_return_rows_are_emitted_before_close():
+    parser = CsvRowParser()
+
+    rows = parser.feed("\r".join([HEADER] + ROWS + ["1003,Andi"]).encode())
+
+    assert [row["NIM"] for row in rows] == ["1001", "1002"]
+
+def test_quoted_carriage_return_stays_in_field():
+    data = f'{HEADER}\r1001,"Budi\rSantoso",budi@kampus.ac.id,TI,3.50\r'.encode()
+
+    rows = parse(data, 3)
+
+    assert len(rows) == 1
+    assert rows[0]["Nama"] == "Budi\rSantoso"
+
+@pytest.mark.parametrize("content", [b"", b"   ", b" \r\n\t\n", b"\n\n"])
+def test_whitespace_only_file_is_empty(db, content):
+    with pytest.raises(FileEmpty):
+        StudentManager(db).import_csv_chunks([content], strict=False)
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+@pytest.mark.parametrize("commit_every_chunk", [False, True])
+def test_duplicates_are_rejected_within_and_across_chunks(db, chunk_size, commit_every_chunk):
+    content = "\n".join([HEADER] + ROWS + [
+        "1001,Budi Lain,lain@kampus.ac.id,Hukum,3.00",
+        "1003,Andi Wijaya,siti@kampus.ac.id,Hukum,3.00",
+        "1004,Dewi Lestari,dewi@kampus.ac.id,Hukum,3.00",
+        "1004,Dewi Lestari,dewi@kampus.ac.id,Hukum,3.00",
+    ])
+
+    report = StudentManager(db).import_csv(content, strict=False, chunk_size=chunk_size, commit_every_chunk=commit_every_chunk)
+
+    assert report.inserted == 3
+    assert [row for row, _ in report.errors] == [4, 5, 7]
+    assert "1001" in report.errors[0][1]
+    assert "siti@kampus.ac.id" in report.errors[1][1]
+    assert StudentManager(db).count() == 3
+
+def test_strict_import_stops_at_a_duplicate_in_a_later_chunk(db):
+    content = "\n".join([HEADER] + ROWS + ["1001,Budi Lain,lain@kampus.ac.id,Hukum,3.00"])
+
+    with pytest.raises(FileFormatError):
+        StudentManager(db).import_csv(content, chunk_size=1)
+
+    assert StudentManager(db).count() == 0
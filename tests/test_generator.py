@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import select
+from app import models, schemas
+from app.logic import generator
+
+def test_same_seed_and_start_give_the_same_rows():
+    assert list(generator.generate_students(500, seed=3, start=10)) == list(generator.generate_students(500, seed=3, start=10))
+    assert list(generator.generate_students(50, seed=3)) != list(generator.generate_students(50, seed=4))
+
+def test_rows_continue_the_sequence_of_a_smaller_start():
+    # The random draws differ, but NIM and email depend on the sequence number only
+    rows = list(generator.generate_students(20, start=1))
+    later = list(generator.generate_students(10, start=11))
+
+    assert [row["nim"] for row in rows[10:]] == [row["nim"] for row in later]
+
+@pytest.mark.parametrize("distinct_names", [None, 3])
+def test_nims_and_emails_are_unique_and_rows_are_valid(distinct_names):
+    rows = list(generator.generate_students(5000, seed=1, distinct_names=distinct_names))
+
+    assert len({row["nim"] for row in rows}) == len(rows)
+    assert len({row["email"] for row in rows}) == len(rows)
+    for row in rows[:200]:
+        schemas.StudentBase(**{key: row[key] for key in ("nama", "email", "nim", "jurusan", "ipk")})
+    if distinct_names:
+        assert len({row["nama"] for row in rows}) <= distinct_names
+
+@pytest.mark.parametrize("seq", [1, 99999999, 100000000, 123456789012])
+def test_generated_sequence_reads_back_make_nim(seq):
+    assert generator._generated_sequence(generator.make_nim(seq)) == seq
+
+@pytest.mark.parametrize("nim", [None, "", "1001", "201800000001", "2019000000a1", "199900000007"])
+def test_generated_sequence_ignores_other_nims(nim):
+    assert generator._generated_sequence(nim) is None
+
+def test_next_sequence_follows_the_highest_generated_nim(db):
+    assert generator.next_sequence(db) == 1
+    generator.insert_students(db, generator.generate_students(5, start=8))
+    generator.insert_students(db, generator.generate_students(5, start=1))
+    db.add_all([
+        # Entered by hand: a short NIM with a high id, and a NIM of the generated length
+        models.Student(nama="Budi", email="budi@test.id", nim="999999", jurusan="Hukum", ipk=3.0),
+        models.Student(nama="Siti", email="siti@test.id", nim="999999999999", jurusan="Hukum", ipk=3.0),
+    ])
+    db.commit()
+
+    assert generator.next_sequence(db) == 13
+
+def test_rows_from_next_sequence_do_not_collide(db):
+    # Generated with --start, so the sequence numbers run far ahead of the ids
+    generator.insert_students(db, generator.generate_students(30, start=20))
+
+    generator.insert_students(db, generator.generate_students(30, seed=1, start=generator.next_sequence(db)))
+
+    nims = db.execute(select(models.Student.nim)).scalars().all()
+    emails = db.execute(select(models.Student.email)).scalars().all()
+    assert len(set(nims)) == len(set(emails)) == 60
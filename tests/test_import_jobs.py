@@ -0,0 +1,93 @@
+import os
+import tempfile
+import threading
+import time
+import pytest
+from sqlalchemy import select
+from app import models
+from app.database import engine
+from app.logic import generator
+from app.logic.import_jobs import ImportJobManager
+from app.routers import students
+
+ROWS = 2500
+
+class PausedImportJobManager(ImportJobManager):
+    """Holds every job halfway through its file until resume is set"""
+    READ_CHUNK_SIZE = 4096
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.paused = threading.Event()
+        self.resume = threading.Event()
+
+    def _read_chunks(self, path):
+        half = os.path.getsize(path) // 2
+        bytes_read = 0
+        for data in super()._read_chunks(path):
+            yield data
+            bytes_read += len(data)
+            if bytes_read >= half and not self.paused.is_set():
+                self.paused.set()
+                assert self.resume.wait(10)
+
+@pytest.fixture
+def jobs(monkeypatch):
+    manager = PausedImportJobManager()
+    monkeypatch.setattr(students, "import_jobs", manager)
+    yield manager
+    manager.resume.set()
+    manager._executor.shutdown(wait=True)
+
+def write_students_csv(count):
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(fd, "w", newline="") as f:
+        generator.write_csv(generator.generate_students(count), f)
+    return path
+
+def user_id(db, email):
+    return db.execute(select(models.User.id).where(models.User.email == email)).scalar_one()
+
+def wait_for(job, status):
+    deadline = time.time() + 10
+    while job.status != status:
+        assert time.time() < deadline, job.to_dict()
+        time.sleep(0.01)
+
+def test_sqlite_uses_wal():
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+
+def test_requests_are_served_while_a_job_runs(client, db, jobs):
+    job = jobs.submit(write_students_csv(ROWS), "students.csv", user_id(db, "admin@test.id"))
+    assert jobs.paused.wait(10)
+
+    status = client.get(f"/students/import/{job.id}").json()
+    assert status["status"] == "running"
+    # Rows up to the last full chunk are committed and visible to other sessions
+    assert status["rows_committed"] >= 1000
+    page = client.get("/students/")
+    assert page.status_code == 200
+    assert generator.make_nim(1) in page.text
+
+    response = client.post("/students/add", data={
+        "nama": "Budi Santoso", "email": "budi@test.id", "nim": "99999", "jurusan": "Hukum", "ipk": "3.1",
+    }, follow_redirects=False)
+    assert response.status_code == 302
+
+    jobs.resume.set()
+    wait_for(job, "done")
+    status = client.get(f"/students/import/{job.id}").json()
+    assert status["rows_committed"] == status["rows_inserted"] == ROWS
+
+def test_only_the_submitting_user_sees_a_job(client, db, jobs):
+    job = jobs.submit(write_students_csv(10), "students.csv", user_id(db, "admin@test.id"))
+    jobs.resume.set()
+    wait_for(job, "done")
+    assert client.get(f"/students/import/{job.id}").status_code == 200
+
+    client.post("/register", data={"nama": "Lain", "email": "lain@test.id", "password": "rahasia"})
+    client.post("/login", data={"username": "lain@test.id", "password": "rahasia"})
+
+    assert client.get(f"/students/import/{job.id}").status_code == 404
+    assert client.get("/students/import/no-such-job").status_code == 404
@@ -0,0 +1,57 @@
+import pytest
+from app.logic import loadtest
+
+def routes(**entries):
+    return {"routes": entries}
+
+def summary(p95_ms=10.0, errors=0, requests=100):
+    return {"requests": requests, "errors": errors, "p95_ms": p95_ms}
+
+@pytest.mark.parametrize("p, expected", [(0, 1), (1, 1), (50, 50), (95, 95), (99, 99), (99.5, 100), (100, 100)])
+def test_percentile_is_the_nearest_rank(p, expected):
+    assert loadtest.percentile(list(range(1, 101)), p) == expected
+
+@pytest.mark.parametrize("p", [0, 50, 100])
+def test_percentile_of_one_value(p):
+    assert loadtest.percentile([4.2], p) == 4.2
+
+def test_summary_of_latencies():
+    result = loadtest._summary([5.0, 1.0, 3.0, 2.0, 4.0], errors=1, elapsed=2.0)
+
+    assert result == {"requests": 5, "errors": 1, "rps": 2.5, "mean_ms": 3.0,
+                      "p50_ms": 3.0, "p95_ms": 5.0, "p99_ms": 5.0, "max_ms": 5.0}
+    assert loadtest._summary([], errors=2, elapsed=1.0) == {"requests": 0, "errors": 2, "rps": 0.0}
+
+@pytest.mark.parametrize("current, regressions", [
+    (summary(p95_ms=15.0), []),
+    (summary(p95_ms=15.1), [("students", "p95_ms", 10.0, 15.1)]),
+    (summary(p95_ms=1.0, errors=3), [("students", "errors", 0, 3)]),
+    (summary(p95_ms=30.0, errors=1), [("students", "p95_ms", 10.0, 30.0), ("students", "errors", 0, 1)]),
+])
+def test_compare_flags_slower_p95_and_new_errors(current, regressions):
+    assert loadtest.compare(routes(students=current), routes(students=summary()), max_slowdown=1.5) == regressions
+
+def test_compare_skips_routes_without_requests_on_either_side():
+    current = routes(students=summary(p95_ms=99.0), searching=summary(p95_ms=99.0), sorting=summary(p95_ms=99.0, requests=0))
+    baseline = routes(searching=summary(requests=0), sorting=summary())
+
+    assert loadtest.compare(current, baseline, 1.5) == []
+
+def test_compare_ignores_errors_the_baseline_had():
+    assert loadtest.compare(routes(students=summary(errors=5)), routes(students=summary(errors=1)), 1.5) == []
+
+def test_parse_mix():
+    assert loadtest._parse_mix("students=4, searching") == {"students": 4.0, "searching": loadtest.SCENARIOS["searching"].weight}
+    with pytest.raises(ValueError):
+        loadtest._parse_mix("nope=1")
+
+def test_in_process_run_reports_every_route(client):
+    report = loadtest.run("admin@test.id", "rahasia", concurrency=2, requests=20, warmup=0)
+
+    assert set(report["routes"]) == set(loadtest.SCENARIOS)
+    assert report["total"]["requests"] == 20
+    assert report["total"]["errors"] == 0
+
+def test_run_with_a_wrong_password_fails_to_log_in(client):
+    with pytest.raises(RuntimeError):
+        loadtest.run("admin@test.id", "salah", requests=1, warmup=0)
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.core import metrics
+from app.logic.algorithms.searching import SearchingAlgorithms
+
+RENDER_CALLS = 'app_request_phase_calls_total{route="/students/",phase="render"}'
+
+def phases(server_timing):
+    return {part.split(";")[0].strip() for part in server_timing.split(",")}
+
+def render_calls(client):
+    for line in client.get("/metrics").text.splitlines():
+        if line.startswith(RENDER_CALLS):
+            return int(line.split()[-1])
+    return 0
+
+def test_server_timing_covers_work_before_the_headers(client):
+    before = render_calls(client)
+
+    rendered = client.get("/students/")
+    streamed = client.get("/students/", params={"stream": "true"})
+
+    assert {"db", "render", "total"} <= phases(rendered.headers["server-timing"])
+    # A streamed page renders after its headers are sent: only /metrics sees that time
+    assert "render" not in phases(streamed.headers["server-timing"])
+    assert render_calls(client) == before + 2
+
+def test_failed_statements_are_timed_and_leave_nothing_on_the_connection(db):
+    request_metrics = metrics.RequestMetrics()
+    token = metrics._current.set(request_metrics)
+    try:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                db.execute(text("SELECT * FROM no_such_table"))
+            db.rollback()
+        db.execute(text("SELECT 1"))
+        connection_info = db.connection().info
+    finally:
+        metrics._current.reset(token)
+
+    assert request_metrics.phases["db"][0] == 4
+    assert not any(key.startswith("metrics") for key in connection_info)
+
+def test_sequential_search_counts_as_one_algorithm_call():
+    request_metrics = metrics.RequestMetrics()
+    token = metrics._current.set(request_metrics)
+    try:
+        SearchingAlgorithms.sequential_search([3, 1, 2], 2)
+    finally:
+        metrics._current.reset(token)
+
+    assert request_metrics.phases["algorithm"][0] == 1
@@ -0,0 +1,17 @@
+from app.core import profiling
+from app.core.config import settings
+
+def store(path):
+    def write(file_path):
+        with open(file_path, "w") as f:
+            f.write(path)
+    return profiling.ProfilingMiddleware._store({"path": path}, "sample", "folded", write)
+
+def test_only_the_newest_profiles_are_kept(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling, "MAX_PROFILE_FILES", 3)
+    (tmp_path / "notes.txt").write_text("not a profile")
+
+    names = [store(f"/students/{i}") for i in range(5)]
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(names[2:] + ["notes.txt"])
@@ -0,0 +1,204 @@
+import bisect
+import random
+import pytest
+from sqlalchemy import delete
+from app import models
+from app.logic.algorithms.searching import SearchingAlgorithms
+from app.logic.indexes import TrigramIndex, student_index
+from app.logic.student_manager import StudentManager
+
+def add_student(client, nim, nama, email, ipk="3.25"):
+    response = client.post("/students/add", data={
+        "nama": nama, "email": email, "nim": nim, "jurusan": "Hukum", "ipk": ipk,
+    }, follow_redirects=False)
+    assert response.status_code == 302
+
+def search(client, algorithm, target, sort_key="nim", **form):
+    """The result panel of the searching page"""
+    response = client.post("/searching/run", data=dict(form, algorithm=algorithm, sort_key=sort_key, target_input=target))
+    assert response.status_code == 200
+    return response.text.split("Ditemukan?", 1)[1]
+
+@pytest.mark.parametrize("algorithm", ["linear", "binary", "hash"])
+def test_found_student_is_the_match(client, algorithm):
+    add_student(client, "3003", "Citra Dewi", "citra@test.id")
+    add_student(client, "1001", "Budi Santoso", "budi@test.id")
+    add_student(client, "2002", "Siti Rahma", "siti@test.id")
+
+    result = search(client, algorithm, "2002")
+
+    assert "YA" in result
+    assert "Siti Rahma" in result
+
+@pytest.mark.parametrize("algorithm", ["binary", "hash"])
+def test_student_deleted_behind_a_cached_index_is_not_found(client, db, algorithm):
+    add_student(client, "1001", "Budi Santoso", "budi@test.id")
+    add_student(client, "2002", "Siti Rahma", "siti@test.id")
+    assert "Siti Rahma" in search(client, algorithm, "2002")
+    # Another worker deletes the row; this process's index does not hear about it
+    db.execute(delete(models.Student).where(models.Student.nim == "2002"))
+    db.commit()
+
+    result = search(client, algorithm, "2002")
+
+    assert "TIDAK" in result
+    assert "Budi Santoso" not in result
+    assert student_index._built_at is None
+
+@pytest.mark.parametrize("k", [0, -1])
+def test_fuzzy_search_without_room_for_matches_is_empty(k):
+    index = TrigramIndex("nama")
+    index.build([("Budi Santoso", 1), ("Budi Santosa", 2)])
+
+    result = SearchingAlgorithms.fuzzy_search(index.postings, index.values, "budi santoso", k)
+
+    assert result.matches == []
+    assert not result.found
+
+@pytest.mark.parametrize("algorithm, form", [("binary", {}), ("hash", {}), ("prefix", {}), ("linear", {"engine": "fts"})])
+def test_index_searches_do_not_load_every_student(client, monkeypatch, algorithm, form):
+    add_student(client, "1001", "Budi Santoso", "budi@test.id")
+    monkeypatch.setattr(StudentManager, "get_all", lambda self: pytest.fail("get_all called"))
+
+    result = search(client, algorithm, "1001", **form)
+
+    assert "Budi Santoso" in result
+
+def random_rows(seed, n=200):
+    """Rows with duplicate and mixed case keys, sorted by every key the sorted searches use"""
+    rng = random.Random(seed)
+    return [{
+        "nama": rng.choice(["Budi", "budi", "Ani", "CITRA", "citra", "Dewi Lestari"]),
+        "nim": str(rng.randint(1000, 1300)),
+        "ipk": rng.choice([0.0, 4.0, round(rng.uniform(0, 4), 2)]),
+    } for _ in range(n)]
+
+def normalized(rows, key):
+    return [row[key].lower() if isinstance(row[key], str) else row[key] for row in rows]
+
+@pytest.mark.parametrize("key, targets", [
+    ("nama", ["budi", "BUDI", "citra", "Dewi lestari", "Eko"]),
+    ("nim", ["1000", "1150", "1300", "999", "abc"]),
+    ("ipk", [0.0, 4.0, 2.5, 5.0]),
+])
+@pytest.mark.parametrize("seed", range(3))
+def test_hash_search_finds_the_first_match_like_linear_search(key, targets, seed):
+    rows = random_rows(seed)
+    index = SearchingAlgorithms.build_hash_index(rows, key)
+
+    for target in targets:
+        result = SearchingAlgorithms.hash_search(index, target)
+        linear = SearchingAlgorithms.linear_search(rows, target, key)
+
+        assert (result.index, result.found) == (linear.index, linear.found)
+
+@pytest.mark.parametrize("key, targets", [
+    ("nama", ["budi", "BUDI", "ani", "Dewi Lestari", "aaa", "zzz"]),
+    ("nim", ["1000", "1150", "1300", "0999", "1301"]),
+    ("ipk", ["0", "4.0", "2.5", "-1", "5", "abc"]),
+])
+@pytest.mark.parametrize("seed", range(3))
+def test_exponential_search_finds_the_first_of_equal_keys(key, targets, seed):
+    rows = sorted(random_rows(seed), key=lambda row: normalized([row], key)[0])
+    keys = normalized(rows, key)
+
+    for target in targets + [row[key] for row in rows[::17]]:
+        result = SearchingAlgorithms.exponential_search(rows, target, key)
+        value = SearchingAlgorithms._coerce_target(target, keys[0])
+        first = bisect.bisect_left(keys, value) if value is not None else -1
+        found = 0 <= first < len(keys) and keys[first] == value
+
+        assert result.found == found
+        assert result.index == (first if found else -1)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_interpolation_search_finds_a_match_of_a_present_key(seed):
+    rows = sorted(random_rows(seed), key=lambda row: row["ipk"])
+    keys = normalized(rows, "ipk")
+
+    for target in ["0", "4", "2.5", "-1", "5", "abc"] + [str(k) for k in keys[::13]]:
+        result = SearchingAlgorithms.interpolation_search(rows, target, "ipk")
+        try:
+            present = float(target) in keys
+        except ValueError:
+            present = False
+
+        assert result.found == present
+        if present:
+            assert keys[result.index] == float(target)
+        else:
+            assert result.index == -1
+
+def test_interpolation_search_rejects_text_keys():
+    with pytest.raises(ValueError):
+        SearchingAlgorithms.interpolation_search([{"nama": "budi"}], "budi", "nama")
+
+@pytest.mark.parametrize("algorithm", ["exponential_search", "interpolation_search"])
+def test_sorted_searches_on_no_rows_find_nothing(algorithm):
+    result = getattr(SearchingAlgorithms, algorithm)([], "1001", "nim")
+
+    assert not result.found
+    assert result.index == -1
+
+@pytest.mark.parametrize("key, low, high", [
+    ("ipk", "2.0", "3.5"),
+    ("ipk", None, "1"),
+    ("ipk", "3.999", None),
+    ("ipk", "4", "4"),
+    ("ipk", "3", "2"),
+    ("ipk", None, None),
+    ("ipk", "abc", "3"),
+    ("nim", "1100", "1200"),
+    ("nama", "b", "cz"),
+    ("nama", "BUDI", "budi"),
+])
+@pytest.mark.parametrize("seed", range(3))
+def test_range_search_returns_the_slice_of_keys_in_range(key, low, high, seed):
+    rows = sorted(random_rows(seed), key=lambda row: normalized([row], key)[0])
+    keys = normalized(rows, key)
+
+    result = SearchingAlgorithms.range_search(rows, low, high, key)
+
+    def in_range(k):
+        low_val = SearchingAlgorithms._coerce_target(low, keys[0])
+        high_val = SearchingAlgorithms._coerce_target(high, keys[0])
+        if (low is not None and low_val is None) or (high is not None and high_val is None):
+            return False
+        return (low is None or low_val <= k) and (high is None or k <= high_val)
+    matches = [i for i, k in enumerate(keys) if in_range(k)]
+    assert list(range(result.index, result.stop)) == matches
+    assert result.count == len(matches)
+    assert result.found == bool(matches)
+
+@pytest.mark.parametrize("key, prefix", [
+    ("nama", "b"),
+    ("nama", "BU"),
+    ("nama", "citra"),
+    ("nama", "Dewi L"),
+    ("nama", "e"),
+    ("nama", ""),
+    ("nim", "11"),
+    ("nim", "1300"),
+    ("nim", "2"),
+])
+@pytest.mark.parametrize("seed", range(3))
+def test_prefix_search_returns_every_key_with_the_prefix(key, prefix, seed):
+    rows = sorted(random_rows(seed), key=lambda row: normalized([row], key)[0])
+    keys = normalized(rows, key)
+
+    result = SearchingAlgorithms.prefix_search(rows, prefix, key)
+
+    matches = [i for i, k in enumerate(keys) if k.startswith(prefix.lower())]
+    assert list(range(result.index, result.stop)) == matches
+    assert result.found == bool(matches)
+
+def test_prefix_search_rejects_numeric_keys():
+    with pytest.raises(ValueError):
+        SearchingAlgorithms.prefix_search([{"ipk": 3.5}], "3", "ipk")
+
+@pytest.mark.parametrize("algorithm, args", [("range_search", ("1", "2")), ("prefix_search", ("b",))])
+def test_slice_searches_on_no_rows_find_nothing(algorithm, args):
+    result = getattr(SearchingAlgorithms, algorithm)([], *args, key="nama")
+
+    assert result.count == 0
+    assert not result.found
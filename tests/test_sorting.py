@@ -0,0 +1,283 @@
+import random
+import pytest
+from sqlalchemy import text
+from app import models
+from app.logic.algorithms.sorting import SortingAlgorithms
+from app.logic.student_manager import StudentManager
+
+NAMES = ["Budi", "budi", "BUDI", "Ani", "ani", "Citra Dewi", "citra dewi", "Dewi", None]
+JURUSAN = ["Hukum", "hukum", "Manajemen", "Teknik Informatika", None]
+
+def random_students(seed, n=300):
+    """Rows with many duplicate keys, mixed case and missing values; id is the row position"""
+    rng = random.Random(seed)
+    return [{
+        "id": i,
+        "nama": rng.choice(NAMES),
+        "jurusan": rng.choice(JURUSAN),
+        "nim": rng.choice([None, str(rng.randint(1, 10 ** rng.randint(1, 9)))]),
+        "ipk": rng.choice([None, 0.0, 3.5, 4.0, round(rng.uniform(0, 4), 2)]),
+    } for i in range(n)]
+
+def reference_key(value):
+    """What the sorts promise: case insensitive strings, missing values before everything else"""
+    if value is None:
+        return (0,)
+    return (1, value.lower() if isinstance(value, str) else value)
+
+def expected(rows, key, ascending):
+    """The stable order: reverse=True keeps equal keys in row order"""
+    return sorted(rows, key=lambda row: reference_key(row[key]), reverse=not ascending)
+
+def ids(rows):
+    return [row["id"] for row in rows]
+
+def keys(rows, key):
+    return [reference_key(row[key]) for row in rows]
+
+@pytest.mark.parametrize("algorithm", ["quick", "heap", "builtin"])
+@pytest.mark.parametrize("key", ["nama", "nim", "ipk"])
+@pytest.mark.parametrize("ascending", [True, False])
+@pytest.mark.parametrize("seed", range(3))
+def test_sort_matches_sorted(algorithm, key, ascending, seed):
+    rows = random_students(seed)
+
+    result = SortingAlgorithms.run(algorithm, rows, key, ascending)
+
+    assert keys(result.data, key) == keys(expected(rows, key, ascending), key)
+
+@pytest.mark.parametrize("algorithm", ["quick", "heap"])
+@pytest.mark.parametrize("n", [0, 1, 2, 15, 16, 17, 33, 500])
+@pytest.mark.parametrize("shape", ["sorted", "reversed", "equal", "organ_pipe", "sawtooth"])
+def test_sort_handles_presorted_and_repetitive_input(algorithm, n, shape):
+    values = {
+        "sorted": list(range(n)),
+        "reversed": list(range(n, 0, -1)),
+        "equal": [7] * n,
+        "organ_pipe": list(range(n // 2)) + list(range(n - n // 2, 0, -1)),
+        "sawtooth": [i % 5 for i in range(n)],
+    }[shape]
+
+    result = SortingAlgorithms.run(algorithm, values)
+
+    assert result.data == sorted(values)
+
+@pytest.mark.parametrize("key", ["nama", "nim", "ipk"])
+@pytest.mark.parametrize("ascending", [True, False])
+def test_builtin_sort_is_stable(key, ascending):
+    rows = random_students(7)
+
+    result = SortingAlgorithms.run("builtin", rows, key, ascending)
+
+    assert ids(result.data) == ids(expected(rows, key, ascending))
+
+@pytest.mark.parametrize("key", ["nim", "ipk"])
+@pytest.mark.parametrize("ascending", [True, False])
+@pytest.mark.parametrize("seed", range(3))
+def test_radix_sort_is_stable_and_matches_sorted(key, ascending, seed):
+    # Radix sort needs every key, so the missing ones are filled in
+    rows = [dict(row, nim=row["nim"] or "0", ipk=row["ipk"] if row["ipk"] is not None else 2.5)
+            for row in random_students(seed)]
+
+    result = SortingAlgorithms.run("radix", rows, key, ascending)
+
+    assert ids(result.data) == ids(expected(rows, key, ascending))
+
+def test_radix_sort_orders_nims_like_string_comparison():
+    nims = ["123", "12", "13", "1", "0123", "9", "120"]
+
+    result = SortingAlgorithms.run("radix", nims)
+
+    assert result.data == sorted(nims)
+
+@pytest.mark.parametrize("values", [
+    ["12", "1a"],
+    ["12", None],
+    [3.5, None],
+    [3.5, 4.5],
+    [3.555],
+    ["Budi"],
+])
+def test_radix_sort_rejects_other_keys(values):
+    with pytest.raises(ValueError):
+        SortingAlgorithms.run("radix", values)
+
+def test_unknown_algorithm_is_rejected():
+    with pytest.raises(ValueError):
+        SortingAlgorithms.run("topk_heap", [3, 1, 2])
+
+@pytest.mark.parametrize("key", ["nama", "nim", "ipk"])
+@pytest.mark.parametrize("ascending", [True, False])
+@pytest.mark.parametrize("seed", range(3))
+def test_natural_merge_sort_is_stable_and_matches_sorted(key, ascending, seed):
+    rows = random_students(seed)
+
+    result = SortingAlgorithms.run("natural_merge", rows, key, ascending)
+
+    assert ids(result.data) == ids(expected(rows, key, ascending))
+
+@pytest.mark.parametrize("ascending", [True, False])
+def test_natural_merge_sort_keeps_equal_keys_of_reversed_runs_in_order(ascending):
+    # Descending runs with ties: only the strictly descending stretches may be reversed
+    values = [5, 4, 4, 4, 3, 1, 1, 2, 2, 0, 9, 9, 8]
+    rows = [{"id": i, "ipk": value} for i, value in enumerate(values)]
+
+    result = SortingAlgorithms.run("natural_merge", rows, "ipk", ascending)
+
+    assert ids(result.data) == ids(expected(rows, "ipk", ascending))
+
+@pytest.mark.parametrize("n", [1, 2, 100])
+def test_natural_merge_sort_of_sorted_input_is_one_scan(n):
+    result = SortingAlgorithms.run("natural_merge", list(range(n)))
+
+    assert result.data == list(range(n))
+    assert result.steps == n - 1
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 31, 257])
+def test_natural_merge_sort_merges_any_number_of_runs(n):
+    # Random digits give short runs, so odd and even run counts are both merged
+    rng = random.Random(n)
+    values = [rng.randint(0, 9) for _ in range(n)]
+
+    result = SortingAlgorithms.run("natural_merge", values)
+
+    assert result.data == sorted(values)
+
+LIST_ALGORITHMS = [name for name, info in SortingAlgorithms.REGISTRY.items() if info.source == "list" and name != "radix"]
+SORT_KEYS = ("nama", "nim", "ipk", "jurusan", "email")
+
+def expected_by(rows, spec):
+    """Stable multi-key order: one stable sort per key, the least significant first"""
+    result = list(rows)
+    for key, ascending in reversed(spec):
+        result = expected(result, key, ascending)
+    return result
+
+def add_students(db, seed, n=120):
+    """The random rows as students (nim and email made unique), returned in id order"""
+    students = []
+    for row in random_students(seed, n):
+        nim = row["nim"] and f"{row['nim']}{row['id']:04d}"
+        email = f"{(row['nama'] or 'x').replace(' ', '.')}{row['id']}@Test.id"
+        students.append(models.Student(nama=row["nama"], nim=nim, email=email, jurusan=row["jurusan"], ipk=row["ipk"]))
+    db.add_all(students)
+    db.commit()
+    return sorted(StudentManager(db).get_all(), key=lambda student: student.id)
+
+def student_ids(students):
+    return [student.id for student in students]
+
+@pytest.mark.parametrize("order, spec", [
+    ("jurusan asc, ipk desc, nama", [("jurusan", True), ("ipk", False), ("nama", True)]),
+    ("  NAMA DESC ,, nim  ", [("nama", False), ("nim", True)]),
+    ("ipk", [("ipk", True)]),
+])
+def test_parse_sort_spec(order, spec):
+    assert SortingAlgorithms.parse_sort_spec(order, SORT_KEYS) == spec
+
+@pytest.mark.parametrize("order", ["", " , ", "alamat", "ipk up", "ipk desc nama"])
+def test_parse_sort_spec_rejects_invalid_specs(order):
+    with pytest.raises(ValueError):
+        SortingAlgorithms.parse_sort_spec(order, SORT_KEYS)
+
+@pytest.mark.parametrize("algorithm", LIST_ALGORITHMS)
+@pytest.mark.parametrize("order", [
+    "jurusan asc, ipk desc, nama",
+    "nama desc, ipk",
+    "jurusan desc, nama desc",
+    "ipk desc, nim desc",
+])
+def test_multi_key_sort_is_the_stable_multi_key_order(algorithm, order):
+    # The row position ends every composite key, so even the unstable algorithms are stable here
+    rows = random_students(11, 150)
+    spec = SortingAlgorithms.parse_sort_spec(order, SORT_KEYS)
+
+    result = SortingAlgorithms.run(algorithm, rows, spec)
+
+    assert ids(result.data) == ids(expected_by(rows, spec))
+
+def test_descending_strings_use_their_negated_dense_rank():
+    rows = [{"nama": "budi"}, {"nama": "Ani"}, {"nama": None}, {"nama": "BUDI"}]
+
+    composite = SortingAlgorithms._composite_keys(rows, [("nama", False)])
+
+    assert composite == [(-2, 0), (-1, 1), (0, 2), (-2, 3)]
+
+@pytest.mark.parametrize("order", [
+    "jurusan asc, ipk desc, nama",
+    "nama desc, ipk",
+    "email desc",
+    "ipk desc, nim desc",
+])
+def test_database_multi_key_sort_matches_the_python_sort(db, order):
+    students = add_students(db, 5)
+    spec = SortingAlgorithms.parse_sort_spec(order, SORT_KEYS)
+    python = SortingAlgorithms.run("builtin", students, spec).data
+
+    assert student_ids(StudentManager(db).get_sorted_by(spec)) == student_ids(python)
+    assert student_ids(StudentManager(db).get_sorted_by(spec, limit=25, offset=50)) == student_ids(python[50:75])
+
+@pytest.mark.parametrize("key, index", [("jurusan", "ix_students_jurusan_lower"), ("email", "ix_students_email_lower")])
+def test_database_sort_on_lowercased_column_uses_its_index(db, key, index):
+    query = db.query(models.Student).order_by(StudentManager.SORT_COLUMNS[key])
+    sql = str(query.statement.compile(compile_kwargs={"literal_binds": True}))
+
+    plan = " ".join(row[-1] for row in db.execute(text("EXPLAIN QUERY PLAN " + sql)))
+
+    assert index in plan
+
+TOP_K_ALGORITHMS = ["heap_top_k", "quickselect_top_k"]
+
+def expected_top_k(rows, spec, k, group_by=None):
+    """The first k rows of the stable order, per group_by value in ascending order (missing first)"""
+    if group_by is None:
+        return expected_by(rows, spec)[:k]
+    result = []
+    for group in sorted({reference_key(row[group_by]) for row in rows}):
+        members = [row for row in rows if reference_key(row[group_by]) == group]
+        result.extend(expected_by(members, spec)[:k])
+    return result
+
+@pytest.mark.parametrize("algorithm", TOP_K_ALGORITHMS)
+@pytest.mark.parametrize("order", ["ipk desc", "nama", "nama desc, ipk", "jurusan, ipk desc, nim"])
+@pytest.mark.parametrize("k", [0, 1, 5, 17, 40, 1000])
+@pytest.mark.parametrize("group_by", [None, "jurusan", "nama"])
+def test_top_k_is_the_head_of_the_stable_order(algorithm, order, k, group_by):
+    rows = random_students(k, 200)
+    spec = SortingAlgorithms.parse_sort_spec(order, SORT_KEYS)
+
+    result = getattr(SortingAlgorithms, algorithm)(rows, k, spec, group_by=group_by)
+
+    assert ids(result.data) == ids(expected_top_k(rows, spec, k, group_by))
+
+@pytest.mark.parametrize("algorithm", TOP_K_ALGORITHMS)
+@pytest.mark.parametrize("ascending", [True, False])
+def test_top_k_of_a_single_key_takes_its_direction(algorithm, ascending):
+    rows = random_students(3, 200)
+
+    result = getattr(SortingAlgorithms, algorithm)(rows, 25, "ipk", ascending)
+
+    assert ids(result.data) == ids(expected(rows, "ipk", ascending)[:25])
+
+@pytest.mark.parametrize("order", ["ipk desc", "nama desc, ipk", "jurusan, ipk desc, nim"])
+@pytest.mark.parametrize("k", [1, 7, 500])
+@pytest.mark.parametrize("group_by", [None, "jurusan"])
+def test_database_top_k_matches_the_python_top_k(db, order, k, group_by):
+    students = add_students(db, 9)
+    spec = SortingAlgorithms.parse_sort_spec(order, SORT_KEYS)
+    python = SortingAlgorithms.heap_top_k(students, k, spec, group_by=group_by).data
+    mgr = StudentManager(db)
+
+    assert student_ids(mgr.get_top_k(spec, k, group_by)) == student_ids(python)
+    assert student_ids(mgr.get_top_k(spec, k, group_by, limit=4, offset=3)) == student_ids(python[3:7])
+    assert mgr.count_top_k(k, group_by) == len(python)
+
+@pytest.mark.parametrize("key", SORT_KEYS)
+@pytest.mark.parametrize("ascending", [True, False])
+def test_database_sort_matches_the_stable_python_sort(db, key, ascending):
+    students = add_students(db, 13)
+    python = SortingAlgorithms.run("natural_merge", students, key, ascending).data
+    mgr = StudentManager(db)
+
+    assert student_ids(mgr.get_sorted(key, ascending)) == student_ids(python)
+    assert student_ids(mgr.get_sorted(key, ascending, limit=30, offset=60)) == student_ids(python[60:90])
@@ -0,0 +1,44 @@
+from datetime import datetime
+from sqlalchemy import select
+from app import models
+from app.logic import stats
+
+def ipk_counters(db):
+    return {(row.jurusan, row.ipk_bucket): (row.count, row.ipk_sum)
+            for row in db.execute(select(models.JurusanIpkStat)).scalars()}
+
+def test_update_then_insert_matches_upsert(db):
+    created_at = datetime(2024, 3, 1)
+    delta = stats.StatsDelta()
+    delta.add("Hukum", 3.5, created_at)
+    delta.add("Hukum", 3.5, created_at)
+    delta.add("Manajemen", 2.0, created_at)
+    rows = [{"jurusan": jurusan, "ipk_bucket": bucket, "count": count, "ipk_sum": ipk_sum}
+            for (jurusan, bucket), (count, ipk_sum) in delta.ipk.items()]
+
+    stats._update_then_insert(db, models.JurusanIpkStat, rows, ["jurusan", "ipk_bucket"], ["count", "ipk_sum"])
+    stats._update_then_insert(db, models.JurusanIpkStat, rows[:1], ["jurusan", "ipk_bucket"], ["count", "ipk_sum"])
+
+    assert ipk_counters(db) == {("Hukum", 350): (4, 14.0), ("Manajemen", 200): (1, 2.0)}
+
+def test_students_without_ipk_are_counted_but_not_averaged(db):
+    created_at = datetime(2024, 3, 1)
+    db.add_all([
+        models.Student(nama="Budi", email="budi@test.id", nim="1", jurusan="Hukum", ipk=None, created_at=created_at),
+        models.Student(nama="Siti", email="siti@test.id", nim="2", jurusan="Hukum", ipk=0.0, created_at=created_at),
+        models.Student(nama="Andi", email="andi@test.id", nim="3", jurusan="Manajemen", ipk=None, created_at=created_at),
+    ])
+    db.commit()
+    stats.rebuild(db)
+
+    assert stats.ipk_bucket(None) == stats.NO_IPK_BUCKET
+    assert stats.check(db) == []
+    dashboard = stats.read_dashboard(db)
+    assert dashboard["total_students"] == 3
+    assert dashboard["avg_ipk"] == 0.0
+    assert dashboard["jurusan_stats"]["Hukum"] == {
+        "count": 2, "avg_ipk": 0.0, "min_ipk": 0.0, "max_ipk": 0.0, "median_ipk": 0.0,
+    }
+    assert dashboard["jurusan_stats"]["Manajemen"]["count"] == 1
+    assert dashboard["jurusan_stats"]["Manajemen"]["avg_ipk"] is None
+    assert sum(count for _, count in dashboard["ipk_histogram"]) == 1